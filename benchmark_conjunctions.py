@@ -0,0 +1,77 @@
+import numpy as np
+from sgp4.api import SatrecArray
+import time
+
+from conjunctions import MAX_RELATIVE_SPEED_KM_S, _jd, close_pairs, screen_conjunctions
+from tle_catalog import TLECatalog, synthetic_catalog
+
+# === Configurations ===
+TLE_FILE = 'iss.tle'
+CATALOG_SIZES = [1000, 10000, 30000]
+HOURS = 1
+STEP_SECONDS = 30.0
+THRESHOLD_KM = 10.0
+BRUTE_FORCE_STEPS = 2        # steps timed with the all-pairs distance matrix
+BRUTE_FORCE_ROWS = 250       # rows of the distance matrix per block
+
+# The synthetic catalogs put every object between ~300 and ~900 km, a far denser
+# shell than the real one: a worst case for the number of close pairs.
+template = TLECatalog.from_file(TLE_FILE)
+search_km = THRESHOLD_KM + MAX_RELATIVE_SPEED_KM_S * STEP_SECONDS / 2
+
+
+def brute_force_pairs(position, radius):
+    # O(N^2) reference: every pair, one block of rows at a time
+    pairs = []
+    for start in range(0, len(position), BRUTE_FORCE_ROWS):
+        block = position[start:start + BRUTE_FORCE_ROWS]
+        d2 = np.sum((block[:, None, :] - position[None, :, :]) ** 2, axis=2)
+        i, j = np.nonzero(d2 < radius * radius)
+        i += start
+        pairs.append(np.column_stack((i, j))[i < j])
+    return np.concatenate(pairs)
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+print(f"{HOURS} h every {STEP_SECONDS:g} s, threshold {THRESHOLD_KM:g} km, search radius {search_km:g} km")
+print(f"{'OBJECTS':<9} {'ALL-PAIRS s':<12} {'PAIRS/STEP':<11} {'SHORTLIST':<10} {'EVENTS':<7} "
+      f"{'INDEX ms/step':<14} {'BRUTE ms/step':<14} {'PRIMARY s':<10} {'SHELL KEPT':<11}")
+print("=" * 104)
+for size in CATALOG_SIZES:
+    catalog = synthetic_catalog(template, size)
+    start_unix = (catalog.epoch_jd[0] - 2440587.5) * 86400.0
+    steps = int(HOURS * 3600 / STEP_SECONDS) + 1
+
+    # === Step 1: All-vs-all screening through the spatial index ===
+    (events, stats), all_s = timed(lambda: screen_conjunctions(catalog, start_unix, HOURS * 3600, THRESHOLD_KM,
+                                                              STEP_SECONDS))
+
+    # === Step 2: Index vs brute force on a few steps (same pairs, time per step) ===
+    _, position, _ = SatrecArray(catalog.satrecs).sgp4(*_jd(start_unix + np.arange(BRUTE_FORCE_STEPS) * STEP_SECONDS))
+    index_s = brute_s = 0.0
+    for k in range(BRUTE_FORCE_STEPS):
+        p = np.ascontiguousarray(position[:, k])
+        (i, j), s = timed(lambda: close_pairs(p, search_km))
+        index_s += s
+        reference, s = timed(lambda: brute_force_pairs(p, search_km))
+        brute_s += s
+        assert {*zip(i.tolist(), j.tolist())} == {*map(tuple, reference.tolist())}, "index missed pairs"
+
+    # === Step 3: One object (SAT 0) against the catalog, apogee/perigee filtered ===
+    (primary_events, primary_stats), primary_s = timed(
+        lambda: screen_conjunctions(catalog, start_unix, HOURS * 3600, THRESHOLD_KM, STEP_SECONDS, primary=0))
+    assert set(primary_events['tca'].round(3)) <= set(events['tca'].round(3)), "primary screening disagrees"
+
+    print(f"{size:<9} {all_s:<12.2f} {stats['candidates'] / steps:<11.0f} {stats['shortlisted']:<10} "
+          f"{len(events):<7} {index_s / BRUTE_FORCE_STEPS * 1000:<14.1f} {brute_s / BRUTE_FORCE_STEPS * 1000:<14.1f} "
+          f"{primary_s:<10.2f} {primary_stats['objects'] - 1:<11}")
+
+print("\nClosest approaches at the largest size:")
+for event in np.sort(events, order='miss_km')[:5]:
+    print(f"  SAT {event['primary']:<6} SAT {event['secondary']:<6} miss {event['miss_km']:6.2f} km "
+          f"at {event['speed_km_s']:5.2f} km/s, {event['tca'] - start_unix:7.1f} s after the start")
@@ -0,0 +1,70 @@
+from skyfield.api import load, Topos, EarthSatellite
+import numpy as np
+import time
+import tracemalloc
+
+from coverage_map import coverage_grid, coverage_map, ground_grid
+from pass_table import jd_to_unix
+
+# === Configurations ===
+TLE_FILE = 'iss.tle'
+GRID_STEP_DEG = 2.0
+HOURS = 24
+STEP_SECONDS = 10.0
+MIN_ELEVATION = 10.0
+REFERENCE_CELLS = 12         # cells also run through Skyfield's find_events() for timing and accuracy
+
+ts = load.timescale()
+with open(TLE_FILE) as file:
+    tle = file.readlines()
+satellite = EarthSatellite(tle[1].strip(), tle[2].strip(), tle[0].strip(), ts)
+start_unix = float(jd_to_unix(satellite.epoch)[0])
+grid = ground_grid(GRID_STEP_DEG)
+samples = int(HOURS * 3600 / STEP_SECONDS) + 1
+
+# === Step 1: Whole grid in one batched pass ===
+tracemalloc.start()
+start = time.perf_counter()
+coverage = coverage_map(tle, grid, start_unix, HOURS * 3600, MIN_ELEVATION, STEP_SECONDS, intervals=True, ts=ts)
+batched_s = time.perf_counter() - start
+peak_mb = tracemalloc.get_traced_memory()[1] / 1e6
+tracemalloc.stop()
+
+cells = grid.latitude.size
+print(f"{cells} cells ({GRID_STEP_DEG} deg grid) x {samples} samples ({HOURS} h every {STEP_SECONDS:g} s), "
+      f"elevation > {MIN_ELEVATION:g} deg")
+print(f"batched: {batched_s:.2f} s, {cells / batched_s:,.0f} cells/s, "
+      f"{cells * samples / batched_s / 1e6:.0f}M cell-samples/s, peak memory {peak_mb:.0f} MB")
+print(f"{len(coverage.intervals)} visibility intervals; {np.count_nonzero(coverage.passes)} cells see the satellite")
+
+# === Step 2: Per-cell find_events() on a sample of cells ===
+rng = np.random.default_rng(0)
+seen = np.flatnonzero(coverage.passes)
+sample = rng.choice(seen, REFERENCE_CELLS, replace=False)
+t0, t1 = ts.tt_jd(satellite.epoch.tt), ts.tt_jd(satellite.epoch.tt + HOURS / 24)
+errors = []
+start = time.perf_counter()
+for cell in sample:
+    observer = Topos(latitude_degrees=grid.latitude[cell], longitude_degrees=grid.longitude[cell])
+    t, events = satellite.find_events(observer, t0, t1, altitude_degrees=MIN_ELEVATION)
+    unix = jd_to_unix(t)
+    rises, sets = unix[events == 0], unix[events == 2]
+    mine = coverage.intervals[coverage.intervals['cell'] == cell]
+    # Compare only intervals that find_events() reports whole
+    for rise in rises:
+        later = sets[sets > rise]
+        if later.size:
+            i = np.argmin(np.abs(mine['start'] - rise))
+            errors.append(max(abs(mine['start'][i] - rise), abs(mine['end'][i] - later[0])))
+per_cell_s = (time.perf_counter() - start) / REFERENCE_CELLS
+
+print(f"find_events(): {per_cell_s * 1000:.0f} ms per cell, {1 / per_cell_s:,.1f} cells/s "
+      f"-> {per_cell_s * cells / 60:.0f} min for the whole grid ({per_cell_s * cells / batched_s:,.0f}x slower)")
+print(f"{len(errors)} intervals on {REFERENCE_CELLS} cells: max rise/set difference {max(errors):.2f} s")
+
+# === Step 3: Coverage map (hours visible per day), coarse ASCII rendering ===
+hours = coverage_grid(coverage) / 3600.0
+shades = ' .:-=+*#%@'
+print(f"\nHours visible (max {hours.max():.1f} h), north up:")
+for row in hours[::-3, ::2]:
+    print(''.join(shades[min(int(h / hours.max() * len(shades)), len(shades) - 1)] for h in row))
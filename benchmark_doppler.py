@@ -0,0 +1,59 @@
+from skyfield.api import load, Topos, EarthSatellite
+import numpy as np
+import time
+
+from doppler import DOWNLINK_HZ, SPEED_OF_LIGHT_KM_S, UPLINK_HZ, doppler_tables, table_rows, write_doppler_csv
+from pass_finder import find_passes
+from pass_scheduler import Site
+from tle_catalog import TLECatalog, synthetic_catalog, unix_times
+
+# === Configurations ===
+TLE_FILE = 'iss.tle'
+CSV_FILE = 'iss_doppler.csv'
+SITE = Site('Lausanne', 46.4667, 6.8616, 500)
+DAYS = 1
+SYNTHETIC_SATELLITES = 100
+
+ts = load.timescale()
+with open(TLE_FILE) as file:
+    tle = file.readlines()
+satellite = EarthSatellite(tle[1].strip(), tle[2].strip(), tle[0].strip(), ts)
+observer = Topos(latitude_degrees=SITE.latitude, longitude_degrees=SITE.longitude, elevation_m=SITE.elevation_m)
+
+# === Step 1: One day of ISS passes ===
+passes = list(find_passes(satellite, observer, satellite.epoch, DAYS))
+doppler_tables(tle, SITE, passes[:1], DOWNLINK_HZ, UPLINK_HZ, ts=ts)    # warm-up
+
+start = time.perf_counter()
+tables = doppler_tables(tle, SITE, passes, DOWNLINK_HZ, UPLINK_HZ, ts=ts)
+batched_s = time.perf_counter() - start
+points = sum(len(table.downlink_shift) for table in tables)
+print(f"{len(passes)} passes, {points} one-second points in {batched_s * 1000:.1f} ms")
+
+# === Step 2: Check against Skyfield's range rate, one call per point as a per-point tool would ===
+table = max(tables, key=lambda table: len(table.downlink_shift))
+unix = np.array([row[0] for row in table_rows(table)])
+start = time.perf_counter()
+reference = np.array([(satellite - observer).at(unix_times(ts, seconds)).frame_latlon_and_rates(observer)[5].km_per_s
+                      for seconds in unix])
+per_point_s = (time.perf_counter() - start) / len(unix)
+expected = -reference / SPEED_OF_LIGHT_KM_S * DOWNLINK_HZ
+print(f"Longest pass: {len(unix)} points, max downlink shift {np.max(np.abs(table.downlink_shift)):.0f} Hz, "
+      f"max error vs Skyfield {np.max(np.abs(table.downlink_shift - expected)):.2f} Hz")
+print(f"Per-point Skyfield: {per_point_s * 1e6:.0f} µs, batched: {batched_s / points * 1e6:.2f} µs per point")
+
+write_doppler_csv(CSV_FILE, table)
+print(f"Wrote {CSV_FILE}; table in memory: {table.downlink_shift.nbytes + table.uplink_shift.nbytes} bytes")
+
+# === Step 3: A day of passes for many satellites ===
+catalog = synthetic_catalog(TLECatalog.from_lines(tle), SYNTHETIC_SATELLITES)
+all_passes = [(entry, list(find_passes(EarthSatellite(entry[1], entry[2], entry[0], ts), observer,
+                                       satellite.epoch, DAYS))) for entry in catalog.entries()]
+start = time.perf_counter()
+tables = [doppler_tables(list(entry), SITE, sat_passes, DOWNLINK_HZ, UPLINK_HZ, ts=ts)
+          for entry, sat_passes in all_passes if sat_passes]
+elapsed = time.perf_counter() - start
+n_passes = sum(len(sat_tables) for sat_tables in tables)
+n_points = sum(len(table.downlink_shift) for sat_tables in tables for table in sat_tables)
+print(f"\n{SYNTHETIC_SATELLITES} satellites: {n_passes} passes, {n_points} points in {elapsed:.2f} s "
+      f"({n_passes / elapsed:,.0f} tables/s)")
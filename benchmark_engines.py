@@ -0,0 +1,206 @@
+from skyfield.api import load, Topos, EarthSatellite
+from datetime import timedelta, timezone
+import ephem
+import json
+import math
+import numpy as np
+import sys
+import time
+import tracemalloc
+
+from pass_finder import find_passes
+from pass_scheduler import Site
+from tle_catalog import TLECatalog, synthetic_catalog
+
+# === Configurations ===
+TLE_FILE = 'iss.tle'
+RESULTS_FILE = 'benchmark_engines.json'
+SATELLITES = 10              # the ISS plus synthetic variants
+HORIZONS_DAYS = [1, 7]
+MATCH_TOLERANCE_SECONDS = 120    # a PyEphem and a Skyfield pass are the same pass if their AOS agree this well
+POSITION_SAMPLES = 10000
+PYEPHEM_PRESSURE_MBAR = 0    # no refraction, so both engines report the geometric horizon crossing
+
+SITES = [
+    Site('Lausanne', 46.4667, 6.8616, 500),
+    Site('Reykjavik', 64.1466, -21.9426, 50),
+    Site('Sydney', -33.8688, 151.2093, 50),
+]
+
+
+_timescale = None
+
+
+def load_timescale():
+    global _timescale
+    if _timescale is None:
+        _timescale = load.timescale()
+    return _timescale
+
+
+# === Engines: (name, line1, line2), Site, start (UTC datetime), days -> passes ===
+def pyephem_passes(tle, site, start, days):
+    satellite = ephem.readtle(*tle)
+    observer = ephem.Observer()
+    observer.lat = str(site.latitude)
+    observer.lon = str(site.longitude)
+    observer.elev = site.elevation_m
+    observer.pressure = PYEPHEM_PRESSURE_MBAR
+    observer.date = start
+    end = ephem.Date(start + timedelta(days=days))
+
+    passes = []
+    while True:
+        try:
+            rise_time, _, max_alt_time, max_alt, set_time, _ = observer.next_pass(satellite)
+        except ValueError:
+            break    # "seems to stay always below your horizon"
+        if rise_time is None or set_time is None or rise_time > end:
+            break
+        passes.append({
+            'aos_time': rise_time.datetime().replace(tzinfo=timezone.utc),
+            'max_time': max_alt_time.datetime().replace(tzinfo=timezone.utc),
+            'los_time': set_time.datetime().replace(tzinfo=timezone.utc),
+            'max_altitude': math.degrees(max_alt),
+        })
+        observer.date = set_time + ephem.minute
+    return passes
+
+
+def skyfield_passes(tle, site, start, days):
+    ts = load_timescale()
+    satellite = EarthSatellite(tle[1], tle[2], tle[0], ts)
+    observer = Topos(latitude_degrees=site.latitude, longitude_degrees=site.longitude, elevation_m=site.elevation_m)
+    return [p for p in find_passes(satellite, observer, ts.from_datetime(start), days)
+            if p['aos_time'] > start]
+
+
+ENGINES = {'pyephem': pyephem_passes, 'skyfield': skyfield_passes}
+
+
+def run_engine(engine, satellites, start, days):
+    # Wall time and peak Python heap for one engine over every (satellite, site) pair
+    tracemalloc.start()
+    begin = time.perf_counter()
+    passes = {(tle[0], site.name): ENGINES[engine](tle, site, start, days) for tle in satellites for site in SITES}
+    elapsed = time.perf_counter() - begin
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return passes, elapsed, peak
+
+
+# === Pass Matching ===
+def match_passes(reference, other):
+    """Pair passes whose AOS agree within the tolerance; returns the pairs and the unmatched counts.
+
+    Candidate pairs are assigned closest first, so a pass whose nearest
+    partner is taken still gets its next-nearest one.
+    """
+    reference_aos = np.array([p['aos_time'].timestamp() for p in reference])
+    other_aos = np.array([p['aos_time'].timestamp() for p in other])
+    delta = np.abs(reference_aos[:, None] - other_aos[None, :]).reshape(len(reference), len(other))
+    pairs, used_reference, used_other = [], set(), set()
+    candidates = np.argwhere(delta <= MATCH_TOLERANCE_SECONDS)
+    for i, j in candidates[np.argsort(delta[candidates[:, 0], candidates[:, 1]], kind='stable')].tolist():
+        if i not in used_reference and j not in used_other:
+            pairs.append((reference[i], other[j]))
+            used_reference.add(i)
+            used_other.add(j)
+    return pairs, len(reference) - len(pairs), len(other) - len(pairs)
+
+
+def delta_stats(values):
+    values = np.abs(values)
+    if not values.size:
+        return {'mean': None, 'p95': None, 'max': None}
+    return {'mean': float(values.mean()), 'p95': float(np.percentile(values, 95)), 'max': float(values.max())}
+
+
+def accuracy(skyfield, pyephem):
+    deltas = {'aos_s': [], 'tca_s': [], 'los_s': [], 'mel_deg': []}
+    matched = missing_pyephem = missing_skyfield = 0
+    for key in skyfield:
+        pairs, only_skyfield, only_pyephem = match_passes(skyfield[key], pyephem[key])
+        matched += len(pairs)
+        missing_pyephem += only_skyfield
+        missing_skyfield += only_pyephem
+        for s, e in pairs:
+            deltas['aos_s'].append((e['aos_time'] - s['aos_time']).total_seconds())
+            deltas['tca_s'].append((e['max_time'] - s['max_time']).total_seconds())
+            deltas['los_s'].append((e['los_time'] - s['los_time']).total_seconds())
+            deltas['mel_deg'].append(e['max_altitude'] - s['max_altitude'])
+    return {'matched': matched, 'only_skyfield': missing_pyephem, 'only_pyephem': missing_skyfield,
+            **{name: delta_stats(np.array(values)) for name, values in deltas.items()}}
+
+
+# === Positions per second ===
+def position_throughput(tle, site, start):
+    times = [start + timedelta(seconds=10 * i) for i in range(POSITION_SAMPLES)]
+    results = {}
+
+    satellite = ephem.readtle(*tle)
+    observer = ephem.Observer()
+    observer.lat, observer.lon, observer.elev = str(site.latitude), str(site.longitude), site.elevation_m
+    observer.pressure = PYEPHEM_PRESSURE_MBAR
+    begin = time.perf_counter()
+    for when in times:
+        observer.date = when
+        satellite.compute(observer)
+    results['pyephem_loop'] = POSITION_SAMPLES / (time.perf_counter() - begin)
+
+    ts = load_timescale()
+    satellite = EarthSatellite(tle[1], tle[2], tle[0], ts)
+    topos = Topos(latitude_degrees=site.latitude, longitude_degrees=site.longitude, elevation_m=site.elevation_m)
+    t = ts.from_datetimes(times)
+    begin = time.perf_counter()
+    for i in range(POSITION_SAMPLES // 10):
+        (satellite - topos).at(t[i]).altaz()
+    results['skyfield_loop'] = POSITION_SAMPLES // 10 / (time.perf_counter() - begin)
+
+    begin = time.perf_counter()
+    (satellite - topos).at(t).altaz()
+    results['skyfield_vector'] = POSITION_SAMPLES / (time.perf_counter() - begin)
+    return results
+
+
+if __name__ == '__main__':
+    ts = load_timescale()
+    catalog = TLECatalog.from_file(TLE_FILE)
+    satellites = catalog.entries() + synthetic_catalog(catalog, SATELLITES - 1).entries()
+    # Start at the TLE epoch: PyEphem refuses element sets too far from the date being computed
+    start = catalog.satellite(0, ts).epoch.utc_datetime().replace(microsecond=0)
+
+    records = []
+    for days in HORIZONS_DAYS:
+        workload = {'satellites': len(satellites), 'sites': len(SITES), 'days': days}
+        results = {}
+        for engine in ENGINES:
+            results[engine], elapsed, peak = run_engine(engine, satellites, start, days)
+            n_passes = sum(len(passes) for passes in results[engine].values())
+            records.append({'kind': 'passes', 'engine': engine, **workload, 'passes': n_passes,
+                            'seconds': elapsed, 'passes_per_s': n_passes / elapsed, 'peak_mb': peak / 1e6})
+        records.append({'kind': 'accuracy', 'reference': 'skyfield', **workload,
+                        **accuracy(results['skyfield'], results['pyephem'])})
+
+    records.append({'kind': 'positions', 'samples': POSITION_SAMPLES,
+                    **position_throughput(satellites[0], SITES[0], start)})
+
+    with open(RESULTS_FILE, 'w') as file:
+        json.dump(records, file, indent=1)
+
+    # === Summary ===
+    print(f"{'ENGINE':<10} {'DAYS':<6} {'PASSES':<8} {'SECONDS':<9} {'PASSES/s':<10} {'PEAK MB':<8}")
+    print("=" * 54)
+    for r in records:
+        if r['kind'] == 'passes':
+            print(f"{r['engine']:<10} {r['days']:<6} {r['passes']:<8} {r['seconds']:<9.2f} "
+                  f"{r['passes_per_s']:<10.1f} {r['peak_mb']:<8.1f}")
+    for r in records:
+        if r['kind'] == 'accuracy':
+            print(f"\n{r['days']} days: {r['matched']} matched, {r['only_skyfield']} only in Skyfield, "
+                  f"{r['only_pyephem']} only in PyEphem")
+            for name in ('aos_s', 'tca_s', 'los_s', 'mel_deg'):
+                print(f"  |d{name}|: mean {r[name]['mean']:.3f}, p95 {r[name]['p95']:.3f}, max {r[name]['max']:.3f}")
+        elif r['kind'] == 'positions':
+            print(f"\nPositions/s: " + ", ".join(f"{k} {v:,.0f}" for k, v in r.items() if k not in ('kind', 'samples')))
+    print(f"\nMachine-readable results in {RESULTS_FILE}", file=sys.stderr)
@@ -0,0 +1,125 @@
+from datetime import timezone
+from zoneinfo import ZoneInfo
+import ephem
+import numpy as np
+import time
+
+from ephem_passes import ephem_pass_table
+from pass_scheduler import Site
+from tle_catalog import TLECatalog, synthetic_catalog
+
+# === Configurations ===
+TLE_FILE = 'iss.tle'
+PASSES = 1000
+SATELLITES = 10
+LOCAL_TIMEZONE = ZoneInfo("Europe/Zurich")
+PRESSURE_MBAR = 1010         # the script's observer keeps PyEphem's default refraction
+MATCH_TOLERANCE_SECONDS = 60
+
+SITES = [
+    Site('Lausanne', 46.4667, 6.8616, 500),
+    Site('Reykjavik', 64.1466, -21.9426, 50),
+    Site('Sydney', -33.8688, 151.2093, 50),
+]
+
+
+# === The Current Script: next_pass() per pass, per-row conversions ===
+def script_passes(tle, site, start_unix, count):
+    iss = ephem.readtle(*tle)
+    observer = ephem.Observer()
+    observer.lat = str(site.latitude)
+    observer.lon = str(site.longitude)
+    observer.elev = site.elevation_m
+    observer.date = ephem.Date(start_unix / 86400.0 + 2440587.5 - 2415020.0)
+    passes = []
+    for _ in range(count):
+        try:
+            rise_time, rise_az, max_alt_time, max_alt, set_time, set_az = observer.next_pass(iss)
+        except ValueError:
+            break    # "seems to stay always below your horizon"
+        duration_seconds = (set_time.datetime() - rise_time.datetime()).total_seconds()
+        minutes = int(duration_seconds // 60)
+        seconds = int(duration_seconds % 60)
+        if max_alt * (180 / 3.14159) >= 0:
+            passes.append({'rise_time': rise_time, 'duration': f"{minutes:02}:{seconds:02}",
+                           'max_elevation': max_alt * (180 / 3.14159), 'rise_azimuth': rise_az * (180 / 3.14159),
+                           'set_time': set_time, 'set_azimuth': set_az * (180 / 3.14159),
+                           'max_alt_time': max_alt_time})
+        observer.date = set_time + ephem.minute
+    return passes
+
+
+def script_format(passes):
+    rows = []
+    for p in passes:
+        rows.append((ephem.localtime(p['rise_time']).astimezone(LOCAL_TIMEZONE).strftime('%d.%m.%Y %H:%M:%S'),
+                     p['rise_time'].datetime().strftime('%H:%M:%S'),
+                     ephem.localtime(p['set_time']).astimezone(LOCAL_TIMEZONE).strftime('%H:%M:%S'),
+                     p['set_time'].datetime().strftime('%H:%M:%S')))
+        rows.append((ephem.localtime(p['rise_time']).astimezone(LOCAL_TIMEZONE).strftime('%d.%m'),
+                     ephem.localtime(p['rise_time']).astimezone(LOCAL_TIMEZONE).strftime('%H:%M:%S'),
+                     ephem.localtime(p['max_alt_time']).astimezone(LOCAL_TIMEZONE).strftime('%H:%M:%S'),
+                     ephem.localtime(p['set_time']).astimezone(LOCAL_TIMEZONE).strftime('%H:%M:%S'),
+                     p['duration'], f"{p['max_elevation']:.1f}"))
+    return rows
+
+
+# === Bulk: one table, each column formatted once ===
+def bulk_format(table):
+    return [table.format_times('aos_time', LOCAL_TIMEZONE), table.format_times('aos_time', 'UTC', '%H:%M:%S'),
+            table.format_times('los_time', LOCAL_TIMEZONE, '%H:%M:%S'),
+            table.format_times('los_time', 'UTC', '%H:%M:%S'),
+            table.format_times('aos_time', LOCAL_TIMEZONE, '%d.%m'),
+            table.format_times('aos_time', LOCAL_TIMEZONE, '%H:%M:%S'),
+            table.format_times('max_time', LOCAL_TIMEZONE, '%H:%M:%S')]
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def compare(script, table):
+    # AOS, LOS and maximum elevation differences of the passes both found
+    aos = table.data['aos_time']
+    deltas = []
+    for p in script:
+        rise = p['rise_time'].datetime().replace(tzinfo=timezone.utc).timestamp()
+        i = int(np.argmin(np.abs(aos - rise)))
+        if abs(aos[i] - rise) <= MATCH_TOLERANCE_SECONDS:
+            deltas.append((aos[i] - rise,
+                           table.data['los_time'][i] - p['set_time'].datetime().replace(tzinfo=timezone.utc).timestamp(),
+                           table.data['max_altitude'][i] - np.degrees(p['max_elevation'] * 3.14159 / 180)))
+    return len(deltas), np.abs(np.array(deltas)).max(axis=0)
+
+
+catalog = TLECatalog.from_file(TLE_FILE)
+iss = catalog.entries()[0]
+# Start at the TLE epoch: PyEphem refuses element sets far from the date being computed
+start = float((catalog.epoch_jd[0] - 2440587.5) * 86400.0)
+workloads = [(f"ISS x 1 site x {PASSES}", [iss], SITES[:1], PASSES),
+             (f"{SATELLITES} satellites x {len(SITES)} sites",
+              [iss] + synthetic_catalog(catalog, SATELLITES - 1).entries(), SITES,
+              -(-PASSES // (SATELLITES * len(SITES))))]
+
+print(f"{'WORKLOAD':<28} {'ENGINE':<8} {'PASSES':>7} {'SEARCH s':>9} {'FORMAT ms':>10} {'PASSES/s':>9} {'SPEEDUP':>8}")
+print("=" * 85)
+for label, entries, sites, count in workloads:
+    (script, script_s) = timed(lambda: [p for tle in entries for site in sites
+                                        for p in script_passes(tle, site, start, count)])
+    _, script_format_s = timed(lambda: script_format(script))
+    table, bulk_s = timed(lambda: ephem_pass_table(entries, sites, start, count=count, pressure_mbar=PRESSURE_MBAR))
+    _, bulk_format_s = timed(lambda: bulk_format(table))
+    script_total, bulk_total = script_s + script_format_s, bulk_s + bulk_format_s
+    print(f"{label:<28} {'script':<8} {len(script):>7} {script_s:>9.2f} {script_format_s * 1000:>10.1f} "
+          f"{len(script) / script_total:>9.0f}")
+    print(f"{'':<28} {'bulk':<8} {len(table):>7} {bulk_s:>9.2f} {bulk_format_s * 1000:>10.1f} "
+          f"{len(table) / bulk_total:>9.0f} {script_total / bulk_total:>7.1f}x")
+    if len(sites) == 1 and len(entries) == 1:
+        matched, (aos, los, mel) = compare(script, table)
+        print(f"{'':<28} {matched} of {len(script)} passes matched; max |dAOS| {aos:.3f} s, |dLOS| {los:.3f} s, "
+              f"|dMEL| {mel:.4f} deg")
+
+print(f"\nUnit conversion: 180 / 3.14159 is off by a factor {(180 / 3.14159) / np.degrees(1.0) - 1:.2e}, "
+      f"{360 * ((180 / 3.14159) / np.degrees(1.0) - 1) * 3600:.2f} arcsec at 360 deg")
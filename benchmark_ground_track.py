@@ -0,0 +1,73 @@
+from skyfield.api import load, wgs84
+import numpy as np
+import time
+import tracemalloc
+
+from ground_track import ground_track, segments
+from tle_catalog import TLECatalog, synthetic_catalog, unix_times
+
+# === Configurations ===
+TLE_FILE = 'iss.tle'
+STEP_SECONDS = 1.0
+SPANS_DAYS = [1, 7, 28]
+SATELLITES = 100             # the many-orbits run: one day each at 10 s
+REFERENCE_POINTS = 86400     # Skyfield .at() + wgs84 reference, 1 day at 1 s
+
+DAY_S = 86400.0
+
+
+def consume(satellite, start, days, step_s):
+    # Stream a whole track keeping only the point count; returns it and the peak traced memory
+    points = 0
+    tracemalloc.start()
+    for chunk in ground_track(satellite, start, days * DAY_S, step_s):
+        points += chunk.size
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return points, peak
+
+
+ts = load.timescale()
+catalog = TLECatalog.from_file(TLE_FILE)
+iss = catalog.satellite(0, ts)
+start = iss.epoch.utc_datetime().timestamp()
+
+print(f"{'RUN':<32} {'POINTS':>10} {'SECONDS':>8} {'POINTS/s':>12} {'PEAK MB':>8}")
+print("=" * 74)
+for days in SPANS_DAYS:
+    begin = time.perf_counter()
+    points, peak = consume(iss, start, days, STEP_SECONDS)
+    elapsed = time.perf_counter() - begin
+    print(f"{f'ISS {days} d at {STEP_SECONDS:g} s':<32} {points:>10,} {elapsed:>8.2f} {points / elapsed:>12,.0f} "
+          f"{peak / 1e6:>8.1f}")
+
+synthetic = synthetic_catalog(catalog, SATELLITES - 1)
+satellites = [iss] + [synthetic.satellite(i, ts) for i in range(SATELLITES - 1)]
+begin = time.perf_counter()
+points = sum(chunk.size for satellite in satellites for chunk in ground_track(satellite, start, DAY_S, 10.0))
+elapsed = time.perf_counter() - begin
+print(f"{f'{SATELLITES} satellites x 1 d at 10 s':<32} {points:>10,} {elapsed:>8.2f} {points / elapsed:>12,.0f}")
+
+# === Skyfield reference ===
+unix = start + np.arange(REFERENCE_POINTS) * STEP_SECONDS
+begin = time.perf_counter()
+t = unix_times(ts, unix)
+position = wgs84.geographic_position_of(iss.at(t))
+elapsed = time.perf_counter() - begin
+print(f"{'Skyfield .at() + wgs84, ISS 1 d':<32} {REFERENCE_POINTS:>10,} {elapsed:>8.2f} "
+      f"{REFERENCE_POINTS / elapsed:>12,.0f}")
+
+track = np.concatenate(list(ground_track(iss, start, (REFERENCE_POINTS - 1) * STEP_SECONDS, STEP_SECONDS,
+                                         split=False)))
+along = np.radians(np.abs(position.latitude.degrees - track['latitude'])) * 6371.0
+across = np.radians(np.abs((position.longitude.degrees - track['longitude'] + 180) % 360 - 180)) * 6371.0
+print(f"\nvs Skyfield: max |dlat| {along.max() * 1000:.2f} m, max |dlon| (at the equator) {across.max() * 1000:.2f} m, "
+      f"max |dh| {np.abs(position.elevation.km - track['altitude_km']).max() * 1000:.2f} m")
+
+# ✅ No polyline may jump across the map
+track = np.concatenate(list(ground_track(iss, start, DAY_S, 10.0)))
+parts = segments(track)
+assert all(np.all(np.abs(np.diff(part['longitude'])) < 180.0) for part in parts)
+print(f"Antimeridian: {len(parts)} segments in one day, every one continuous, edges at +-180: "
+      f"{np.count_nonzero(np.abs(track['longitude']) == 180.0)} points")
+print(f"Footprint radius at {track['altitude_km'].mean():.0f} km: {track['footprint_km'].mean():.0f} km")
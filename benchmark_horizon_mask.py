@@ -0,0 +1,98 @@
+from skyfield.api import load, Topos
+import numpy as np
+import time
+
+from horizon_mask import HorizonMask
+from pass_finder import coarse_step_days, elevation_mask, look_function, sweep_passes
+from tle_catalog import TLECatalog, synthetic_catalog
+
+# === Configurations ===
+TLE_FILE = 'iss.tle'
+MASK_FILE = 'horizon_mask.txt'
+SATELLITES = 20
+DAYS = 30
+LATITUDE = 46.4667
+LONGITUDE = 6.8616
+ALTITUDE = 500
+CHECK_PASSES = 100           # masked passes of the first satellite checked against a 1-second brute-force grid
+CHECK_MARGIN_S = 600
+
+ts = load.timescale()
+catalog = synthetic_catalog(TLECatalog.from_file(TLE_FILE), SATELLITES)
+observer = Topos(latitude_degrees=LATITUDE, longitude_degrees=LONGITUDE, elevation_m=ALTITUDE)
+mask = HorizonMask.from_file(MASK_FILE)
+flat = elevation_mask(0.0, None)
+t0 = catalog.satellite(0, ts).epoch
+
+
+def counting(look_at, counter):
+    def counted(jd):
+        counter[0] += np.size(jd)
+        return look_at(jd)
+    return counted
+
+
+def sweep_all(horizon):
+    # Every satellite through the same sweep; returns the passes and the points propagated
+    counter = [0]
+    passes = []
+    for i in range(SATELLITES):
+        satellite = catalog.satellite(i, ts)
+        look_at = counting(look_function(satellite, observer, ts), counter)
+        for aos, tca, los in sweep_passes(look_at, coarse_step_days(satellite), t0.tt, DAYS, horizon):
+            passes.append((i, aos, tca, los))
+    return passes, counter[0]
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+# === Step 1: Masked vs unmasked sweep cost ===
+(unmasked, unmasked_points), unmasked_s = timed(lambda: sweep_all(flat))
+(masked, masked_points), masked_s = timed(lambda: sweep_all(mask))
+
+
+def filter_after(passes):
+    # What the PyEphem path did: find every pass, then drop those culminating behind the mask
+    kept = 0
+    for i, aos, tca, los in passes:
+        alt, az = look_function(catalog.satellite(i, ts), observer, ts)(tca)
+        kept += int(np.sum(mask.clearance(alt, az) >= 0.0))
+    return kept
+
+
+filtered, filter_s = timed(lambda: filter_after(unmasked))
+count = lambda passes: sum(p[1].size for p in passes)
+
+print(f"{SATELLITES} satellites x {DAYS} days, mask {mask.lowest:.0f}-{mask.highest:.0f} deg "
+      f"({mask.table.size} azimuth bins)")
+print(f"{'':<26} {'TIME s':<9} {'POINTS':<11} {'PASSES':<8}")
+print("=" * 56)
+print(f"{'unmasked sweep':<26} {unmasked_s:<9.2f} {unmasked_points:<11,} {count(unmasked):<8}")
+print(f"{'masked sweep':<26} {masked_s:<9.2f} {masked_points:<11,} {count(masked):<8}")
+print(f"{'unmasked + filter':<26} {unmasked_s + filter_s:<9.2f} {'-':<11} {filtered:<8}")
+
+# === Step 2: Masked AOS/LOS against a brute-force 1-second grid ===
+satellite = catalog.satellite(0, ts)
+look_at = look_function(satellite, observer, ts)
+errors, crossing, obstructed = [], [], 0
+for _, aos, _, los in [p for p in masked if p[0] == 0]:
+    for a, b in zip(aos, los):
+        if len(crossing) >= CHECK_PASSES:
+            break
+        crossing.append(np.max(np.abs(mask.clearance(*look_at(np.array([a, b]))))))
+        grid = np.arange(a - CHECK_MARGIN_S / 86400.0, b + CHECK_MARGIN_S / 86400.0, 1.0 / 86400.0)
+        visible = mask.clearance(*look_at(grid)) >= 0.0
+        if np.count_nonzero(np.diff(visible.astype(int))) > 2:
+            # Hidden mid-pass; AOS/LOS then bound the visible stretch around culmination
+            obstructed += 1
+            continue
+        seen = np.flatnonzero(visible)
+        errors.append(max(abs(grid[seen[0]] - a), abs(grid[seen[-1]] - b)) * 86400.0)
+
+print(f"\n{len(crossing)} masked passes: mask clearance at AOS/LOS within {max(crossing):.1e} deg")
+print(f"{len(errors)} unobstructed: max AOS/LOS difference to the 1 s grid {max(errors):.2f} s; "
+      f"{obstructed} hidden behind the mask mid-pass")
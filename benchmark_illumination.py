@@ -0,0 +1,85 @@
+from skyfield.api import load, Topos, EarthSatellite
+import ephem
+import numpy as np
+import time
+
+from illumination import VISIBILITY_LABELS, illuminate_passes, load_ephemeris, pass_columns
+from pass_finder import find_passes
+
+# === Configurations ===
+TLE_FILE = 'iss.tle'
+LATITUDE = '46.4667'
+LONGITUDE = '6.8616'
+ALTITUDE = 500
+DAYS = 365
+MIN_ELEVATION = 0
+REPEATS = 5                  # both stages are timed as the best of this many runs
+
+# === Step 1: A year of ISS passes ===
+ts = load.timescale()
+with open(TLE_FILE) as file:
+    tle = file.readlines()
+
+satellite = EarthSatellite(tle[1].strip(), tle[2].strip(), tle[0].strip(), ts)
+observer = Topos(latitude_degrees=float(LATITUDE), longitude_degrees=float(LONGITUDE), elevation_m=ALTITUDE)
+passes = list(find_passes(satellite, observer, satellite.epoch, DAYS, MIN_ELEVATION))
+print(f"{len(passes)} passes over {DAYS} days")
+
+# === Step 2: The original per-pass PyEphem approach ===
+ephem_observer = ephem.Observer()
+ephem_observer.lat = LATITUDE
+ephem_observer.lon = LONGITUDE
+ephem_observer.elev = ALTITUDE
+
+
+def compute_sun_elevation(rise_time):
+    ephem_observer.date = rise_time
+    sun = ephem.Sun(ephem_observer)
+    return round(sun.alt * (180 / 3.14159), 1)
+
+
+def get_visibility(sun_altitude, max_altitude):
+    if sun_altitude > 0:
+        return "NO"
+    elif -6 < sun_altitude <= 0:
+        return "Unlikely"
+    elif -12 < sun_altitude <= -6:
+        return "Possible" if max_altitude > 20 else "Unlikely"
+    elif -18 < sun_altitude <= -12:
+        return "Likely" if max_altitude > 30 else "Possible"
+    else:
+        return "YES" if max_altitude > 30 else "Unlikely (too low)"
+
+
+def best_of(function):
+    best = float('inf')
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def legacy():
+    sun = [compute_sun_elevation(p['aos_time']) for p in passes]
+    return sun, [get_visibility(s, p['max_altitude']) for s, p in zip(sun, passes)]
+
+
+(legacy_sun, legacy_visibility), legacy_s = best_of(legacy)
+
+# === Step 3: The batched Skyfield stage ===
+eph = load_ephemeris()
+aos, max_altitude, los = pass_columns(passes, ts)
+illuminate_passes(satellite, observer, ts, aos[:2], max_altitude[:2], los[:2], eph)    # warm-up
+
+(sun_alt, sunlit, visibility), batched_s = best_of(
+    lambda: illuminate_passes(satellite, observer, ts, aos, max_altitude, los, eph))
+
+labels = VISIBILITY_LABELS[visibility]
+same = np.mean([a == b for a, b in zip(labels, legacy_visibility) if a != 'Eclipsed'])
+print(f"\nPer-pass PyEphem:  {legacy_s * 1000:8.1f} ms (Sun altitude at AOS only)")
+print(f"Batched Skyfield:  {batched_s * 1000:8.1f} ms (Sun altitude + {len(passes)} x 16 shadow samples)")
+print(f"Max Sun altitude difference: {np.max(np.abs(sun_alt - legacy_sun)):.2f}°")
+print(f"Same category where not eclipsed: {same:.1%}")
+for code, label in enumerate(VISIBILITY_LABELS):
+    print(f"  {label:<20} {np.count_nonzero(visibility == code)}")
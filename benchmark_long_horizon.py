@@ -0,0 +1,76 @@
+from skyfield.api import load, Topos
+import numpy as np
+import time
+
+from pass_finder import find_long_horizon_passes, find_passes
+from stage_profiler import profiler
+from tle_catalog import TLECatalog, synthetic_catalog
+
+# === Configurations ===
+TLE_FILE = 'iss.tle'
+SATELLITES = 10
+HORIZONS_DAYS = [7, 30, 90]
+BUCKETS_DAYS = [0, 3, 7, 14, 30, 60, 90]
+LATITUDE = 46.4667
+LONGITUDE = 6.8616
+ALTITUDE = 500
+
+ts = load.timescale()
+catalog = synthetic_catalog(TLECatalog.from_file(TLE_FILE), SATELLITES)
+satellites = [catalog.satellite(i, ts) for i in range(SATELLITES)]
+observer = Topos(latitude_degrees=LATITUDE, longitude_degrees=LONGITUDE, elevation_m=ALTITUDE)
+
+
+def schedule(finder, days):
+    # Every satellite from its own TLE epoch, the way a fresh schedule starts
+    return [list(finder(satellite, observer, satellite.epoch, days)) for satellite in satellites]
+
+
+def run(finder, days):
+    # Wall time with the hooks off, then the propagated points with them on
+    start = time.perf_counter()
+    passes = schedule(finder, days)
+    elapsed = time.perf_counter() - start
+    profiler.enable()
+    profiler.reset()
+    schedule(finder, days)
+    points = profiler.totals['propagation'][3]
+    profiler.enabled = False
+    return passes, elapsed, points
+
+
+def seconds(passes, key):
+    return np.array([p[key].timestamp() for p in passes])
+
+
+schedule(find_passes, 1)
+
+# === Step 1: CPU for schedules of a week to three months ===
+print(f"{SATELLITES} satellites, refined to {0.1:.0%} of the predicted timing error")
+print(f"{'DAYS':<6} {'PASSES':<8} {'FULL s':<8} {'BUDGET s':<9} {'SPEEDUP':<8} {'FULL pts':<10} {'BUDGET pts':<10}")
+print("=" * 63)
+for days in HORIZONS_DAYS:
+    full, full_s, full_points = run(find_passes, days)
+    budget, budget_s, budget_points = run(find_long_horizon_passes, days)
+    assert [len(p) for p in full] == [len(p) for p in budget]  # ✅ the same passes, only the timing differs
+    print(f"{days:<6} {sum(map(len, full)):<8} {full_s:<8.2f} {budget_s:<9.2f} {full_s / budget_s:<8.1f} "
+          f"{full_points:<10} {budget_points:<10}")
+
+# === Step 2: Timing differences against the predicted error, by days from the TLE epoch ===
+print()
+print(f"{'DAYS FROM EPOCH':<16} {'PASSES':<7} {'ERROR s':<8} {'MAX dAOS s':<11} {'MAX dTCA s':<11} {'MAX dLOS s':<11}")
+print("=" * 68)
+epochs = np.concatenate([np.full(len(p), satellite.epoch.utc_datetime().timestamp())
+                         for satellite, p in zip(satellites, full)])
+full_passes = [p for passes in full for p in passes]
+budget_passes = [p for passes in budget for p in passes]
+age = (seconds(full_passes, 'max_time') - epochs) / 86400.0
+error = np.array([p['timing_error_s'] for p in budget_passes])
+delta = {key: np.abs(seconds(budget_passes, key) - seconds(full_passes, key))
+         for key in ('aos_time', 'max_time', 'los_time')}
+for lo, hi in zip(BUCKETS_DAYS[:-1], BUCKETS_DAYS[1:]):
+    k = (age >= lo) & (age < hi)
+    print(f"{f'{lo}-{hi}':<16} {np.count_nonzero(k):<7} {np.median(error[k]):<8.2f} "
+          f"{delta['aos_time'][k].max():<11.3f} {delta['max_time'][k].max():<11.3f} {delta['los_time'][k].max():<11.3f}")
+worst = max(np.max(d / error) for d in delta.values())
+print(f"Largest difference: {worst:.2f} of the predicted error")
@@ -0,0 +1,62 @@
+from skyfield.api import load, Topos, EarthSatellite
+import numpy as np
+import os
+import time
+
+from look_ephemeris import LookEphemeris, open_look_ephemeris, write_look_ephemeris
+from pass_scheduler import Site
+from tle_catalog import unix_times
+from tle_store import TLEStore
+
+# === Configurations ===
+TLE_FILE = 'iss.tle'
+EPHEMERIS_FILE = 'iss_lausanne.lookeph'
+SITE = Site('Lausanne', 46.4667, 6.8616, 500)
+DAYS = 3
+LOOKUPS = 100000
+
+# === Step 1: Precompute three days at one-second steps ===
+ts = load.timescale()
+with open(TLE_FILE) as file:
+    tle = file.readlines()
+satellite = EarthSatellite(tle[1].strip(), tle[2].strip(), tle[0].strip(), ts)
+start_unix = (satellite.epoch.utc_datetime()).timestamp()
+
+start = time.perf_counter()
+write_look_ephemeris(EPHEMERIS_FILE, tle, SITE, start_unix, DAYS)
+print(f"Wrote {os.path.getsize(EPHEMERIS_FILE) / 1e6:.1f} MB in {time.perf_counter() - start:.2f} s")
+
+# === Step 2: Random lookups from the memory-mapped table ===
+ephemeris = LookEphemeris(EPHEMERIS_FILE)
+rng = np.random.default_rng(0)
+times = start_unix + rng.uniform(0, DAYS * 86400, LOOKUPS)
+
+start = time.perf_counter()
+for seconds in times[:10000]:
+    ephemeris.at(seconds)
+single_us = (time.perf_counter() - start) / 10000 * 1e6
+
+start = time.perf_counter()
+rows = ephemeris.at(times)
+batch_ns = (time.perf_counter() - start) / LOOKUPS * 1e9
+print(f"Single lookup: {single_us:.1f} µs, batched lookup: {batch_ns:.0f} ns per time")
+
+# === Step 3: Interpolation error against direct Skyfield evaluation ===
+observer = Topos(latitude_degrees=SITE.latitude, longitude_degrees=SITE.longitude, elevation_m=SITE.elevation_m)
+check = times[:2000]
+alt, az, distance = (satellite - observer).at(unix_times(ts, check)).altaz()
+rows = ephemeris.at(check)
+d_az = np.abs((rows[:, 1] - az.degrees + 180) % 360 - 180)
+print(f"Max error: elevation {np.max(np.abs(rows[:, 0] - alt.degrees)):.4f}°, "
+      f"azimuth (above horizon) {np.max(d_az[alt.degrees > 0]):.4f}°, "
+      f"range {np.max(np.abs(rows[:, 2] - distance.km)):.3f} km")
+
+# === Step 4: A newer TLE invalidates the table; an outdated window is rebuilt ===
+with TLEStore(':memory:') as store:
+    store.import_lines(tle)
+    print("Stale with the same TLE:", ephemeris.is_stale(ephemeris.tle_epoch_jd))
+    print("Stale with a TLE one day newer:", ephemeris.is_stale(ephemeris.tle_epoch_jd + 1.0))
+    reopened = open_look_ephemeris(EPHEMERIS_FILE, store, 'ISS (ZARYA)', SITE, DAYS)
+    print("Rebuilt to start at the current time:", reopened.start_unix != ephemeris.start_unix)
+
+os.remove(EPHEMERIS_FILE)
@@ -0,0 +1,77 @@
+from skyfield.api import Topos, load
+import numpy as np
+import os
+import time
+
+from pass_cache import PassCache
+from pass_scheduler import Site
+from pass_table import find_pass_table
+from tle_catalog import TLECatalog, synthetic_catalog, unix_times
+
+# === Configurations ===
+TLE_FILE = 'iss.tle'
+CACHE_FILE = 'benchmark_pass_cache.sqlite'
+SITE = Site('Lausanne', 46.4667, 6.8616, 500)
+WINDOW_DAYS = 30
+SHIFT_DAYS = 1               # the sliding-window query starts this much later
+SATELLITES = 40              # for the eviction run
+SMALL_MEMORY_BYTES = 64 * 1024
+SMALL_DISK_BYTES = 96 * 1024
+
+DAY_S = 86400.0
+
+
+def timed(label, function):
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {elapsed * 1000:10.1f} ms  {len(result):>6} passes")
+    return result
+
+
+ts = load.timescale()
+catalog = TLECatalog.from_file(TLE_FILE)
+iss = catalog.entries()[0]
+start = catalog.satellite(0, ts).epoch.utc_datetime().timestamp()
+end = start + WINDOW_DAYS * DAY_S
+if os.path.exists(CACHE_FILE):
+    os.remove(CACHE_FILE)
+
+print(f"ISS from {SITE.name}, {WINDOW_DAYS}-day windows")
+print(f"{'QUERY':<40} {'TIME':>13}  {'PASSES':>13}")
+print("=" * 70)
+observer = Topos(latitude_degrees=SITE.latitude, longitude_degrees=SITE.longitude, elevation_m=SITE.elevation_m)
+timed("no cache (find_pass_table)",
+      lambda: find_pass_table(catalog.satellite(0, ts), observer, unix_times(ts, start), WINDOW_DAYS))
+with PassCache(CACHE_FILE, ts=ts) as cache:
+    timed("cold (nothing cached)", lambda: cache.passes(iss, SITE, start, end))
+    timed("same window, in process", lambda: cache.passes(iss, SITE, start, end))
+    shifted = timed(f"shifted {SHIFT_DAYS} day, in process",
+                    lambda: cache.passes(iss, SITE, start + SHIFT_DAYS * DAY_S, end + SHIFT_DAYS * DAY_S))
+    timed("inside the cached range", lambda: cache.passes(iss, SITE, start + 7 * DAY_S, start + 14 * DAY_S))
+    print(cache.info())
+with PassCache(CACHE_FILE, ts=ts) as cache:
+    timed("same window, new process (SQLite)", lambda: cache.passes(iss, SITE, start, end))
+    print(cache.info())
+
+# ✅ Stitched segments must give exactly what one sweep over the window gives
+direct = find_pass_table(catalog.satellite(0, ts), observer, unix_times(ts, start + SHIFT_DAYS * DAY_S),
+                         WINDOW_DAYS).data
+direct = direct[(direct['aos_time'] >= start + SHIFT_DAYS * DAY_S) & (direct['aos_time'] < end + SHIFT_DAYS * DAY_S)]
+assert len(direct) == len(shifted), (len(direct), len(shifted))
+print(f"\nShifted window vs one direct sweep: {len(direct)} passes, max |dAOS| "
+      f"{np.abs(direct['aos_time'] - shifted.data['aos_time']).max():.3f} s, max |dLOS| "
+      f"{np.abs(direct['los_time'] - shifted.data['los_time']).max():.3f} s")
+
+# === Eviction ===
+others = synthetic_catalog(catalog, SATELLITES).entries()
+os.remove(CACHE_FILE)
+with PassCache(CACHE_FILE, memory_bytes=SMALL_MEMORY_BYTES, disk_bytes=SMALL_DISK_BYTES, ts=ts) as cache:
+    for tle in others:
+        cache.passes(tle, SITE, start, start + 7 * DAY_S)
+    info = cache.info()
+print(f"\n{SATELLITES} satellites x 7 days with {SMALL_MEMORY_BYTES // 1024} KiB in memory and "
+      f"{SMALL_DISK_BYTES // 1024} KiB on disk:")
+print(f"  memory: {info['memory_keys']} keys, {info['memory_bytes'] // 1024} KiB, "
+      f"{info['memory_evictions']} evicted")
+print(f"  disk:   {info['disk_keys']} keys, {info['disk_bytes'] // 1024} KiB, {info['disk_evictions']} evicted")
@@ -0,0 +1,45 @@
+from skyfield.api import load, Topos, EarthSatellite
+import time
+
+from pass_finder import find_next_passes, find_next_passes_legacy
+
+# === Configurations ===
+TLE_FILE = 'iss.tle'
+LATITUDE = 46.4667
+LONGITUDE = 6.8616
+ALTITUDE = 500
+MIN_ELEVATION = 0
+PASS_COUNTS = [12, 50, 500]
+REPEATS = 3
+
+# === Step 1: Load TLE ===
+ts = load.timescale()
+with open(TLE_FILE) as file:
+    tle = file.readlines()
+
+satellite = EarthSatellite(tle[1].strip(), tle[2].strip(), tle[0].strip(), ts)
+observer = Topos(latitude_degrees=LATITUDE, longitude_degrees=LONGITUDE, elevation_m=ALTITUDE)
+
+# Start at the TLE epoch so every run searches the same sky
+t0 = satellite.epoch
+
+
+def best_time(function, count):
+    best, result = float('inf'), None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = function(satellite, observer, count, MIN_ELEVATION, t0)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+# === Step 2: Time both engines ===
+print(f"{'PASSES':<8} {'LEGACY s':<10} {'SWEEP s':<10} {'SPEEDUP':<8} {'MAX dAOS s':<11} {'MAX dLOS s':<11}")
+print("=" * 62)
+for count in PASS_COUNTS:
+    legacy_s, legacy = best_time(find_next_passes_legacy, count)
+    sweep_s, sweep = best_time(find_next_passes, count)
+
+    d_aos = max(abs((a['aos_time'] - b['aos_time']).total_seconds()) for a, b in zip(legacy, sweep))
+    d_los = max(abs((a['los_time'] - b['los_time']).total_seconds()) for a, b in zip(legacy, sweep))
+    print(f"{count:<8} {legacy_s:<10.3f} {sweep_s:<10.3f} {legacy_s / sweep_s:<8.1f} {d_aos:<11.3f} {d_los:<11.3f}")
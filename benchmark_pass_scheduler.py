@@ -0,0 +1,37 @@
+from skyfield.api import load
+import os
+import time
+
+from pass_scheduler import Site, schedule_passes, print_worker_stats
+from tle_catalog import TLECatalog, synthetic_catalog
+
+# === Configurations ===
+TLE_FILE = 'iss.tle'
+SATELLITES = 50
+DAYS = 3
+MIN_ELEVATION = 10
+WORKER_COUNTS = [1, 2, os.cpu_count()]
+
+SITES = [
+    Site('Lausanne', 46.4667, 6.8616, 500),
+    Site('Reykjavik', 64.1466, -21.9426, 50),
+    Site('Nairobi', -1.2921, 36.8219, 1795),
+    Site('Sydney', -33.8688, 151.2093, 50),
+]
+
+
+if __name__ == '__main__':
+    ts = load.timescale()
+    catalog = TLECatalog.from_file(TLE_FILE)
+    satellites = synthetic_catalog(catalog, SATELLITES).entries()
+    t0 = ts.tt_jd(catalog.epoch_jd[0])
+
+    for workers in sorted(set(WORKER_COUNTS)):
+        print(f"\n--- {SATELLITES} satellites x {len(SITES)} sites, {DAYS} days, {workers} worker(s) ---")
+        start = time.perf_counter()
+        passes, stats = schedule_passes(satellites, SITES, t0, DAYS, MIN_ELEVATION, max_workers=workers)
+        print_worker_stats(stats, time.perf_counter() - start)
+
+    print("\nFirst passes of the merged schedule:")
+    for p in passes[:5]:
+        print(f"{p['aos_time']:%d.%m %H:%M:%S}  {p['satellite']:<8} {p['site']:<10} MEL {p['max_altitude']:.0f}°")
@@ -0,0 +1,130 @@
+from concurrent.futures import ThreadPoolExecutor
+from skyfield.api import load
+import http.client
+import numpy as np
+import os
+import socket
+import threading
+import time
+
+from pass_scheduler import Site
+from pass_service import PassService, make_server
+from tle_catalog import TLECatalog, synthetic_catalog
+
+# === Configurations ===
+TLE_FILE = 'iss.tle'
+SCHEDULE_FILE = 'benchmark_pass_service.sqlite'
+SOCKET_FILE = 'benchmark_pass_service.sock'
+TCP_ADDRESS = '127.0.0.1:8766'
+SATELLITES = 200
+SITE = Site('Lausanne', 46.4667, 6.8616, 500)
+WINDOW_S = 3600              # overlap queries ask for one hour
+QUERIES = 2000               # in-process queries per method
+REQUESTS_PER_CLIENT = 300
+CLIENTS = [1, 8, 32]
+
+
+class UnixConnection(http.client.HTTPConnection):
+    def __init__(self, path):
+        super().__init__('localhost')
+        self.path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.path)
+
+
+ts = load.timescale()
+catalog = synthetic_catalog(TLECatalog.from_file(TLE_FILE), SATELLITES)
+now = catalog.satellite(0, ts).epoch.utc_datetime().timestamp()
+if os.path.exists(SCHEDULE_FILE):
+    os.remove(SCHEDULE_FILE)
+
+# === Step 1: Build the service from a fresh 14-day schedule ===
+service = PassService([SITE], catalog.entries, SCHEDULE_FILE, ts=ts)
+service.refresh(now)
+status = service.status()
+print(f"{SATELLITES} objects, {status['sites'][SITE.name]} passes indexed in {status['refresh_s']:.2f} s")
+
+# === Step 2: Interval index vs a full scan, in process ===
+index = service._indexes[(SITE.name, None)]
+data, satellites = index.table.data, index.table.satellites
+rng = np.random.default_rng(1)
+starts = rng.uniform(now, now + 14 * 86400 - WINDOW_S, QUERIES)
+names = [str(name) for name in satellites[rng.integers(0, len(satellites), QUERIES)]]
+
+
+def scan(start, end):
+    return np.flatnonzero((data['aos_time'] < end) & (data['los_time'] > start))
+
+
+def per_query_us(function):
+    begin = time.perf_counter()
+    for start in starts:
+        function(start, start + WINDOW_S)
+    return (time.perf_counter() - begin) / QUERIES * 1e6
+
+
+for start, name in zip(starts, names):
+    assert np.array_equal(index.overlapping(start, start + WINDOW_S), scan(start, start + WINDOW_S))  # ✅
+    expected = data[(data['satellite'] == np.flatnonzero(satellites == name)[0]) & (data['los_time'] > start)][:5]
+    assert np.array_equal(service.next(SITE.name, start, 5, name).data, expected)  # ✅
+    table = service.overlapping(SITE.name, start, start + WINDOW_S)
+    assert b''.join(table.jsonl_chunks()) == service.overlapping(SITE.name, start, start + WINDOW_S, jsonl=True)
+print(f"Overlap query over {len(data)} passes: index {per_query_us(index.overlapping):.1f} us, "
+      f"full scan {per_query_us(scan):.1f} us")
+
+# === Step 3: Latency under concurrent clients, TCP and Unix socket ===
+servers = {'tcp': make_server(service, TCP_ADDRESS), 'unix': make_server(service, SOCKET_FILE)}
+for server in servers.values():
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+host, _, port = TCP_ADDRESS.rpartition(':')
+connect = {'tcp': lambda: http.client.HTTPConnection(host, int(port)), 'unix': lambda: UnixConnection(SOCKET_FILE)}
+
+
+def client(transport, seed):
+    # One keep-alive connection; alternates overlap and next-10 queries
+    connection = connect[transport]()
+    rng = np.random.default_rng(seed)
+    latencies = []
+    for k in range(REQUESTS_PER_CLIENT):
+        start = rng.uniform(now, now + 14 * 86400 - WINDOW_S)
+        path = (f'/passes?site={SITE.name}&start={start}&end={start + WINDOW_S}' if k % 2
+                else f'/next?site={SITE.name}&after={start}&count=10')
+        begin = time.perf_counter()
+        connection.request('GET', path)
+        response = connection.getresponse()
+        body = response.read()
+        latencies.append(time.perf_counter() - begin)
+        assert response.status == 200 and body  # ✅
+    connection.close()
+    return latencies
+
+
+def load_test(transport, clients, during=None):
+    begin = time.perf_counter()
+    with ThreadPoolExecutor(clients + 1) as pool:
+        background = pool.submit(during) if during else None
+        latencies = np.concatenate(list(pool.map(lambda seed: client(transport, seed), range(clients))))
+        if background:
+            background.result()
+    wall = time.perf_counter() - begin
+    return np.percentile(latencies, 50) * 1000, np.percentile(latencies, 99) * 1000, latencies.size / wall
+
+
+print()
+print(f"{'TRANSPORT':<10} {'CLIENTS':<8} {'P50 ms':<8} {'P99 ms':<8} {'REQ/s':<8}")
+print("=" * 46)
+for transport in servers:
+    for clients in CLIENTS:
+        p50, p99, rate = load_test(transport, clients)
+        print(f"{transport:<10} {clients:<8} {p50:<8.2f} {p99:<8.2f} {rate:<8.0f}")
+
+# === Step 4: Queries keep being answered while a refresh runs ===
+p50, p99, rate = load_test('unix', 8, lambda: service.refresh(now + 7200))
+print(f"{'unix':<10} {8:<8} {p50:<8.2f} {p99:<8.2f} {rate:<8.0f} (refreshing)")
+
+for server in servers.values():
+    server.shutdown()
+    server.server_close()
+os.remove(SOCKET_FILE)
@@ -0,0 +1,95 @@
+from skyfield.api import load, Topos
+from zoneinfo import ZoneInfo
+import csv
+import json
+import os
+import time
+import tracemalloc
+
+from pass_finder import find_passes
+from pass_table import PassTable, find_pass_table
+from tle_catalog import TLECatalog, synthetic_catalog
+
+# === Configurations ===
+TLE_FILE = 'iss.tle'
+SATELLITES = 10
+DAYS = 365
+LATITUDE = 46.4667
+LONGITUDE = 6.8616
+ALTITUDE = 500
+LOCAL_TIMEZONE = ZoneInfo("Europe/Zurich")
+OUTPUT = 'benchmark_pass_table'
+
+ts = load.timescale()
+catalog = synthetic_catalog(TLECatalog.from_file(TLE_FILE), SATELLITES)
+observer = Topos(latitude_degrees=LATITUDE, longitude_degrees=LONGITUDE, elevation_m=ALTITUDE)
+t0 = catalog.satellite(0, ts).epoch
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+# === Step 1: A year of passes, as dicts and as a table ===
+tracemalloc.start()
+records, records_s = timed(lambda: [dict(p, satellite=str(catalog.names[i]))
+                                    for i in range(SATELLITES)
+                                    for p in find_passes(catalog.satellite(i, ts), observer, t0, DAYS)])
+records_mb = tracemalloc.get_traced_memory()[0] / 1e6
+tracemalloc.stop()
+
+table, table_s = timed(lambda: PassTable.concatenate([find_pass_table(catalog.satellite(i, ts), observer, t0, DAYS)
+                                                      for i in range(SATELLITES)]))
+print(f"{len(records)} passes ({SATELLITES} satellites x {DAYS} days)")
+print(f"{'':<22} {'DICTS':<12} {'TABLE':<12}")
+print("=" * 46)
+print(f"{'build (s)':<22} {records_s:<12.2f} {table_s:<12.2f}")
+print(f"{'memory (MB)':<22} {records_mb:<12.1f} {table.nbytes / 1e6:<12.1f}")
+
+
+# === Step 2: Local-time formatting, like the scripts' table output ===
+def format_records():
+    return [(p['aos_time'].astimezone(LOCAL_TIMEZONE).strftime('%d.%m'),
+             p['aos_time'].astimezone(LOCAL_TIMEZONE).strftime('%H:%M:%S'),
+             p['max_time'].astimezone(LOCAL_TIMEZONE).strftime('%H:%M:%S'),
+             p['los_time'].astimezone(LOCAL_TIMEZONE).strftime('%H:%M:%S')) for p in records]
+
+
+def format_table():
+    return (table.format_times('aos_time', LOCAL_TIMEZONE, '%d.%m'),
+            table.format_times('aos_time', LOCAL_TIMEZONE, '%H:%M:%S'),
+            table.format_times('max_time', LOCAL_TIMEZONE, '%H:%M:%S'),
+            table.format_times('los_time', LOCAL_TIMEZONE, '%H:%M:%S'))
+
+
+formatted, format_records_s = timed(format_records)
+columns, format_table_s = timed(format_table)
+same = all(tuple(column[i] for column in columns) == formatted[i] for i in range(len(formatted)))
+print(f"{'local-time format (s)':<22} {format_records_s:<12.3f} {format_table_s:<12.3f} identical: {same}")
+
+
+# === Step 3: Export ===
+def write_csv():
+    with open(f'{OUTPUT}_dicts.csv', 'w', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=list(records[0]))
+        writer.writeheader()
+        writer.writerows(records)
+
+
+def write_jsonl():
+    with open(f'{OUTPUT}_dicts.jsonl', 'w') as file:
+        for p in records:
+            file.write(json.dumps(p, default=str) + '\n')
+
+
+for label, slow, fast in [('CSV', write_csv, lambda: table.to_csv(f'{OUTPUT}.csv')),
+                          ('JSON lines', write_jsonl, lambda: table.to_jsonl(f'{OUTPUT}.jsonl')),
+                          ('Parquet', None, lambda: table.to_parquet(f'{OUTPUT}.parquet'))]:
+    slow_s = f"{timed(slow)[1]:.3f}" if slow else '-'
+    fast_s = timed(fast)[1]
+    print(f"{label + ' export (s)':<22} {slow_s:<12} {fast_s:<12.3f}")
+
+for suffix in ('_dicts.csv', '_dicts.jsonl', '.csv', '.jsonl', '.parquet'):
+    os.remove(OUTPUT + suffix)
@@ -0,0 +1,58 @@
+from skyfield.api import load, Topos, EarthSatellite
+import numpy as np
+import time
+
+from pass_finder import find_passes, find_propagator_passes
+from pass_scheduler import Site
+from propagators import BACKENDS, make_propagator
+from tle_catalog import unix_times
+from tracker import Tracker
+
+# === Configurations ===
+TLE_FILE = 'iss.tle'
+SITE = Site('Lausanne', 46.4667, 6.8616, 500)
+POSITION_SAMPLES = 8640      # one day at 10 s
+PASS_DAYS = 7
+
+ts = load.timescale()
+with open(TLE_FILE) as file:
+    tle = file.readlines()
+satellite = EarthSatellite(tle[1].strip(), tle[2].strip(), tle[0].strip(), ts)
+observer = Topos(latitude_degrees=SITE.latitude, longitude_degrees=SITE.longitude, elevation_m=SITE.elevation_m)
+reference_passes = list(find_passes(satellite, observer, satellite.epoch, PASS_DAYS))
+best = max(reference_passes[:6], key=lambda p: p['max_altitude'])
+unix = np.arange(best['aos_time'].timestamp(), best['los_time'].timestamp(), 0.5)
+ref_alt, ref_az, _ = (satellite - observer).at(unix_times(ts, unix)).altaz()
+
+print(f"{'BACKEND':<10} {'POSITIONS/s':<13} {'MAX dENU km':<13} {'PASSES/s':<10} {'MAX dAOS s':<11} "
+      f"{'MAX dMEL':<9} {'TRACK dEL':<10}")
+print("=" * 82)
+reference = None
+for backend in BACKENDS:
+    propagator = make_propagator(backend, tle, SITE, ts)
+    jd = propagator.epoch.tt + np.arange(POSITION_SAMPLES) * 10 / 86400.0
+
+    # === Step 1: The positions(times) contract ===
+    propagator.positions(jd[:10])    # warm-up
+    start = time.perf_counter()
+    enu = propagator.positions(jd)
+    positions_per_s = POSITION_SAMPLES / (time.perf_counter() - start)
+    reference = enu if reference is None else reference
+    enu_error = np.max(np.linalg.norm(enu - reference, axis=1))
+
+    # === Step 2: The pass finder on this backend ===
+    start = time.perf_counter()
+    passes = list(find_propagator_passes(propagator, propagator.epoch, PASS_DAYS))
+    passes_per_s = len(passes) / (time.perf_counter() - start)
+    pairs = list(zip(passes, reference_passes)) if len(passes) == len(reference_passes) else []
+    aos_error = max((abs((p['aos_time'] - r['aos_time']).total_seconds()) for p, r in pairs), default=np.nan)
+    mel_error = max((abs(p['max_altitude'] - r['max_altitude']) for p, r in pairs), default=np.nan)
+
+    # === Step 3: The tracker on this backend ===
+    tracker = Tracker(tle, SITE, ts=ts, propagator=propagator)
+    elevation = np.array([tracker.at(seconds).elevation for seconds in unix])
+    track_error = np.max(np.abs(elevation - ref_alt.degrees))
+
+    print(f"{backend:<10} {positions_per_s:<13,.0f} {enu_error:<13.4f} {passes_per_s:<10.1f} {aos_error:<11.3f} "
+          f"{mel_error:<9.4f} {track_error:<10.4f}")
+print(f"\n{len(reference_passes)} reference passes over {PASS_DAYS} days; ENU differences are against the Skyfield backend")
@@ -0,0 +1,61 @@
+from skyfield.api import load, Topos
+import json
+import time
+
+from pass_finder import find_passes
+from stage_profiler import TRACE_FILE, profiler
+from tle_catalog import TLECatalog
+
+# === Configurations ===
+TLE_FILE = 'iss.tle'
+DAYS = 365
+REPEATS = 5
+LATITUDE = 46.4667
+LONGITUDE = 6.8616
+ALTITUDE = 500
+
+ts = load.timescale()
+satellite = TLECatalog.from_file(TLE_FILE).satellite(0, ts)
+observer = Topos(latitude_degrees=LATITUDE, longitude_degrees=LONGITUDE, elevation_m=ALTITUDE)
+t0 = satellite.epoch
+
+
+def run():
+    return list(find_passes(satellite, observer, t0, DAYS))
+
+
+def best_of(function):
+    times = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = function()
+        times.append(time.perf_counter() - start)
+    return result, min(times)
+
+
+# === Step 1: Hooks switched off vs on ===
+run()
+baseline, off_s = best_of(run)
+profiler.enable(trace=True)
+profiled, on_s = best_of(run)
+
+print(f"{DAYS} days of ISS passes, best of {REPEATS}")
+print(f"{'PROFILER':<10} {'SECONDS':<9} {'PASSES':<7}")
+print("=" * 28)
+print(f"{'off':<10} {off_s:<9.3f} {len(baseline):<7}")
+print(f"{'on':<10} {on_s:<9.3f} {len(profiled):<7}")
+print(f"Overhead with spans recorded: {(on_s / off_s - 1) * 100:+.1f}%")
+assert profiled == baseline  # ✅ the hooks do not change the results
+
+# === Step 2: One profiled run, stage by stage ===
+profiler.reset()
+run()
+print()
+print(profiler.summary())
+print()
+print(profiler.log_line())
+
+profiler.write_trace()
+with open(TRACE_FILE) as file:
+    spans = len(json.load(file)['traceEvents'])
+print(f"\n{spans} spans written to {TRACE_FILE} (open in chrome://tracing or Perfetto)")
@@ -0,0 +1,38 @@
+from skyfield.api import load, Topos
+import numpy as np
+import time
+
+from tle_catalog import TLECatalog, look_angles, synthetic_catalog
+
+# === Configurations ===
+TLE_FILE = 'iss.tle'
+LATITUDE = 46.4667
+LONGITUDE = 6.8616
+ALTITUDE = 500
+CATALOG_SIZES = [100, 1000, 10000]
+GRID_MINUTES = 24 * 60       # one day...
+STEP_MINUTES = 1             # ...at one-minute resolution
+
+ts = load.timescale()
+catalog = TLECatalog.from_file(TLE_FILE)
+
+t = ts.tt_jd(catalog.epoch_jd[0] + np.arange(0, GRID_MINUTES, STEP_MINUTES) / 1440.0)
+
+# === Step 1: Check the batched path against Skyfield for the ISS ===
+alt, az, distance = look_angles(catalog, t, LATITUDE, LONGITUDE, ALTITUDE)
+observer = Topos(latitude_degrees=LATITUDE, longitude_degrees=LONGITUDE, elevation_m=ALTITUDE)
+alt_sf, az_sf, distance_sf = (catalog.satellite(0, ts) - observer).at(t).altaz()
+d_az = np.abs((az[0] - az_sf.degrees + 180) % 360 - 180)
+print(f"ISS vs Skyfield: max dAlt {np.max(np.abs(alt[0] - alt_sf.degrees)):.4f}°, "
+      f"max dAz (above horizon) {np.max(d_az[alt[0] > 0]):.4f}°, "
+      f"max dRange {np.max(np.abs(distance[0] - distance_sf.km)):.3f} km")
+
+# === Step 2: Scale the catalog ===
+print(f"\n{'SATELLITES':<12} {'TIMES':<8} {'SECONDS':<10} {'POSITIONS/s':<14}")
+print("=" * 46)
+for size in CATALOG_SIZES:
+    synthetic = synthetic_catalog(catalog, size)
+    start = time.perf_counter()
+    alt, az, distance = look_angles(synthetic, t, LATITUDE, LONGITUDE, ALTITUDE)
+    elapsed = time.perf_counter() - start
+    print(f"{size:<12} {alt.shape[1]:<8} {elapsed:<10.3f} {alt.size / elapsed:<14,.0f}")
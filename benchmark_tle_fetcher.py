@@ -0,0 +1,134 @@
+from contextlib import redirect_stdout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+import asyncio
+import hashlib
+import io
+import threading
+import time
+
+from tle_catalog import TLECatalog, synthetic_catalog
+from tle_fetcher import GROUPS, fetch_sources, make_session
+from tle_store import TLEStore
+
+# === Configurations ===
+TLE_FILE = 'iss.tle'
+GROUP_SIZES = [30, 150, 9000, 60, 40, 20, 180, 40, 90, 80, 30, 7000]   # roughly Celestrak's, per group
+LATENCY_SECONDS = 0.15       # stand-in round trip before every response
+BYTES_PER_SECOND = 4e6       # and a throughput limit per connection
+SEND_CHUNK = 16384
+
+
+# === Step 1: Local stand-in for Celestrak ===
+template = TLECatalog.from_file(TLE_FILE)
+files = {}
+for g, (group, size) in enumerate(zip(GROUPS, GROUP_SIZES)):
+    catalog = synthetic_catalog(template, size, seed=g)
+    # Distinct NORAD numbers per group, like the real catalog
+    catalog = TLECatalog.from_elements([f'{group.upper()} {i}' for i in range(size)], catalog.satnum + 10000 * g,
+                                       catalog.epoch_jd, catalog.bstar, catalog.eccentricity, catalog.arg_perigee,
+                                       catalog.inclination, catalog.mean_anomaly, catalog.mean_motion, catalog.raan)
+    text = ''.join(f'{name:<24}\r\n{line1}\r\n{line2}\r\n' for name, line1, line2 in catalog.entries())
+    files[group] = text.encode()
+
+connections = []
+requests_served = []
+
+
+class StandIn(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'     # keep-alive, like the real server
+
+    def setup(self):
+        super().setup()
+        connections.append(self.client_address)
+
+    def do_GET(self):
+        requests_served.append(self.path)
+        time.sleep(LATENCY_SECONDS)
+        group = parse_qs(urlsplit(self.path).query)['GROUP'][0]
+        if group == 'broken':
+            # A misbehaving server: no status code on the status line
+            self.wfile.write(b'HTTP/1.1 OK\r\n\r\n')
+            self.close_connection = True
+            return
+        body = files[group]
+        etag = '"' + hashlib.md5(body).hexdigest() + '"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain')
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', 'Sat, 22 Mar 2025 08:00:00 GMT')
+        # Half of the groups come back chunked, the others with a Content-Length
+        chunked = len(group) % 2 == 0
+        self.send_header('Transfer-Encoding' if chunked else 'Content-Length', 'chunked' if chunked else str(len(body)))
+        self.end_headers()
+        for start in range(0, len(body), SEND_CHUNK):
+            data = body[start:start + SEND_CHUNK]
+            time.sleep(len(data) / BYTES_PER_SECOND)
+            self.wfile.write(b'%x\r\n%s\r\n' % (len(data), data) if chunked else data)
+        if chunked:
+            self.wfile.write(b'0\r\n\r\n')
+
+    def log_message(self, *args):
+        pass
+
+
+server = ThreadingHTTPServer(('127.0.0.1', 0), StandIn)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+urls = [f'http://127.0.0.1:{server.server_port}/NORAD/elements/gp.php?GROUP={group}&FORMAT=tle' for group in GROUPS]
+total = sum(GROUP_SIZES)
+print(f"{len(urls)} groups, {total} element sets, {sum(map(len, files.values())) / 1e6:.1f} MB; "
+      f"{LATENCY_SECONDS * 1000:.0f} ms latency per request")
+
+
+def run(label, function):
+    connections.clear()
+    requests_served.clear()
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<34} {elapsed:<9.2f} {len(requests_served):<9} {len(connections):<12} {result}")
+
+
+def objects(store):
+    return store.connection.execute('SELECT COUNT(*) FROM tle').fetchone()[0]
+
+
+# === Step 2: The old way, one blocking requests.get() per group ===
+def sequential():
+    with TLEStore(':memory:') as store, redirect_stdout(io.StringIO()):
+        for url in urls:
+            store.refresh(url, max_age_hours=0)
+        return f"{objects(store)} stored"
+
+
+# === Step 3: Async, pooled, conditional ===
+store = TLEStore(':memory:')
+
+
+def fetch(max_age_hours, sources=urls):
+    async def main():
+        with make_session() as session:
+            results = await fetch_sources(store, sources, max_age_hours=max_age_hours, session=session)
+        statuses = sorted({type(r.status).__name__ if isinstance(r.status, Exception) else str(r.status)
+                           for r in results})
+        return f"{objects(store)} stored; status {'/'.join(statuses)}, {sum(r.bytes for r in results) / 1e3:,.0f} kB"
+    return asyncio.run(main())
+
+
+print(f"\n{'':<34} {'SECONDS':<9} {'REQUESTS':<9} {'CONNECTIONS':<12} RESULT")
+print("=" * 100)
+run("sequential requests.get()", sequential)
+run("async, first download", lambda: fetch(0))
+run("async, unchanged (ETag -> 304)", lambda: fetch(0))
+run("async, within max age", lambda: fetch(6))
+files['stations'] = files['stations'].replace(b'STATIONS 0 ', b'STATIONS 0*')
+run("async, one group changed", lambda: fetch(0))
+broken = urls[0].replace('GROUP=stations', 'GROUP=broken')
+run("async, plus one malformed server", lambda: fetch(0, urls + [broken]))
+store.close()
+server.shutdown()
@@ -0,0 +1,52 @@
+from skyfield.api import load, Topos, EarthSatellite
+import asyncio
+import numpy as np
+import time
+
+from pass_finder import find_next_passes
+from pass_scheduler import Site
+from tle_catalog import unix_times
+from tracker import Tracker, run_trackers
+
+# === Configurations ===
+TLE_FILE = 'iss.tle'
+SITE = Site('Lausanne', 46.4667, 6.8616, 500)
+LIVE_SECONDS = 3
+ASYNC_TRACKERS = 50
+
+ts = load.timescale()
+with open(TLE_FILE) as file:
+    tle = file.readlines()
+
+# === Step 1: Interpolation error over a whole pass, against Skyfield ===
+satellite = EarthSatellite(tle[1].strip(), tle[2].strip(), tle[0].strip(), ts)
+observer = Topos(latitude_degrees=SITE.latitude, longitude_degrees=SITE.longitude, elevation_m=SITE.elevation_m)
+p = max(find_next_passes(satellite, observer, 6, 0, satellite.epoch), key=lambda p: p['max_altitude'])
+unix = np.arange(p['aos_time'].timestamp(), p['los_time'].timestamp(), 0.1)
+
+tracker = Tracker(tle, SITE, ts=ts)
+points = [tracker.at(seconds) for seconds in unix]
+alt, az, distance = (satellite - observer).at(unix_times(ts, unix)).altaz()
+elevation = np.array([point.elevation for point in points])
+azimuth = np.array([point.azimuth for point in points])
+print(f"Pass with MEL {p['max_altitude']:.0f}°: {len(points)} points from {tracker.stats.sgp4_calls} SGP4 batches")
+print(f"Max error: elevation {np.max(np.abs(elevation - alt.degrees)):.4f}°, "
+      f"azimuth {np.max(np.abs((azimuth - az.degrees + 180) % 360 - 180)):.4f}°, "
+      f"range {np.max(np.abs([point.range_km for point in points] - distance.km)):.3f} km")
+
+start = time.perf_counter()
+for seconds in unix:
+    tracker.at(seconds)
+print(f"Cost per point: {(time.perf_counter() - start) / len(unix) * 1e6:.1f} µs")
+
+# === Step 2: Live 10 Hz stream ===
+tracker = Tracker(tle, SITE, ts=ts)
+for point in tracker.track(LIVE_SECONDS):
+    pass
+print(f"\nLive generator ({LIVE_SECONDS} s):", {k: round(v, 3) for k, v in tracker.stats.summary().items()})
+
+# === Step 3: Many trackers on one asyncio event loop ===
+trackers = [Tracker(tle, SITE, ts=ts) for _ in range(ASYNC_TRACKERS)]
+asyncio.run(run_trackers(trackers, LIVE_SECONDS))
+worst = max(trackers, key=lambda tracker: tracker.stats.max_latency).stats.summary()
+print(f"{ASYNC_TRACKERS} async trackers, worst one:", {k: round(v, 3) for k, v in worst.items()})
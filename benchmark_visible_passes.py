@@ -0,0 +1,77 @@
+from skyfield.api import load, Topos, EarthSatellite
+from skyfield.sgp4lib import TEME
+import numpy as np
+import time
+
+from illumination import (ECLIPSED, NO, VISIBLE_SUN_ALTITUDE, _shadow_margin, _teme_positions, find_visible_passes,
+                          illuminate_passes, load_ephemeris, pass_columns, sun_altitude)
+from pass_finder import find_passes
+
+# === Configurations ===
+TLE_FILE = 'iss.tle'
+LATITUDE = 46.4667
+LONGITUDE = 6.8616
+ALTITUDE = 500
+DAYS = 365
+REPEATS = 3
+CHECK_SAMPLES = 60           # points along every geometric pass for the brute-force visibility check
+
+ts = load.timescale()
+eph = load_ephemeris()
+with open(TLE_FILE) as file:
+    tle = file.readlines()
+satellite = EarthSatellite(tle[1].strip(), tle[2].strip(), tle[0].strip(), ts)
+observer = Topos(latitude_degrees=LATITUDE, longitude_degrees=LONGITUDE, elevation_m=ALTITUDE)
+t0 = satellite.epoch
+
+
+def find_then_filter():
+    # The SUN script's way: every geometric pass, then labels, then drop the hopeless ones
+    passes = list(find_passes(satellite, observer, t0, DAYS))
+    aos, max_altitude, los = pass_columns(passes, ts)
+    _, _, codes = illuminate_passes(satellite, observer, ts, aos, max_altitude, los, eph)
+    return passes, [p for p, code in zip(passes, codes) if code not in (NO, ECLIPSED)]
+
+
+def visible_only():
+    return list(find_visible_passes(satellite, observer, t0, DAYS, eph=eph))
+
+
+def best_of(function):
+    function()
+    times = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = function()
+        times.append(time.perf_counter() - start)
+    return result, min(times)
+
+
+# === Step 1: Find-then-filter vs the visible-only search ===
+(everything, labelled), filter_s = best_of(find_then_filter)
+visible, visible_s = best_of(visible_only)
+print(f"{DAYS} days of ISS passes, Sun below {VISIBLE_SUN_ALTITUDE} deg counts as dark")
+print(f"{'METHOD':<24} {'SECONDS':<9} {'PASSES':<8}")
+print("=" * 42)
+print(f"{'find all + illuminate':<24} {filter_s:<9.3f} {len(everything):<8} ({len(labelled)} not NO/Eclipsed)")
+print(f"{'visible-only search':<24} {visible_s:<9.3f} {len(visible):<8}")
+print(f"Speedup: {filter_s / visible_s:.1f}x")
+
+# === Step 2: Brute force: which geometric passes have a dark, sunlit sample? ===
+aos, _, los = pass_columns(everything, ts)
+t = ts.tt_jd((aos[:, None] + (los - aos)[:, None] * np.linspace(0.0, 1.0, CHECK_SAMPLES)).ravel())
+dark = sun_altitude(observer, t, eph).reshape(aos.size, CHECK_SAMPLES) < VISIBLE_SUN_ALTITUDE
+t_aos = ts.tt_jd(aos)
+sun = np.einsum('ijn,jn->ni', TEME.rotation_at(t_aos), (eph['sun'] - eph['earth']).at(t_aos).xyz.km)
+sun /= np.linalg.norm(sun, axis=1)[:, None]
+lit = _shadow_margin(_teme_positions(satellite, t).reshape(aos.size, CHECK_SAMPLES, 3), sun[:, None, :]) > 0
+samples = dict(zip((round(p['aos_time'].timestamp()) for p in everything), np.sum(dark & lit, axis=1)))
+expected = {key for key, count in samples.items() if count}
+found = {round(p['aos_time'].timestamp()) for p in visible}
+missed, extra = expected - found, found - expected
+print(f"\nBrute force: {len(expected)} visible passes; missed {len(missed)}, extra {len(extra)}")
+# ✅ Only passes whose visible part is shorter than the check spacing may disagree
+assert all(samples[key] <= 1 for key in missed)
+print(f"Dark, sunlit samples of the missed passes: {[int(samples[key]) for key in missed]} of {CHECK_SAMPLES}")
+print(f"Visible part: median {np.median([(p['visible_until'] - p['visible_from']).seconds for p in visible])} s "
+      f"of a median {np.median([p['duration'] for p in visible])} s pass")
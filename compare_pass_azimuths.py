@@ -0,0 +1,52 @@
+from skyfield.api import load, Topos, EarthSatellite
+from datetime import timedelta
+import numpy as np
+
+from pass_finder import find_next_passes
+
+# === Configurations ===
+TLE_FILE = 'iss.tle'
+LATITUDE = 46.4667
+LONGITUDE = 6.8616
+ALTITUDE = 500
+MAX_PASSES = 50
+MIN_ELEVATION = 0
+TOLERANCE_DEGREES = 0.5      # the brute-force reference is sampled once per second
+
+# === Step 1: Load TLE ===
+ts = load.timescale()
+with open(TLE_FILE) as file:
+    tle = file.readlines()
+
+satellite = EarthSatellite(tle[1].strip(), tle[2].strip(), tle[0].strip(), ts)
+observer = Topos(latitude_degrees=LATITUDE, longitude_degrees=LONGITUDE, elevation_m=ALTITUDE)
+passes = find_next_passes(satellite, observer, MAX_PASSES, MIN_ELEVATION, satellite.epoch)
+
+
+# === Step 2: Brute-force reference, one second at a time around each pass ===
+def brute_force(p):
+    t = ts.utc(p['aos_time'] - timedelta(minutes=1)) + np.arange(int(p['duration']) + 121) / 86400.0
+    alt, az, distance = (satellite - observer).at(t).altaz()
+    up = np.flatnonzero(alt.degrees >= MIN_ELEVATION)
+    top = np.argmax(alt.degrees)
+    return az.degrees[up[0]], az.degrees[up[-1]], alt.degrees[top], az.degrees[top]
+
+
+def angle_delta(a, b):
+    return abs((a - b + 180) % 360 - 180)
+
+
+print(f"{'PASS':<6} {'AOS AZ':<8} {'REF':<8} {'LOS AZ':<8} {'REF':<8} {'MEL':<7} {'REF':<7}")
+print("=" * 56)
+worst = 0.0
+for i, p in enumerate(passes, start=1):
+    aos_az, los_az, mel, _ = brute_force(p)
+    worst = max(worst, angle_delta(p['aos_azimuth'], aos_az), angle_delta(p['los_azimuth'], los_az),
+                abs(p['max_altitude'] - mel))
+    print(f"{i:<6} {p['aos_azimuth']:<8.2f} {aos_az:<8.2f} {p['los_azimuth']:<8.2f} {los_az:<8.2f} "
+          f"{p['max_altitude']:<7.2f} {mel:<7.2f}")
+
+print(f"\nWorst deviation from the brute-force reference: {worst:.3f}°")
+if worst > TOLERANCE_DEGREES:
+    raise SystemExit(f"❌ Pass records deviate by more than {TOLERANCE_DEGREES}°")
+print("✅ Pass records match the brute-force reference.")
@@ -2,22 +2,18 @@ from skyfield.api import load, Topos, EarthSatellite
 import ephem
 from datetime import datetime
 import os
-import requests
+
+from tle_store import TLEStore
 
 TLE_FILE = 'iss.tle'
 TLE_URL = 'https://www.celestrak.com/NORAD/elements/stations.txt'
 
 def download_tle():
-    print("Downloading latest TLE from Celestrak...")
-    response = requests.get(TLE_URL)
-    tle_lines = response.text.splitlines()
-    for i, line in enumerate(tle_lines):
-        if 'ISS (ZARYA)' in line:
-            with open(TLE_FILE, 'w') as file:
-                file.write('\n'.join(tle_lines[i:i + 3]) + '\n')
-            print("TLE saved to", TLE_FILE)
-            return
-    raise ValueError("ISS TLE not found in data")
+    # ✅ Refresh the local TLE store (only if stale) and export the ISS entry
+    with TLEStore() as store:
+        store.refresh(TLE_URL)
+        store.write_tle_file('ISS (ZARYA)', TLE_FILE)
+    print("TLE saved to", TLE_FILE)
 
 # Step 1: Get TLE data (reuse existing file if available)
 if not os.path.exists(TLE_FILE):
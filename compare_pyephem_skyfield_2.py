@@ -3,10 +3,10 @@
 
 # ============================= PyEphem Code =============================
 import ephem
-from datetime import datetime, timedelta
+from datetime import datetime
 from zoneinfo import ZoneInfo
-from datetime import timezone  # FIXED import here
-import requests
+
+from tle_store import TLEStore
 
 
 # === Configurations ===
@@ -22,16 +22,11 @@ LOCAL_TIMEZONE = ZoneInfo("Europe/Zurich")
 TLE_URL = 'https://www.celestrak.com/NORAD/elements/stations.txt'
 
 def download_tle():
-    print("Downloading latest TLE from Celestrak...")
-    response = requests.get(TLE_URL)
-    tle_lines = response.text.splitlines()
-    for i, line in enumerate(tle_lines):
-        if 'ISS (ZARYA)' in line:
-            with open(TLE_FILE, 'w') as file:
-                file.write('\n'.join(tle_lines[i:i + 3]) + '\n')
-            print("TLE saved to", TLE_FILE)
-            return
-    raise ValueError("ISS TLE not found in data")
+    # ✅ Refresh the local TLE store (only if stale) and export the ISS entry
+    with TLEStore() as store:
+        store.refresh(TLE_URL)
+        store.write_tle_file('ISS (ZARYA)', TLE_FILE)
+    print("TLE saved to", TLE_FILE)
 
 
 
@@ -74,6 +69,9 @@ for _ in range(MAX_PASSES):
 
 # ============================= Skyfield Code =============================
 from skyfield.api import load, Topos, EarthSatellite
+from itertools import islice
+
+from pass_finder import find_passes
 
 # === Step 1: Load TLE ===
 ts = load.timescale()
@@ -84,37 +82,7 @@ satellite = EarthSatellite(tle[1].strip(), tle[2].strip(), tle[0].strip(), ts)
 observer = Topos(latitude_degrees=float(LATITUDE), longitude_degrees=float(LONGITUDE), elevation_m=int(ALTITUDE))
 
 # === Step 2: Find Next Passes ===
-passes_skyfield = []
-t0 = ts.now()
-while len(passes_skyfield) < MAX_PASSES:
-    t, events = satellite.find_events(observer, t0, t0 + timedelta(days=10), altitude_degrees=MIN_ELEVATION)
-    rise_time, max_alt_time, set_time = None, None, None
-    max_altitude = 0
-
-    for ti, event in zip(t, events):
-        if event == 0:
-            rise_time = ti.utc_datetime().replace(tzinfo=timezone.utc)
-            t0 = ti + timedelta(seconds=1)
-        elif event == 1:
-            max_alt_time = ti.utc_datetime().replace(tzinfo=timezone.utc)
-            alt, az, dist = (satellite - observer).at(ti).altaz()
-            max_altitude = alt.degrees
-        elif event == 2:
-            set_time = ti.utc_datetime().replace(tzinfo=timezone.utc)
-            if rise_time and set_time and max_altitude >= MIN_ELEVATION:
-                duration = (set_time - rise_time).seconds
-                passes_skyfield.append({
-                    'aos_time': rise_time,
-                    'max_time': max_alt_time,
-                    'los_time': set_time,
-                    'duration': duration,
-                    'max_altitude': round(max_altitude),
-                    'aos_azimuth': round((satellite - observer).at(t[0]).altaz()[1].degrees),
-                    'los_azimuth': round((satellite - observer).at(t[2]).altaz()[1].degrees)
-                })
-            if len(passes_skyfield) >= MAX_PASSES:
-                break
-    t0 = t[-1] + timedelta(minutes=1)
+passes_skyfield = list(islice(find_passes(satellite, observer, ts.now(), min_elevation=MIN_ELEVATION), MAX_PASSES))
 
 # ============================= Combined Output =============================
 from prettytable import PrettyTable
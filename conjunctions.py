@@ -0,0 +1,188 @@
+import numpy as np
+from sgp4.api import SatrecArray
+
+# === Configurations ===
+THRESHOLD_KM = 10.0
+STEP_SECONDS = 30.0
+MAX_RELATIVE_SPEED_KM_S = 16.0   # head-on in LEO; bounds how much a pair closes between two samples
+CURVATURE_MARGIN_KM = 5.0        # slack for the straight-line miss estimate between samples
+CHUNK_STEPS = 32                 # time steps per SatrecArray call (bounds the position arrays)
+NEWTON_ITERATIONS = 6
+TCA_TOLERANCE_SECONDS = 1e-3     # Newton stops once its step is this small
+
+UNIX_EPOCH_JD = 2440587.5
+DAY_S = 86400.0
+
+CONJUNCTION_DTYPE = np.dtype([('primary', 'u4'), ('secondary', 'u4'), ('tca', 'f8'),
+                              ('miss_km', 'f8'), ('speed_km_s', 'f8')])
+
+# Half of the 26 neighbouring cells, so every pair of adjacent cells is visited once
+_HALF_NEIGHBOURS = np.array([(dx, dy, dz) for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)
+                             if (dx, dy, dz) > (0, 0, 0)])
+_KEY_BITS = 21
+_KEY_OFFSET = 1 << (_KEY_BITS - 1)
+
+
+def _jd(unix):
+    days = np.asarray(unix, float) / DAY_S
+    whole = np.floor(days)
+    return whole + UNIX_EPOCH_JD, days - whole
+
+
+# === Orbit Shells (apogee/perigee filter) ===
+def orbit_shells(catalog):
+    """Perigee and apogee radii in km of every catalog object."""
+    perigee = np.array([(1.0 + s.altp) * s.radiusearthkm for s in catalog.satrecs])
+    apogee = np.array([(1.0 + s.alta) * s.radiusearthkm for s in catalog.satrecs])
+    return perigee, apogee
+
+
+def shells_overlap(perigee, apogee, i, j, threshold_km):
+    # Two orbits whose radial ranges are further apart than the threshold can never meet
+    return np.maximum(perigee[i], perigee[j]) - np.minimum(apogee[i], apogee[j]) <= threshold_km
+
+
+# === Spatial Index ===
+def close_pairs(position, radius):
+    """Index pairs (i < j) of the (N, 3) positions closer than ``radius``.
+
+    Positions are hashed into a uniform grid of ``radius``-sized cells, so
+    only objects in the same or adjacent cells are ever compared: O(N) for
+    a bounded density instead of O(N^2).
+    """
+    cell = np.floor(position / radius).astype(np.int64) + _KEY_OFFSET
+    key = (cell[:, 0] << (2 * _KEY_BITS)) | (cell[:, 1] << _KEY_BITS) | cell[:, 2]
+    order = np.argsort(key, kind='stable')
+    sorted_key = key[order]
+
+    i, j = _same_cell_pairs(sorted_key, order)
+    first, second = [i], [j]
+    for dx, dy, dz in _HALF_NEIGHBOURS:
+        neighbour = key + ((dx << (2 * _KEY_BITS)) + (dy << _KEY_BITS) + dz)
+        lo = np.searchsorted(sorted_key, neighbour, 'left')
+        count = np.searchsorted(sorted_key, neighbour, 'right') - lo
+        i, j = _expand(lo, count)
+        first.append(i)
+        second.append(order[j])
+    i, j = np.concatenate(first), np.concatenate(second)
+    near = np.einsum('ij,ij->i', position[j] - position[i], position[j] - position[i]) < radius * radius
+    i, j = i[near], j[near]
+    return np.minimum(i, j), np.maximum(i, j)
+
+
+def _same_cell_pairs(sorted_key, order):
+    # Pairs within one cell: each object with the ones after it in the sorted order
+    lo = np.arange(sorted_key.size) + 1
+    count = np.searchsorted(sorted_key, sorted_key, 'right') - lo
+    i, j = _expand(lo, count)
+    return order[i], order[j]
+
+
+def _expand(lo, count):
+    # Row r paired with every index in [lo[r], lo[r] + count[r])
+    rows = np.repeat(np.arange(lo.size), count)
+    starts = np.repeat(lo - np.cumsum(count) + count, count)
+    return rows, starts + np.arange(rows.size)
+
+
+# === Screening ===
+def screen_conjunctions(catalog, start_unix, duration_s, threshold_km=THRESHOLD_KM, step_s=STEP_SECONDS,
+                        primary=None):
+    """Close approaches under ``threshold_km`` between catalog objects.
+
+    Every object is propagated on a shared time grid. At each step the
+    candidates are pairs closer than the threshold plus the distance they
+    can close in half a step: all pairs through the spatial index, or with
+    ``primary`` (a catalog index) that one object against the objects whose
+    orbit shells overlap its own. A straight-line fit from the sample then
+    shortlists pairs, and only those are refined with SGP4.
+
+    Returns a CONJUNCTION_DTYPE array sorted by TCA (Unix seconds) and the
+    number of pairs left after each stage.
+    """
+    objects = np.arange(len(catalog))
+    if primary is not None:
+        perigee, apogee = orbit_shells(catalog)
+        others = objects[objects != primary]
+        objects = np.concatenate(([primary], others[shells_overlap(perigee, apogee, primary, others, threshold_km)]))
+    satrecs = SatrecArray([catalog.satrecs[k] for k in objects])
+    search_km = threshold_km + MAX_RELATIVE_SPEED_KM_S * step_s / 2
+    unix = start_unix + np.arange(0.0, duration_s + step_s / 2, step_s)
+    stats = {'objects': objects.size, 'candidates': 0, 'shortlisted': 0}
+
+    found = []
+    for first in range(0, unix.size, CHUNK_STEPS):
+        times = unix[first:first + CHUNK_STEPS]
+        error, position, velocity = satrecs.sgp4(*_jd(times))
+        position[error != 0] = np.nan
+        position, velocity = position.transpose(1, 0, 2).copy(), velocity.transpose(1, 0, 2).copy()
+        for k, t in enumerate(times):
+            p, v = position[k], velocity[k]
+            if primary is None:
+                valid = np.flatnonzero(np.isfinite(p[:, 0]))
+                i, j = close_pairs(p[valid], search_km)
+                i, j = valid[i], valid[j]
+            else:
+                d = p[1:] - p[0]
+                j = np.flatnonzero(np.einsum('ij,ij->i', d, d) < search_km * search_km) + 1
+                i = np.zeros_like(j)
+            stats['candidates'] += i.size
+            # Straight-line closest approach within half a step of the sample
+            r, w = p[j] - p[i], v[j] - v[i]
+            tau = np.clip(-np.einsum('ij,ij->i', r, w) / np.einsum('ij,ij->i', w, w), -step_s / 2, step_s / 2)
+            miss = np.linalg.norm(r + w * tau[:, None], axis=1)
+            keep = miss < threshold_km + CURVATURE_MARGIN_KM
+            found.append(np.column_stack((objects[i[keep]], objects[j[keep]], t + tau[keep])))
+
+    shortlist = _merge(np.concatenate(found) if found else np.zeros((0, 3)), step_s)
+    stats['shortlisted'] = len(shortlist)
+    conjunctions = _refine(catalog, shortlist, step_s)
+    conjunctions = conjunctions[(conjunctions['miss_km'] < threshold_km) & (conjunctions['tca'] >= unix[0])
+                                & (conjunctions['tca'] <= unix[-1])]
+    # Slow, nearly co-orbital encounters can be shortlisted from several samples that refine to one TCA
+    order = np.lexsort((conjunctions['tca'], conjunctions['secondary'], conjunctions['primary']))
+    conjunctions = conjunctions[order]
+    repeated = ((conjunctions['primary'][1:] == conjunctions['primary'][:-1])
+                & (conjunctions['secondary'][1:] == conjunctions['secondary'][:-1])
+                & (conjunctions['tca'][1:] - conjunctions['tca'][:-1] < step_s))
+    conjunctions = conjunctions[np.concatenate(([True], ~repeated))] if len(conjunctions) else conjunctions
+    return np.sort(conjunctions, order='tca'), stats
+
+
+def _merge(shortlist, step_s):
+    # Consecutive samples of one encounter collapse into a single estimate
+    if not len(shortlist):
+        return shortlist
+    shortlist = shortlist[np.lexsort((shortlist[:, 2], shortlist[:, 1], shortlist[:, 0]))]
+    same = ((shortlist[1:, 0] == shortlist[:-1, 0]) & (shortlist[1:, 1] == shortlist[:-1, 1])
+            & (shortlist[1:, 2] - shortlist[:-1, 2] < step_s))
+    return shortlist[np.concatenate(([True], ~same))]
+
+
+def _refine(catalog, shortlist, step_s):
+    # Newton on d/dt |r|^2 / 2 = r . v = 0, one SGP4 pair per candidate. Each TCA stays within
+    # one coarse step of its estimate, and the miss and speed are taken at the TCA returned.
+    conjunctions = np.zeros(len(shortlist), CONJUNCTION_DTYPE)
+    for n, (a, b, estimate) in enumerate(shortlist):
+        first, second = catalog.satrecs[int(a)], catalog.satrecs[int(b)]
+
+        def relative(t):
+            jd, fraction = _jd(t)
+            _, r1, v1 = first.sgp4(jd, fraction)
+            _, r2, v2 = second.sgp4(jd, fraction)
+            return np.subtract(r2, r1), np.subtract(v2, v1)
+
+        t = estimate
+        for _ in range(NEWTON_ITERATIONS):
+            r, v = relative(t)
+            speed2 = np.dot(v, v)
+            if not speed2 > 0.0:
+                break
+            t_new = min(max(t - np.dot(r, v) / speed2, estimate - step_s), estimate + step_s)
+            converged = abs(t_new - t) < TCA_TOLERANCE_SECONDS
+            t = t_new
+            if converged:
+                break
+        r, v = relative(t)
+        conjunctions[n] = (a, b, t, np.linalg.norm(r), np.linalg.norm(v))
+    return conjunctions
@@ -0,0 +1,140 @@
+from collections import namedtuple
+
+import numpy as np
+from sgp4.api import Satrec
+from skyfield.api import load
+from skyfield.sgp4lib import theta_GMST1982
+
+from tle_catalog import observer_itrf_km, parse_tle_lines, rotate_teme, unix_times
+
+# === Configurations ===
+GRID_STEP_DEG = 2.0
+STEP_SECONDS = 10.0
+MIN_ELEVATION = 10.0
+CHUNK_ELEMENTS = 2_000_000   # cells x time samples per chunk; each temporary matrix is then ~16 MB
+
+UNIX_EPOCH_JD = 2440587.5
+DAY_S = 86400.0
+
+GroundGrid = namedtuple('GroundGrid', 'latitude longitude shape itrf up')
+Coverage = namedtuple('Coverage', 'grid start_unix end_unix visible_s passes intervals')
+INTERVAL_DTYPE = np.dtype([('cell', 'u4'), ('start', 'f8'), ('end', 'f8')])
+
+
+# === Ground Grid ===
+def ground_grid(step_deg=GRID_STEP_DEG, latitudes=(-90.0, 90.0), longitudes=(-180.0, 180.0), elevation_m=0.0):
+    """Observer cells at the centres of a regular latitude/longitude grid, flattened row by row."""
+    lat = np.arange(latitudes[0] + step_deg / 2, latitudes[1], step_deg)
+    lon = np.arange(longitudes[0] + step_deg / 2, longitudes[1], step_deg)
+    lat, lon = (a.ravel() for a in np.meshgrid(lat, lon, indexing='ij'))
+    itrf = np.ascontiguousarray(observer_itrf_km(lat, lon, elevation_m).T)
+    # Local vertical (geodetic normal) of every cell
+    phi, lam = np.radians(lat), np.radians(lon)
+    up = np.stack((np.cos(phi) * np.cos(lam), np.cos(phi) * np.sin(lam), np.sin(phi)), axis=1)
+    return GroundGrid(lat, lon, (np.unique(lat).size, np.unique(lon).size), itrf, up)
+
+
+def satellite_itrf(satrec, unix, dut1_days):
+    """ITRF positions (km) of ``satrec`` at the ``unix`` times; NaN where SGP4 fails."""
+    days = unix / DAY_S
+    whole = np.floor(days)
+    jd, fraction = whole + UNIX_EPOCH_JD, days - whole
+    error, position, _ = satrec.sgp4_array(jd, fraction)
+    theta, _ = theta_GMST1982(jd, fraction + dut1_days)
+    itrf = rotate_teme(position, theta, 0.0)
+    itrf[error != 0] = np.nan
+    return itrf
+
+
+# === Coverage ===
+def coverage_map(tle, grid, start_unix, duration_s, min_elevation=MIN_ELEVATION, step_s=STEP_SECONDS,
+                 intervals=False, ts=None):
+    """Where and for how long one satellite is above ``min_elevation`` over a GroundGrid.
+
+    The satellite is propagated once per time step and broadcast against
+    every cell: sin(elevation) = up . (sat - cell) / |sat - cell|, with the
+    dot products done as two (cells x 3) @ (3 x times) matrix products.
+    Time is processed in chunks of at most CHUNK_ELEMENTS cell-samples.
+
+    Returns visible seconds and pass counts per cell and, with
+    ``intervals=True``, every visibility interval as an INTERVAL_DTYPE array
+    sorted by cell and start. Interval edges are interpolated between
+    samples; intervals open at either end of the window are clipped to it.
+    """
+    _, line1, line2 = parse_tle_lines(tle)[0]
+    satrec = Satrec.twoline2rv(line1, line2)
+    ts = ts or load.timescale()
+    dut1_days = float(unix_times(ts, start_unix).dut1) / DAY_S
+    unix = start_unix + np.arange(0.0, duration_s + step_s / 2, step_s)
+
+    cells = grid.itrf.shape[0]
+    per_chunk = max(CHUNK_ELEMENTS // cells, 2)
+    sin_min = np.sin(np.radians(min_elevation))
+    cell_height = np.einsum('ij,ij->i', grid.up, grid.itrf)[:, None]
+    cell_norm2 = np.einsum('ij,ij->i', grid.itrf, grid.itrf)[:, None]
+
+    visible_samples = np.zeros(cells, np.int64)
+    passes = np.zeros(cells, np.int64)
+    rises, sets = [], []
+    previous = None
+
+    for first in range(0, unix.size, per_chunk):
+        times = unix[first:first + per_chunk]
+        sat = satellite_itrf(satrec, times, dut1_days)
+        distance = np.sqrt(np.maximum(np.einsum('ij,ij->i', sat, sat) - 2.0 * (grid.itrf @ sat.T) + cell_norm2, 0.0))
+        # sin(elevation) - sin(min_elevation): positive where the cell sees the satellite
+        margin = ((grid.up @ sat.T) - cell_height) / distance - sin_min
+        visible = margin > 0.0
+        visible_samples += visible.sum(axis=1)
+
+        if previous is None:
+            # Cells that already see the satellite at the start open an interval there
+            passes += visible[:, 0]
+            if intervals:
+                rises.append((np.flatnonzero(visible[:, 0]), np.full(np.count_nonzero(visible[:, 0]), times[0])))
+        else:
+            # The previous chunk's last column stitches the chunks together
+            margin = np.concatenate((previous[1][:, None], margin), axis=1)
+            visible = np.concatenate((previous[1][:, None] > 0.0, visible), axis=1)
+            times = np.concatenate(([previous[0]], times))
+
+        changed = visible[:, 1:] != visible[:, :-1]
+        cell, k = np.nonzero(changed)
+        rising = visible[cell, k + 1]
+        np.add.at(passes, cell[rising], 1)
+        if intervals and cell.size:
+            m0, m1 = margin[cell, k], margin[cell, k + 1]
+            # NaN margins (SGP4 errors) fall back to the later sample
+            crossing = np.where(np.isfinite(m0 - m1), times[k] + (times[k + 1] - times[k]) * m0 / (m0 - m1),
+                                times[k + 1])
+            rises.append((cell[rising], crossing[rising]))
+            sets.append((cell[~rising], crossing[~rising]))
+        previous = (times[-1], margin[:, -1].copy())
+
+    table = None
+    if intervals:
+        # Cells still seeing the satellite at the end close their interval there
+        still = np.flatnonzero(previous[1] > 0.0)
+        sets.append((still, np.full(still.size, unix[-1])))
+        table = _pair_intervals(rises, sets)
+    return Coverage(grid, float(unix[0]), float(unix[-1]), visible_samples * step_s, passes, table)
+
+
+def _pair_intervals(rises, sets):
+    # Every rise of a cell is followed by exactly one set, so sorting both
+    # lists by (cell, time) lines them up one to one
+    rise_cell, rise_time = (np.concatenate(column) for column in zip(*rises))
+    set_cell, set_time = (np.concatenate(column) for column in zip(*sets))
+    r = np.lexsort((rise_time, rise_cell))
+    s = np.lexsort((set_time, set_cell))
+    table = np.zeros(r.size, INTERVAL_DTYPE)
+    table['cell'] = rise_cell[r]
+    table['start'] = rise_time[r]
+    table['end'] = set_time[s]
+    return table
+
+
+def coverage_grid(coverage, values=None):
+    # Per-cell values (visible seconds by default) reshaped to the (latitude, longitude) grid
+    values = coverage.visible_s if values is None else values
+    return np.asarray(values).reshape(coverage.grid.shape)
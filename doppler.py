@@ -0,0 +1,66 @@
+from collections import namedtuple
+
+import numpy as np
+from skyfield.api import load
+
+from tle_catalog import TLECatalog, look_angles, unix_times
+
+# === Configurations ===
+STEP_SECONDS = 1.0           # grid spacing of the correction tables
+DOWNLINK_HZ = 145.800e6
+UPLINK_HZ = 145.990e6        # ISS APRS/packet uplink, for the full-duplex example
+
+SPEED_OF_LIGHT_KM_S = 299792.458
+
+# One table per pass: the grid starts at AOS and is spaced step_s apart.
+# Corrections are float32 offsets from the nominal frequencies (mHz resolution
+# for a few kHz of shift), so a whole pass fits in a few kilobytes.
+DopplerTable = namedtuple('DopplerTable', 'aos_unix step_s downlink_hz uplink_hz downlink_shift uplink_shift')
+
+
+# === Doppler Stage ===
+def pass_grid(passes, step_s=STEP_SECONDS):
+    # Concatenated Unix times of every pass, AOS to LOS, plus the split points
+    aos = np.array([p['aos_time'].timestamp() for p in passes])
+    los = np.array([p['los_time'].timestamp() for p in passes])
+    counts = np.floor((los - aos) / step_s).astype(np.int64) + 1
+    starts = np.cumsum(counts) - counts
+    offsets = np.arange(counts.sum()) - np.repeat(starts, counts)
+    return np.repeat(aos, counts) + offsets * step_s, aos, np.cumsum(counts)[:-1]
+
+
+def doppler_tables(tle, site, passes, downlink_hz=DOWNLINK_HZ, uplink_hz=None, step_s=STEP_SECONDS, ts=None):
+    """Per-pass Doppler correction tables for one TLE (name, line1, line2) and Site.
+
+    Range rate for every grid point of every pass is computed in a single
+    batched SGP4 call. The downlink shift is what the receiver must tune by;
+    the uplink shift pre-compensates the transmitter so the satellite hears
+    the nominal frequency.
+    """
+    ts = ts or load.timescale()
+    catalog = TLECatalog.from_lines(tle)
+    unix, aos, splits = pass_grid(passes, step_s)
+    *_, range_rate = look_angles(catalog, unix_times(ts, unix), site.latitude, site.longitude, site.elevation_m,
+                                 range_rate=True)
+    beta = range_rate[0] / SPEED_OF_LIGHT_KM_S
+    downlink = (-beta * downlink_hz).astype(np.float32)
+    uplink = (beta / (1 - beta) * uplink_hz).astype(np.float32) if uplink_hz else None
+    uplinks = np.split(uplink, splits) if uplink_hz else [None] * len(passes)
+    return [DopplerTable(start, step_s, downlink_hz, uplink_hz, down, up)
+            for start, down, up in zip(aos, np.split(downlink, splits), uplinks)]
+
+
+# === Streaming ===
+def table_rows(table):
+    """Yield (unix, downlink_hz, uplink_hz) for each grid point; uplink is None for receive-only tables."""
+    for i, shift in enumerate(table.downlink_shift.tolist()):
+        uplink = table.uplink_hz + float(table.uplink_shift[i]) if table.uplink_hz else None
+        yield table.aos_unix + i * table.step_s, table.downlink_hz + shift, uplink
+
+
+def write_doppler_csv(path, table):
+    # Plain text that rig-control scripts can read line by line
+    with open(path, 'w') as file:
+        file.write("unix,downlink_hz,uplink_hz\n")
+        for unix, downlink, uplink in table_rows(table):
+            file.write(f"{unix:.1f},{downlink:.1f},{'' if uplink is None else f'{uplink:.1f}'}\n")
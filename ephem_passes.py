@@ -0,0 +1,153 @@
+import warnings
+
+import ephem
+import numpy as np
+from sgp4.api import Satrec
+
+from pass_finder import EVENTS, coarse_step_days, elevation_mask, sweep_passes
+from pass_table import PASS_DTYPE, TIME_FIELDS, PassTable
+from stage_profiler import stage
+from tle_catalog import parse_tle_lines
+
+# === Configurations ===
+PRESSURE_MBAR = 0.0              # geometric horizon like the other engines; PyEphem's own default is 1010
+MAX_SEARCH_DAYS = 366            # a search for a pass count alone gives up after this long
+PYEPHEM_VALID_DAYS = 365.0       # compute() raises ValueError this far from the TLE epoch, either way
+
+PYEPHEM_EPOCH_JD = 2415020.0     # ephem.Date zero, 1899-12-31 12:00 UT
+UNIX_EPOCH_JD = 2440587.5
+DAY_S = 86400.0
+
+# PyEphem dates are UT, so the sweep here runs on UTC Julian dates: it only
+# needs a monotonic day count, and UTC ones turn into Unix seconds directly.
+
+
+# === Reused PyEphem Objects ===
+class EphemBody:
+    """One PyEphem body per element set, built once and computed for every site."""
+
+    def __init__(self, tle):
+        self.name, self.line1, self.line2 = parse_tle_lines(tle)[0]
+        self.body = ephem.readtle(self.name, self.line1, self.line2)
+        # ``model`` is all coarse_step_days() needs from a satellite
+        self.model = Satrec.twoline2rv(self.line1, self.line2)
+        self.epoch_jd = self.model.jdsatepoch + self.model.jdsatepochF
+
+    def search_window(self, start, days, step):
+        # The part of [start, start + days] PyEphem computes, with room for the sweep's last
+        # coarse step and the refinement around it; None when nothing of it is left
+        begin = max(start, self.epoch_jd - PYEPHEM_VALID_DAYS + step)
+        end = min(start + days, self.epoch_jd + PYEPHEM_VALID_DAYS - 2 * step)
+        return (begin, end - begin) if end > begin else None
+
+
+def make_observer(site, pressure_mbar=PRESSURE_MBAR):
+    observer = ephem.Observer()
+    observer.lat = str(site.latitude)
+    observer.lon = str(site.longitude)
+    observer.elev = site.elevation_m
+    observer.pressure = pressure_mbar
+    return observer
+
+
+def _look_function(body, observer, distance=False):
+    # Altitude and azimuth in degrees (and range in km) at UTC Julian dates. One compute() per
+    # date is all PyEphem offers; like next_pass(), it raises ValueError a year from the TLE epoch.
+    # Positions SGP4 cannot produce (a decayed orbit) are NaN, as in the other backends.
+    compute = body.compute
+
+    def look_at(jd):
+        jd = np.asarray(jd, float)
+        rows = []
+        for date in (jd - PYEPHEM_EPOCH_JD).ravel().tolist():
+            if date != date:
+                # A refinement that started from NaN samples
+                rows.append((np.nan, np.nan, np.nan))
+                continue
+            observer.date = date
+            compute(observer)
+            try:
+                rows.append((body.alt, body.az, body.range))
+            except RuntimeError:
+                rows.append((np.nan, np.nan, np.nan))
+        angles = np.array(rows, float).reshape(jd.shape + (3,))
+        alt, az = np.degrees(angles[..., 0]), np.degrees(angles[..., 1])
+        return (alt, az, angles[..., 2] / 1000.0) if distance else (alt, az)
+
+    return look_at
+
+
+# === Bulk Pass Search ===
+def ephem_pass_table(entries, sites, start_unix, count=None, days=None, min_elevation=0.0, mask=None,
+                     pressure_mbar=PRESSURE_MBAR):
+    """Passes of every TLE at every Site, computed with PyEphem, as one PassTable.
+
+    Replaces the ``observer.next_pass()`` loop: each body and observer is
+    built once, the pass finder's coarse sweep and vectorized refinement
+    decide where PyEphem gets evaluated, and the look angles of every event
+    come from one more batch. Each (satellite, site) pair stops after
+    ``count`` passes or ``days`` days (MAX_SEARCH_DAYS with a count alone),
+    whichever comes first, and never searches a year or more from its TLE
+    epoch, where PyEphem refuses to compute: such pairs return fewer rows,
+    with a warning, and when no satellite can be searched at all a
+    ValueError says the TLEs are stale. Rows are grouped by satellite, then
+    site, in AOS order.
+    """
+    if count is None and days is None:
+        raise ValueError("ephem_pass_table() needs a pass count, a number of days, or both")
+    count_only = days is None
+    days = MAX_SEARCH_DAYS if count_only else days
+    bodies = [EphemBody(tle) for tle in entries]
+    observers = [make_observer(site, pressure_mbar) for site in sites]
+    horizon = elevation_mask(min_elevation, mask)
+    start = start_unix / DAY_S + UNIX_EPOCH_JD
+
+    parts = []
+    searched = 0
+    for s, satellite in enumerate(bodies):
+        step = coarse_step_days(satellite)
+        window = satellite.search_window(start, days, step)
+        epoch_days = satellite.epoch_jd - start
+        if window is None:
+            warnings.warn(f"{satellite.name}: skipped, its TLE epoch is {epoch_days:+.0f} days from the search "
+                          f"start and PyEphem only computes within {PYEPHEM_VALID_DAYS:g} days of it")
+            continue
+        searched += 1
+        cut_end = sum(window) < start + days
+        if window[0] > start or (cut_end and not count_only):
+            warnings.warn(f"{satellite.name}: search cut to {window[1]:.1f} of {days:g} days, its TLE epoch is "
+                          f"{epoch_days:+.0f} days from the search start")
+        for o, observer in enumerate(observers):
+            found = []
+            for aos, tca, los in sweep_passes(_look_function(satellite.body, observer), step, *window, horizon):
+                found.append((aos, tca, los))
+                if count is not None and sum(chunk[0].size for chunk in found) >= count:
+                    break
+            total = sum(chunk[0].size for chunk in found)
+            if count_only and cut_end and total < count:
+                warnings.warn(f"{satellite.name} at {sites[o].name}: {total} of {count} passes within "
+                              f"{PYEPHEM_VALID_DAYS:g} days of the TLE epoch")
+            if found:
+                aos, tca, los = (np.concatenate(column)[:count] for column in zip(*found))
+                parts.append(_table_part(_look_function(satellite.body, observer, distance=True),
+                                         aos, tca, los, s, o))
+    if bodies and not searched:
+        raise ValueError(f"no TLE is within {PYEPHEM_VALID_DAYS:g} days of the search; download fresh ones")
+    data = np.concatenate(parts) if parts else np.zeros(0, PASS_DTYPE)
+    return PassTable(data, [body.name for body in bodies] or [''], [site.name for site in sites] or [''])
+
+
+def _table_part(look_at, aos, tca, los, satellite, site):
+    with stage('enrichment', aos.size):
+        jd = np.concatenate((aos, tca, los))
+        alt, az, distance = (values.reshape(3, -1) for values in look_at(jd))
+        part = np.zeros(aos.size, PASS_DTYPE)
+        part['satellite'] = satellite
+        part['site'] = site
+        unix = (jd.reshape(3, -1) - UNIX_EPOCH_JD) * DAY_S
+        for e, event in enumerate(EVENTS):
+            part[TIME_FIELDS[e]] = unix[e]
+            part[f'{event}_altitude'] = alt[e]
+            part[f'{event}_azimuth'] = az[e]
+            part[f'{event}_range_km'] = distance[e]
+    return part
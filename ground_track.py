@@ -0,0 +1,120 @@
+import numpy as np
+
+from coverage_map import satellite_itrf
+from tle_catalog import EARTH_FLATTENING, EARTH_RADIUS_KM, unix_times
+
+# === Configurations ===
+STEP_SECONDS = 10.0
+CHUNK_POINTS = 65536         # samples per yielded chunk; memory stays at a few MB however long the span
+MIN_ELEVATION = 0.0          # the footprint edge is where the satellite stands this high
+GEODETIC_ITERATIONS = 3      # sub-millimetre latitude and height for anything below GEO
+
+DAY_S = 86400.0
+_E2 = EARTH_FLATTENING * (2 - EARTH_FLATTENING)
+
+# One row per point; ``segment`` counts antimeridian crossings since the
+# start, so points sharing it can be drawn as one polyline. Every crossing
+# adds two interpolated points at longitude +-180, one ending the segment
+# and one starting the next.
+TRACK_DTYPE = np.dtype([('time', 'f8'), ('latitude', 'f8'), ('longitude', 'f8'), ('altitude_km', 'f8'),
+                        ('footprint_km', 'f8'), ('segment', 'u4')])
+
+
+# === Geometry ===
+def itrf_to_geodetic(itrf):
+    """WGS84 latitude and longitude (degrees) and height (km) of (..., 3) Earth-fixed positions in km."""
+    x, y, z = itrf[..., 0], itrf[..., 1], itrf[..., 2]
+    p = np.hypot(x, y)
+    lat = np.arctan2(z, p * (1 - _E2))
+    for _ in range(GEODETIC_ITERATIONS):
+        sin = np.sin(lat)
+        n = EARTH_RADIUS_KM / np.sqrt(1 - _E2 * sin * sin)
+        lat = np.arctan2(z + _E2 * n * sin, p)
+    sin = np.sin(lat)
+    # Well conditioned at the poles as well, unlike p / cos(lat) - n
+    height = p * np.cos(lat) + z * sin - EARTH_RADIUS_KM * np.sqrt(1 - _E2 * sin * sin)
+    return np.degrees(lat), np.degrees(np.arctan2(y, x)), height
+
+
+def footprint_radius_km(distance_km, altitude_km, min_elevation=MIN_ELEVATION):
+    """Ground distance from the sub-satellite point to where the satellite stands at ``min_elevation``.
+
+    Spherical Earth with the local radius under the satellite: the Earth
+    central angle to the edge is arccos(R / r * cos(e)) - e.
+    """
+    radius = distance_km - altitude_km
+    elevation = np.radians(min_elevation)
+    return radius * (np.arccos(np.clip(radius / distance_km * np.cos(elevation), -1.0, 1.0)) - elevation)
+
+
+# === Antimeridian ===
+def split_antimeridian(track, previous=None, segment=0):
+    """Insert the +-180 edge points where ``track`` jumps across the antimeridian, and number the segments.
+
+    ``previous`` is the last point of the chunk before, so crossings
+    between two chunks are found as well; ``segment`` is the id the chunk
+    starts with. Returns the new chunk and the id the next one starts with.
+    """
+    points = track if previous is None else np.concatenate(([previous], track))
+    lon = points['longitude']
+    step = np.diff(lon)
+    crossing = np.flatnonzero(np.abs(step) > 180.0)
+    if not crossing.size:
+        track['segment'] = segment
+        return track, segment
+
+    # Eastward crossings go from +180 to -180; the longitude step is unwrapped by 360
+    before, after = points[crossing], points[crossing + 1]
+    edge = np.where(step[crossing] < 0, 180.0, -180.0)
+    fraction = (edge - before['longitude']) / (step[crossing] + 2 * edge)
+    edges = np.zeros(2 * crossing.size, TRACK_DTYPE)
+    for name in ('time', 'latitude', 'altitude_km', 'footprint_km'):
+        value = before[name] + fraction * (after[name] - before[name])
+        edges[name][0::2] = value
+        edges[name][1::2] = value
+    edges['longitude'][0::2] = edge
+    edges['longitude'][1::2] = -edge
+
+    # Segment ids: every sample after k crossings gets segment + k
+    offset = 0 if previous is None else 1
+    ids = segment + np.cumsum(np.isin(np.arange(track.size) + offset, crossing + 1))
+    track['segment'] = ids
+    edges['segment'][0::2] = segment + np.arange(crossing.size)
+    edges['segment'][1::2] = segment + np.arange(crossing.size) + 1
+    # Both edge points of a crossing go in front of the first sample after it
+    at = np.repeat(crossing + 1 - offset, 2)
+    return np.insert(track, at, edges), int(ids[-1])
+
+
+def segments(track):
+    # The polylines of a (concatenated) track, one array per segment
+    return np.split(track, np.flatnonzero(np.diff(track['segment'])) + 1)
+
+
+# === Streaming Ground Track ===
+def ground_track(satellite, start_unix, duration_s, step_s=STEP_SECONDS, chunk_points=CHUNK_POINTS,
+                 min_elevation=MIN_ELEVATION, split=True):
+    """Sub-satellite points of an EarthSatellite every ``step_s`` over [start, start + duration], in chunks.
+
+    Yields TRACK_DTYPE arrays of at most ``chunk_points`` samples (plus the
+    antimeridian edge points), computed chunk by chunk with batched SGP4
+    and a GMST rotation, so any span runs in the same memory. Times are
+    Unix seconds; positions SGP4 cannot produce are NaN.
+    """
+    satrec = satellite.model
+    dut1_days = float(unix_times(satellite.epoch.ts, start_unix).dut1) / DAY_S
+    total = int(np.floor(duration_s / step_s + 1e-9)) + 1
+    previous, segment = None, 0
+    for first in range(0, total, chunk_points):
+        unix = start_unix + np.arange(first, min(first + chunk_points, total)) * step_s
+        itrf = satellite_itrf(satrec, unix, dut1_days)
+        track = np.zeros(unix.size, TRACK_DTYPE)
+        track['time'] = unix
+        track['latitude'], track['longitude'], track['altitude_km'] = itrf_to_geodetic(itrf)
+        track['footprint_km'] = footprint_radius_km(np.linalg.norm(itrf, axis=1), track['altitude_km'],
+                                                    min_elevation)
+        if split:
+            last = track[-1].copy()
+            track, segment = split_antimeridian(track, previous, segment)
+            previous = last
+        yield track
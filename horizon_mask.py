@@ -0,0 +1,77 @@
+import copy
+
+import numpy as np
+
+# === Configurations ===
+RESOLUTION_DEG = 0.1         # azimuth step of the precomputed lookup table
+
+# Mask files hold one "azimuth elevation" pair (degrees) per line, separated by
+# spaces or a comma; '#' starts a comment. Elevations are interpolated linearly
+# between the listed azimuths, wrapping around north.
+
+
+class HorizonMask:
+    """Minimum elevation as a function of azimuth, stored as a lookup table.
+
+    The table is built once on a fixed azimuth grid, so evaluating the mask
+    for a whole sweep is a single fancy-indexing operation.
+    """
+
+    def __init__(self, azimuths, elevations, min_elevation=0.0, resolution_deg=RESOLUTION_DEG):
+        azimuths = np.asarray(azimuths, float) % 360.0
+        elevations = np.asarray(elevations, float)
+        if azimuths.size != elevations.size or not azimuths.size:
+            raise ValueError("A horizon mask needs matching, non-empty azimuth and elevation lists")
+        grid = np.arange(0.0, 360.0, resolution_deg) if azimuths.size > 1 else np.zeros(1)
+        table = np.interp(grid, azimuths, elevations, period=360.0) if azimuths.size > 1 else elevations
+        self._set_table(np.maximum(table, min_elevation))
+
+    def _set_table(self, table):
+        self.table = table
+        self._wrapped = np.append(table, table[0])
+        self._scale = table.size / 360.0
+        self.lowest = float(table.min())
+        self.highest = float(table.max())
+        self.is_flat = self.lowest == self.highest
+
+    @classmethod
+    def flat(cls, min_elevation=0.0):
+        return cls([0.0], [min_elevation])
+
+    @classmethod
+    def from_file(cls, path, min_elevation=0.0, resolution_deg=RESOLUTION_DEG):
+        points = []
+        with open(path) as file:
+            for line in file:
+                line = line.split('#', 1)[0].replace(',', ' ').split()
+                if line:
+                    points.append((float(line[0]), float(line[1])))
+        if not points:
+            raise ValueError(f"No azimuth/elevation points in horizon mask file {path!r}")
+        azimuths, elevations = zip(*points)
+        return cls(azimuths, elevations, min_elevation, resolution_deg)
+
+    def at_least(self, min_elevation):
+        # The same mask with a global minimum elevation on top
+        if min_elevation <= self.lowest:
+            return self
+        mask = copy.copy(self)
+        mask._set_table(np.maximum(self.table, min_elevation))
+        return mask
+
+    def elevation(self, az):
+        """Mask elevation in degrees at each azimuth (degrees) of ``az``."""
+        if self.is_flat:
+            return np.full(np.shape(az), self.lowest)
+        # Linear between table entries, so the clearance stays continuous for the root finder
+        position = np.nan_to_num(np.asarray(az, float)) * self._scale
+        index = np.floor(position)
+        weight = position - index
+        index = index.astype(np.intp) % self.table.size
+        return self._wrapped[index] + weight * (self._wrapped[index + 1] - self._wrapped[index])
+
+    def clearance(self, alt, az):
+        # Degrees above the mask; the pass finder's roots are where this crosses zero
+        if self.is_flat:
+            return alt - self.lowest
+        return alt - self.elevation(az)
@@ -0,0 +1,279 @@
+from math import tau
+
+import numpy as np
+from skyfield.api import load
+from skyfield.nutationlib import iau2000b_radians
+from skyfield.sgp4lib import theta_GMST1982
+
+from pass_finder import (MAX_CHUNK_DAYS, build_pass_records, chunk_passes, coarse_step_days, elevation_mask,
+                         find_roots, look_function)
+from stage_profiler import stage, timed
+
+# === Configurations ===
+EPHEMERIS_FILE = 'de421.bsp'
+SHADOW_SAMPLES = 16          # points along each pass tested for Earth shadow
+VISIBLE_SUN_ALTITUDE = -6.0  # the sky counts as dark with the Sun below this (end of civil twilight)
+SUN_GRID_DAYS = 0.5          # Sun RA/Dec are interpolated from this grid; it moves ~1 degree a day
+DARKNESS_STEP_MINUTES = 10
+SHADOW_STEP_SECONDS = 240    # shadows shorter than this (high beta angles) may be missed
+EDGE_PRECISION_SECONDS = 1.0 # dusk, dawn and shadow edges are refined to this
+
+EARTH_RADIUS_KM = 6378.137
+EARTH_ROTATION_RAD_MIN = tau / 1436.07
+DAY_S = 86400.0
+
+# === Visibility Categories (uint8 codes) ===
+NO, UNLIKELY, POSSIBLE, LIKELY, YES, TOO_LOW, ECLIPSED = range(7)
+VISIBILITY_LABELS = np.array(['NO', 'Unlikely', 'Possible', 'Likely', 'YES', 'Unlikely (too low)', 'Eclipsed'])
+
+_ephemeris = None
+
+
+def load_ephemeris():
+    global _ephemeris
+    if _ephemeris is None:
+        _ephemeris = load(EPHEMERIS_FILE)
+    return _ephemeris
+
+
+# === Sun and Shadow ===
+def sun_altitude(observer, t, eph=None):
+    """Apparent Sun altitude in degrees for every time of the Time array ``t``."""
+    eph = eph or load_ephemeris()
+    return (eph['earth'] + observer).at(t).observe(eph['sun']).apparent().altaz()[0].degrees
+
+
+def pass_times(ts, jd):
+    # Sun directions only need the cheaper IAU 2000B nutation (1 mas)
+    t = ts.tt_jd(jd)
+    t._nutation_angles_radians = iau2000b_radians(t)
+    return t
+
+
+def _sun_track(ts, start, end, eph):
+    # Apparent RA/Dec of date of the Sun on a coarse grid, for interpolation
+    grid = np.arange(start - SUN_GRID_DAYS, end + 2 * SUN_GRID_DAYS, SUN_GRID_DAYS)
+    ra, dec, _ = eph['earth'].at(pass_times(ts, grid)).observe(eph['sun']).apparent().radec(epoch='date')
+    return grid, np.unwrap(ra.radians), dec.radians
+
+
+def _sun_radec(sun_track, jd):
+    grid, ra, dec = sun_track
+    return np.interp(jd, grid, ra), np.interp(jd, grid, dec)
+
+
+def _sun_sin_altitude(sun_track, observer, delta_t, jd):
+    # The Sun's altitude (its sine) from the interpolated RA/Dec and the sidereal time; pure NumPy
+    ra, dec = _sun_radec(sun_track, jd)
+    theta, _ = theta_GMST1982(jd - delta_t, 0.0)
+    latitude, longitude = observer.latitude.radians, observer.longitude.radians
+    return (np.sin(latitude) * np.sin(dec)
+            + np.cos(latitude) * np.cos(dec) * np.cos(theta + longitude - ra))
+
+
+def _sun_direction(sun_track, jd):
+    # RA/Dec of date stand in for TEME (which only drops the equation of the equinoxes)
+    ra, dec = _sun_radec(sun_track, jd)
+    return np.stack((np.cos(dec) * np.cos(ra), np.cos(dec) * np.sin(ra), np.sin(dec)), axis=-1)
+
+
+def sunlit_fraction(satellite, ts, aos, los, sun_track, samples=SHADOW_SAMPLES):
+    """Fraction of each pass (AOS .. LOS Julian dates TT) during which the satellite is sunlit.
+
+    The shadow test runs in SGP4's own TEME frame: the Sun direction at AOS
+    comes from the interpolated ``sun_track``, and only the cheap raw SGP4
+    call is made for every sample, skipping Skyfield's per-time frame rotations.
+    """
+    sun = _sun_direction(sun_track, aos)
+    t = ts.tt_jd(aos[:, None] + (los - aos)[:, None] * np.linspace(0.0, 1.0, samples))
+    position = _teme_positions(satellite, t).reshape(aos.size, samples, 3)
+    return (_shadow_margin(position, sun[:, None, :]) > 0).mean(axis=1)
+
+
+def _teme_positions(satellite, t):
+    _, position, _ = satellite.model.sgp4_array(t.whole.ravel(), (t.tai_fraction - t._leap_seconds() / DAY_S).ravel())
+    return position
+
+
+def _shadow_margin(position, sun):
+    # Cylindrical Earth shadow: behind the Earth and within one radius of the
+    # Sun axis. Negative in the shadow, and continuous across its edge.
+    along = (position * sun).sum(axis=-1)
+    across = np.linalg.norm(position - along[..., None] * sun, axis=-1)
+    return np.where(along > 0, np.linalg.norm(position, axis=-1), across) - EARTH_RADIUS_KM
+
+
+def classify(sun_alt, max_altitude, sunlit):
+    # Same twilight rules as get_visibility() in the SUN script, for whole columns at once
+    codes = np.select(
+        [sun_alt > 0,
+         sun_alt > -6,
+         sun_alt > -12,
+         sun_alt > -18],
+        [NO,
+         UNLIKELY,
+         np.where(max_altitude > 20, POSSIBLE, UNLIKELY),
+         np.where(max_altitude > 30, LIKELY, POSSIBLE)],
+        np.where(max_altitude > 30, YES, TOO_LOW)).astype(np.uint8)
+    # A satellite in the Earth's shadow for the whole pass cannot be seen at night
+    return np.where((codes != NO) & (sunlit == 0.0), ECLIPSED, codes).astype(np.uint8)
+
+
+@timed('enrichment')
+def illuminate_passes(satellite, observer, ts, aos, max_altitude, los, eph=None):
+    """Sun altitude at AOS, sunlit fraction and visibility code for arrays of passes.
+
+    ``aos`` and ``los`` are Julian dates (TT); returns three NumPy columns.
+    The Sun comes from one ephemeris evaluation per SUN_GRID_DAYS of the
+    span, interpolated, and serves both the altitude and the shadow test.
+    """
+    aos, los = np.asarray(aos, float), np.asarray(los, float)
+    if not aos.size:
+        return np.zeros(0), np.zeros(0), np.zeros(0, np.uint8)
+    eph = eph or load_ephemeris()
+    sun_track = _sun_track(ts, aos.min(), los.max(), eph)
+    delta_t = float(ts.tt_jd(aos[0]).delta_t) / DAY_S
+    sun_alt = np.degrees(np.arcsin(_sun_sin_altitude(sun_track, observer, delta_t, aos)))
+    sunlit = sunlit_fraction(satellite, ts, aos, los, sun_track)
+    return sun_alt, sunlit, classify(sun_alt, max_altitude, sunlit)
+
+
+def pass_columns(passes, ts):
+    # AOS/LOS Julian dates (TT) and max altitude from a list of pass dicts
+    aos = ts.from_datetimes([p['aos_time'] for p in passes]).tt
+    los = ts.from_datetimes([p['los_time'] for p in passes]).tt
+    return aos, np.array([p['max_altitude'] for p in passes]), los
+
+
+# === Visible-Pass Search ===
+def segment_grid(starts, ends, step):
+    """Samples every ``step`` from each start through its end, with the index of their interval."""
+    counts = np.ceil((ends - starts) / step).astype(int) + 1
+    segment = np.repeat(np.arange(starts.size), counts)
+    offset = np.arange(segment.size) - np.repeat(np.cumsum(counts) - counts, counts)
+    return np.minimum(starts[segment] + offset * step, ends[segment]), segment
+
+
+def _positive_intervals(function, jd, segment=None):
+    """Start and end arrays of the intervals where ``function`` sampled at ``jd`` is positive.
+
+    Sign changes between samples are refined to EDGE_PRECISION_SECONDS;
+    intervals open at either end of a segment (or of the whole grid) are
+    clipped to it.
+    """
+    value = function(jd)
+    segment = np.zeros(jd.size, int) if segment is None else segment
+    positive = value > 0
+    first = np.r_[True, segment[1:] != segment[:-1]]
+    last = np.r_[first[1:], True]
+    k = np.flatnonzero(~last & (positive != np.r_[positive[1:], False]))
+    crossing = find_roots(function, jd[k], jd[k + 1], value[k], value[k + 1], EDGE_PRECISION_SECONDS / DAY_S)
+    rising = ~positive[k]
+    starts = np.sort(np.concatenate((jd[first & positive], crossing[rising])))
+    ends = np.sort(np.concatenate((jd[last & positive], crossing[~rising])))
+    return starts, ends
+
+
+def darkness_intervals(observer, ts, start, end, sun_altitude_max=VISIBLE_SUN_ALTITUDE, eph=None, sun_track=None):
+    """Intervals (TT Julian dates) in [start, end] with the Sun below ``sun_altitude_max`` at the observer.
+
+    The Sun's RA/Dec of date are interpolated from a half-day grid and its
+    altitude follows from the sidereal time, so the dense grid is pure NumPy.
+    """
+    eph = eph or load_ephemeris()
+    sun_track = sun_track or _sun_track(ts, start, end, eph)
+    delta_t = float(ts.tt_jd(start).delta_t) / DAY_S
+    sin_max = np.sin(np.radians(sun_altitude_max))
+
+    def darkness(jd):
+        return sin_max - _sun_sin_altitude(sun_track, observer, delta_t, jd)
+
+    return _positive_intervals(darkness, np.r_[np.arange(start, end, DARKNESS_STEP_MINUTES / 1440.0), end])
+
+
+def sunlit_intervals(satellite, ts, starts, ends, eph=None, sun_track=None):
+    """The parts of the [starts, ends] intervals (TT Julian dates) during which the satellite is sunlit."""
+    if not starts.size:
+        return starts, ends
+    eph = eph or load_ephemeris()
+    sun_track = sun_track or _sun_track(ts, starts[0], ends[-1], eph)
+
+    def sunlit(jd):
+        return _shadow_margin(_teme_positions(satellite, ts.tt_jd(jd)), _sun_direction(sun_track, jd))
+
+    return _positive_intervals(sunlit, *segment_grid(starts, ends, SHADOW_STEP_SECONDS / DAY_S))
+
+
+def longest_pass_days(model):
+    # The arc of orbit above the horizon at apogee height, crossed at the
+    # mean motion less a full Earth rotation (an equatorial prograde orbit)
+    radius = (1.0 + model.alta) * model.radiusearthkm
+    rate = max(model.no_kozai - EARTH_ROTATION_RAD_MIN, 0.0)
+    arc = 2.0 * np.arccos(min(EARTH_RADIUS_KM / radius, 1.0))
+    return min(arc / rate / 1440.0, 1.0) if rate else 1.0
+
+
+def _window_grids(starts, ends, step, longest):
+    # Coarse sample grids around the windows: passes culminating up to
+    # ``longest`` either side can overlap one, and their AOS/LOS brackets
+    # reach one step further. Windows whose grids would touch share one.
+    if not starts.size:
+        return
+    pad = longest + 2 * step
+    lo, hi = starts - pad, ends + pad
+    new = np.r_[True, lo[1:] > np.maximum.accumulate(hi)[:-1]]
+    lo, hi = lo[new], np.maximum.reduceat(hi, np.flatnonzero(new))
+    counts = np.ceil((hi - lo) / step).astype(int) + 1
+    chunk = np.cumsum(counts) // max(int(MAX_CHUNK_DAYS / step), 1)
+    for c in np.unique(chunk):
+        g = chunk == c
+        jd, segment = segment_grid(lo[g], hi[g], step)
+        owned = (jd >= lo[g][segment] + 2 * step) & (jd <= hi[g][segment] - 2 * step)
+        yield jd, owned, segment
+
+
+def find_visible_passes(satellite, observer, t0, days, min_elevation=0.0, mask=None,
+                        sun_altitude_max=VISIBLE_SUN_ALTITUDE, eph=None):
+    """Passes seen from a dark site while the satellite is sunlit, searched for only there.
+
+    The observer's darkness and, inside it, the satellite's sunlit intervals
+    are found on cheap vectorized grids first; the pass sweep then samples
+    only their intersection, padded by the longest possible pass. Records
+    are find_passes() ones plus the SUN script's 'sun_elevation', 'sunlit'
+    and 'visibility', and the visible part of the pass ('visible_from',
+    'visible_until').
+    """
+    eph = eph or load_ephemeris()
+    ts = t0.ts
+    start, end = t0.tt, t0.tt + days
+    with stage('event search'):
+        sun_track = _sun_track(ts, start, end, eph)
+        dark = darkness_intervals(observer, ts, start, end, sun_altitude_max, eph, sun_track)
+        window_start, window_end = sunlit_intervals(satellite, ts, *dark, eph, sun_track)
+
+    difference = satellite - observer
+    look_at = look_function(satellite, observer, ts)
+    horizon = elevation_mask(min_elevation, mask)
+    step = coarse_step_days(satellite)
+    for jd, owned, segment in _window_grids(window_start, window_end, step, longest_pass_days(satellite.model)):
+        found = chunk_passes(look_at, jd, horizon, owned, segment=segment)
+        if not found:
+            continue
+        aos, tca, los, max_alt = (np.array(column) for column in zip(*found))
+        # The first window ending after AOS must start before LOS
+        w = np.minimum(np.searchsorted(window_end, aos, 'right'), window_end.size - 1)
+        keep = (window_end[w] > aos) & (window_start[w] < los)
+        if not np.any(keep):
+            continue
+        aos, tca, los, max_alt, w = aos[keep], tca[keep], los[keep], max_alt[keep], w[keep]
+        records = list(build_pass_records(difference, ts, aos, tca, los))
+        sun_alt, sunlit, codes = illuminate_passes(satellite, observer, ts, aos, max_alt, los, eph)
+        visible_from = ts.tt_jd(np.maximum(aos, window_start[w])).utc_datetime()
+        visible_until = ts.tt_jd(np.minimum(los, window_end[w])).utc_datetime()
+        for i, record in enumerate(records):
+            record['sun_elevation'] = sun_alt[i]
+            record['sunlit'] = sunlit[i]
+            record['visibility'] = VISIBILITY_LABELS[codes[i]]
+            record['visible_from'] = visible_from[i]
+            record['visible_until'] = visible_until[i]
+        yield from records
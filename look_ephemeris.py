@@ -0,0 +1,118 @@
+import os
+import struct
+import time
+
+import numpy as np
+from skyfield.api import load
+
+from tle_catalog import TLECatalog, look_angles, unix_times
+
+# === File Layout ===
+# A 256-byte header followed by one float32 row (elevation, azimuth, range,
+# range rate) per time step, starting at start_unix and spaced step_s apart.
+MAGIC = b'LOOKEPH1'
+HEADER = struct.Struct('<8sIIqddddddq69s69s')
+HEADER_SIZE = 256
+COLUMNS = ('elevation', 'azimuth', 'range_km', 'range_rate_km_s')
+
+# === Configurations ===
+STEP_SECONDS = 1.0
+DAYS = 3
+CHUNK_ROWS = 21600           # rows propagated per batched SGP4 call while writing
+
+# === Writer ===
+def write_look_ephemeris(path, tle, site, start_unix, days=DAYS, step_s=STEP_SECONDS):
+    """Precompute the look angles of one TLE (name, line1, line2) for a Site into ``path``.
+
+    The file is built next to ``path`` and moved into place atomically, so
+    readers that still map the old file keep a consistent view.
+    """
+    ts = load.timescale()
+    catalog = TLECatalog.from_lines(tle)
+    count = int(days * 86400 / step_s) + 1
+    header = HEADER.pack(MAGIC, 1, HEADER_SIZE, int(catalog.satnum[0]), catalog.epoch_jd[0], site.latitude,
+                         site.longitude, site.elevation_m, start_unix, step_s, count,
+                         catalog.lines[0][0].encode(), catalog.lines[0][1].encode())
+
+    temporary = f'{path}.tmp'
+    with open(temporary, 'wb') as file:
+        file.write(header.ljust(HEADER_SIZE, b'\0'))
+        file.truncate(HEADER_SIZE + count * len(COLUMNS) * 4)
+    table = np.memmap(temporary, np.float32, 'r+', HEADER_SIZE, (count, len(COLUMNS)))
+    for first in range(0, count, CHUNK_ROWS):
+        last = min(first + CHUNK_ROWS, count)
+        seconds = start_unix + np.arange(first, last) * step_s
+        t = unix_times(ts, seconds)
+        columns = look_angles(catalog, t, site.latitude, site.longitude, site.elevation_m, range_rate=True)
+        table[first:last] = np.stack([column[0] for column in columns], axis=1)
+    table.flush()
+    del table
+    os.replace(temporary, path)
+
+
+# === Reader ===
+class LookEphemeris:
+    """Memory-mapped look-angle table; interpolates without touching SGP4."""
+
+    def __init__(self, path):
+        with open(path, 'rb') as file:
+            fields = HEADER.unpack(file.read(HEADER.size))
+        (magic, _, header_size, self.satnum, self.tle_epoch_jd, self.latitude, self.longitude,
+         self.elevation_m, self.start_unix, self.step_s, self.count, line1, line2) = fields
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a look-angle ephemeris")
+        self.tle = (line1.decode(), line2.decode())
+        self.table = np.memmap(path, np.float32, 'r', header_size, (self.count, len(COLUMNS)))
+        self.end_unix = self.start_unix + (self.count - 1) * self.step_s
+
+    def is_stale(self, latest_epoch_jd):
+        # A newer element set for the same object invalidates the whole table
+        return latest_epoch_jd > self.tle_epoch_jd
+
+    def covers(self, unix_seconds):
+        return self.start_unix <= unix_seconds <= self.end_unix
+
+    def at(self, unix_seconds):
+        """Interpolated (elevation, azimuth, range_km, range_rate_km_s) at one or more Unix times."""
+        position = (np.asarray(unix_seconds, float) - self.start_unix) / self.step_s
+        if position.ndim == 0:
+            return self._at_scalar(float(position))
+        if np.any(position < 0) or np.any(position > self.count - 1):
+            raise ValueError("time outside the precomputed table")
+        i = np.minimum(position.astype(np.int64), self.count - 2)
+        fraction = (position - i)[..., None]
+        before, after = self.table[i], self.table[i + 1]
+        delta = after - before
+        # The azimuth wraps at north; interpolate across the shortest way round
+        delta[..., 1] = (delta[..., 1] + 180.0) % 360.0 - 180.0
+        row = before + fraction * delta
+        row[..., 1] %= 360.0
+        return row
+
+    def _at_scalar(self, position):
+        # Rotator/dashboard hot path: one time, two rows, plain float arithmetic
+        if not 0 <= position <= self.count - 1:
+            raise ValueError("time outside the precomputed table")
+        i = min(int(position), self.count - 2)
+        fraction = position - i
+        (el0, az0, r0, rr0), (el1, az1, r1, rr1) = self.table[i:i + 2].tolist()
+        d_az = (az1 - az0 + 180.0) % 360.0 - 180.0
+        return ((el0 + fraction * (el1 - el0)), (az0 + fraction * d_az) % 360.0,
+                (r0 + fraction * (r1 - r0)), (rr0 + fraction * (rr1 - rr0)))
+
+    def now(self):
+        return self.at(time.time())
+
+
+def open_look_ephemeris(path, store, key, site, days=DAYS, step_s=STEP_SECONDS):
+    """Open ``path``, rebuilding it first if it is missing or the TLE store has a newer element set."""
+    latest = store.latest(key)
+    if latest is None:
+        raise ValueError(f"{key} TLE not found in store")
+    if os.path.exists(path):
+        ephemeris = LookEphemeris(path)
+        epoch_jd = TLECatalog.from_lines(latest).epoch_jd[0]
+        if not ephemeris.is_stale(epoch_jd) and ephemeris.covers(time.time() + days * 86400 / 2):
+            return ephemeris
+    write_look_ephemeris(path, latest, site, time.time(), days, step_s)
+    return LookEphemeris(path)
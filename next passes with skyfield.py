@@ -1,7 +1,10 @@
-from skyfield.api import load, Topos, EarthSatellite
-from datetime import timedelta, timezone
+from skyfield.api import load
 from zoneinfo import ZoneInfo
-import requests, os
+import os
+
+from pass_cache import PassCache
+from pass_scheduler import Site
+from tle_store import TLEStore
 
 
 # === Configurations ===
@@ -16,16 +19,11 @@ LOCAL_TIMEZONE = ZoneInfo("Europe/Zurich")
 TLE_URL = 'https://www.celestrak.com/NORAD/elements/stations.txt'
 
 def download_tle():
-    print("Downloading latest TLE from Celestrak...")
-    response = requests.get(TLE_URL)
-    tle_lines = response.text.splitlines()
-    for i, line in enumerate(tle_lines):
-        if 'ISS (ZARYA)' in line:
-            with open(TLE_FILE, 'w') as file:
-                file.write('\n'.join(tle_lines[i:i + 3]) + '\n')
-            print("TLE saved to", TLE_FILE)
-            return
-    raise ValueError("ISS TLE not found in data")
+    # ✅ Refresh the local TLE store (only if stale) and export the ISS entry
+    with TLEStore() as store:
+        store.refresh(TLE_URL)
+        store.write_tle_file('ISS (ZARYA)', TLE_FILE)
+    print("TLE saved to", TLE_FILE)
 
 # Step 1: Get TLE data (reuse existing file if available)
 if not os.path.exists(TLE_FILE):
@@ -36,46 +34,18 @@ ts = load.timescale()
 with open(TLE_FILE) as file:
     tle = file.readlines()
 
-# ✅ Use EarthSatellite for inline TLE data
-satellite = EarthSatellite(tle[1].strip(), tle[2].strip(), tle[0].strip(), ts)
-
 # ✅ Create Observer
-observer = Topos(latitude_degrees=LATITUDE, longitude_degrees=LONGITUDE, elevation_m=ALTITUDE)
+observer = Site('observer', LATITUDE, LONGITUDE, ALTITUDE)
 
 
 # === Step 2: Find Next Passes ===
+# ✅ Served from the pass cache; only the part of the window it does not hold yet is swept
 def find_next_passes():
-    t0 = ts.now()
-    passes = []
-    while len(passes) < MAX_PASSES:
-        t, events = satellite.find_events(observer, t0, t0 + timedelta(days=10), altitude_degrees=MIN_ELEVATION)
-        rise_time, max_alt_time, set_time = None, None, None
-        max_altitude = 0
-
-        for ti, event in zip(t, events):
-            if event == 0:  # AOS (rise)
-                rise_time = ti.utc_datetime().replace(tzinfo=timezone.utc)
-                t0 = ti + timedelta(seconds=1)
-            elif event == 1:  # MAX ALTITUDE
-                max_alt_time = ti.utc_datetime().replace(tzinfo=timezone.utc)
-                alt, az, dist = (satellite - observer).at(ti).altaz()
-                max_altitude = alt.degrees
-            elif event == 2:  # LOS (set)
-                set_time = ti.utc_datetime().replace(tzinfo=timezone.utc)
-                if rise_time and set_time and max_altitude >= MIN_ELEVATION:
-                    duration = (set_time - rise_time).seconds
-                    passes.append({
-                        'aos_time': rise_time,
-                        'max_time': max_alt_time,
-                        'los_time': set_time,
-                        'duration': duration,
-                        'max_altitude': round(max_altitude),
-                        'aos_azimuth': round((satellite - observer).at(t[0]).altaz()[1].degrees),
-                        'los_azimuth': round((satellite - observer).at(t[2]).altaz()[1].degrees)
-                    })
-                if len(passes) >= MAX_PASSES:
-                    break
-        t0 = t[-1] + timedelta(minutes=1)
+    with PassCache(min_elevation=MIN_ELEVATION, ts=ts) as cache:
+        passes = list(cache.next(tle, observer, MAX_PASSES))
+        stats = cache.stats
+    print(f"Pass cache: {stats['hits']} hit, {stats['partial']} partial, {stats['misses']} miss, "
+          f"{stats['computed_days']:.2f} days computed")
     return passes
 
 
@@ -102,9 +72,9 @@ for i, p in enumerate(passes, start=1):
 
     print(f"{i}. AOS: {local_aos_time} ({utc_aos_time} UTC), "
           f"Visible: {p['duration'] // 60} min, "
-          f"Max Height: {max_height}°, "
-          f"Appears: {p['aos_azimuth']}° above {appears_cardinal}, "
-          f"Disappears: {p['los_azimuth']}° above {disappears_cardinal}")
+          f"Max Height: {max_height:.0f}°, "
+          f"Appears: {p['aos_azimuth']:.0f}° above {appears_cardinal}, "
+          f"Disappears: {p['los_azimuth']:.0f}° above {disappears_cardinal}")
 
 # === Step 4: Display Results in Table ===
 print("\n--- Next 10 Visible Passes (Table Format) ---")
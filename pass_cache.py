@@ -0,0 +1,238 @@
+from collections import OrderedDict
+from math import ceil, floor
+import hashlib
+import sqlite3
+import time
+
+import numpy as np
+from skyfield.api import EarthSatellite, Topos, load
+
+from pass_finder import MARGIN_MINUTES
+from pass_table import PASS_DTYPE, PassTable, find_pass_table
+from tle_catalog import parse_tle_lines, unix_times
+
+# === Configurations ===
+CACHE_FILE = 'pass_cache.sqlite'
+MEMORY_BYTES = 16 * 2**20        # pass rows kept in process, least recently used key evicted first
+DISK_BYTES = 256 * 2**20         # the same bound for the SQLite file's pass rows
+ALIGN_HOURS = 6                  # computed ranges are widened to this grid, so a rerun a minute later still hits
+DUPLICATE_SECONDS = 1.0          # the same pass found from two sides of a segment edge
+NEXT_DAYS = 4                    # first window tried by next(); doubled until it holds enough passes
+MAX_NEXT_DAYS = 64
+CACHE_VERSION = 1                # part of every key; bump when pass_finder results change
+
+DAY_S = 86400.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS segment (
+    key TEXT NOT NULL,
+    start REAL NOT NULL,
+    end REAL NOT NULL,
+    used REAL NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (key, start)
+) WITHOUT ROWID;
+"""
+
+
+def cache_key(line1, line2, site, min_elevation=0.0, mask=None):
+    """Hex digest of everything a pass prediction depends on: TLE lines, site position, elevation limit, mask."""
+    digest = hashlib.sha256(f'{CACHE_VERSION}\n{line1.strip()}\n{line2.strip()}\n'
+                            f'{site.latitude!r} {site.longitude!r} {site.elevation_m!r}\n'
+                            f'{float(min_elevation)!r}\n'.encode())
+    if mask is not None:
+        digest.update(np.ascontiguousarray(mask.at_least(min_elevation).table, '<f8').tobytes())
+    return digest.hexdigest()
+
+
+# === Segments ===
+# A key's passes are kept as sorted, disjoint [start, end) segments of Unix
+# seconds, each holding every pass whose AOS falls inside it.
+def uncovered(segments, start, end):
+    """The parts of [start, end) no segment covers."""
+    gaps = []
+    for lo, hi, _ in segments:
+        if hi <= start:
+            continue
+        if lo >= end:
+            break
+        if lo > start:
+            gaps.append((start, lo))
+        start = max(start, hi)
+    if start < end:
+        gaps.append((start, end))
+    return gaps
+
+
+def merge_segments(segments):
+    # Touching or overlapping segments become one
+    merged = []
+    for lo, hi, data in sorted(segments, key=lambda segment: segment[0]):
+        if merged and lo <= merged[-1][1]:
+            last_lo, last_hi, last_data = merged.pop()
+            data = _dedupe(np.concatenate((last_data, data[data['aos_time'] >= last_hi - DUPLICATE_SECONDS])))
+            lo, hi = last_lo, max(last_hi, hi)
+        merged.append((lo, hi, data))
+    return merged
+
+
+def _dedupe(data):
+    data = data[np.argsort(data['aos_time'], kind='stable')]
+    return data[np.diff(data['aos_time'], prepend=-np.inf) > DUPLICATE_SECONDS]
+
+
+def _select(segments, start, end):
+    parts = [data[(data['aos_time'] >= start) & (data['aos_time'] < end)]
+             for lo, hi, data in segments if hi > start and lo < end]
+    return np.concatenate(parts) if parts else np.zeros(0, PASS_DTYPE)
+
+
+def _nbytes(segments):
+    return sum(data.nbytes for _, _, data in segments)
+
+
+# === Cache ===
+class PassCache:
+    """Pass predictions cached in process and in SQLite, by TLE, site, elevation limit and mask.
+
+    A query computes only the parts of its window no cached segment covers,
+    each padded by the sweep margin so passes across its edges come out
+    whole, and stores the result merged with the segments around it. Both
+    tiers are bounded in bytes and evict whole keys, least recently used
+    first; on disk, use is recorded when a key is loaded or written.
+    """
+
+    def __init__(self, path=CACHE_FILE, min_elevation=0.0, mask=None, memory_bytes=MEMORY_BYTES,
+                 disk_bytes=DISK_BYTES, ts=None):
+        self.connection = sqlite3.connect(path) if path else None
+        if self.connection is not None:
+            self.connection.executescript(SCHEMA)
+        self.min_elevation = min_elevation
+        self.mask = mask
+        self.memory_bytes = memory_bytes
+        self.disk_bytes = disk_bytes
+        self.ts = ts or load.timescale()
+        self.stats = {'hits': 0, 'partial': 0, 'misses': 0, 'disk_loads': 0, 'computed_days': 0.0,
+                      'served_days': 0.0, 'memory_evictions': 0, 'disk_evictions': 0}
+        self._memory = OrderedDict()     # key -> segments
+        self._memory_used = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+
+    # === Queries ===
+    def passes(self, tle, site, start, end):
+        """Passes of ``tle`` at ``site`` with AOS in [start, end) (Unix seconds), as a PassTable sorted by AOS."""
+        name, line1, line2 = parse_tle_lines(tle)[0]
+        key = cache_key(line1, line2, site, self.min_elevation, self.mask)
+        segments = self._segments(key)
+        gaps = uncovered(segments, start, end)
+        if not gaps:
+            self.stats['hits'] += 1
+        else:
+            self.stats['partial' if len(gaps) > 1 or gaps[0] != (start, end) else 'misses'] += 1
+            satellite = EarthSatellite(line1, line2, name, self.ts)
+            observer = Topos(latitude_degrees=site.latitude, longitude_degrees=site.longitude,
+                             elevation_m=site.elevation_m)
+            align = ALIGN_HOURS * 3600.0
+            for lo, hi in gaps:
+                # Widened to the grid, but never over what is already cached
+                lo = max(floor(lo / align) * align, max((s[1] for s in segments if s[1] <= lo), default=-np.inf))
+                hi = min(ceil(hi / align) * align, min((s[0] for s in segments if s[0] >= hi), default=np.inf))
+                segments.append((lo, hi, self._compute(satellite, observer, lo, hi)))
+                self.stats['computed_days'] += (hi - lo) / DAY_S
+            segments = merge_segments(segments)
+            self._store(key, segments)
+        self.stats['served_days'] += (end - start) / DAY_S
+        self._remember(key, segments)
+        return PassTable(_select(segments, start, end), [name], [site.name])
+
+    def next(self, tle, site, count, after=None):
+        """The first ``count`` passes not over yet at ``after`` (default now), the one in progress included."""
+        after = time.time() if after is None else after
+        days = NEXT_DAYS
+        while True:
+            table = self.passes(tle, site, after - MARGIN_MINUTES * 60, after + days * DAY_S)
+            table = table[table.data['los_time'] > after]
+            if len(table) >= count or days >= MAX_NEXT_DAYS:
+                return table[:count]
+            days *= 2
+
+    def _compute(self, satellite, observer, start, end):
+        # Swept from a margin either side, so passes across the edges are found whole, then cut to AOS
+        margin = MARGIN_MINUTES * 60
+        table = find_pass_table(satellite, observer, unix_times(self.ts, start - margin),
+                                (end - start + 2 * margin) / DAY_S, self.min_elevation, mask=self.mask)
+        data = table.data
+        return data[(data['aos_time'] >= start) & (data['aos_time'] < end)]
+
+    # === Memory Tier ===
+    def _segments(self, key):
+        segments = self._memory.get(key)
+        if segments is not None:
+            return list(segments)
+        segments = self._load(key)
+        if segments:
+            self.stats['disk_loads'] += 1
+        return segments
+
+    def _remember(self, key, segments):
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_used -= _nbytes(old)
+        self._memory[key] = segments
+        self._memory_used += _nbytes(segments)
+        while self._memory_used > self.memory_bytes and len(self._memory) > 1:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_used -= _nbytes(evicted)
+            self.stats['memory_evictions'] += 1
+
+    # === Disk Tier ===
+    def _load(self, key):
+        if self.connection is None:
+            return []
+        with self.connection:
+            rows = self.connection.execute('SELECT start, end, data FROM segment WHERE key = ? ORDER BY start',
+                                           (key,)).fetchall()
+            if rows:
+                self.connection.execute('UPDATE segment SET used = ? WHERE key = ?', (time.time(), key))
+        return [(start, end, np.frombuffer(data, PASS_DTYPE)) for start, end, data in rows]
+
+    def _store(self, key, segments):
+        if self.connection is None:
+            return
+        with self.connection:
+            self.connection.execute('DELETE FROM segment WHERE key = ?', (key,))
+            now = time.time()
+            self.connection.executemany('INSERT INTO segment VALUES (?, ?, ?, ?, ?)',
+                                        [(key, lo, hi, now, data.tobytes()) for lo, hi, data in segments])
+            self._evict_disk(key)
+
+    def _evict_disk(self, keep):
+        used = self.connection.execute('SELECT COALESCE(SUM(LENGTH(data)), 0) FROM segment').fetchone()[0]
+        if used <= self.disk_bytes:
+            return
+        for key, size in self.connection.execute(
+                'SELECT key, SUM(LENGTH(data)) FROM segment WHERE key != ? GROUP BY key ORDER BY MAX(used)',
+                (keep,)).fetchall():
+            self.connection.execute('DELETE FROM segment WHERE key = ?', (key,))
+            self.stats['disk_evictions'] += 1
+            used -= size
+            if used <= self.disk_bytes:
+                break
+
+    def info(self):
+        # Counters plus the current size of both tiers
+        disk = (self.connection.execute('SELECT COUNT(DISTINCT key), COALESCE(SUM(LENGTH(data)), 0) FROM segment')
+                .fetchone() if self.connection is not None else (0, 0))
+        lookups = self.stats['hits'] + self.stats['partial'] + self.stats['misses']
+        return {**self.stats, 'hit_rate': self.stats['hits'] / lookups if lookups else 0.0,
+                'memory_keys': len(self._memory), 'memory_bytes': self._memory_used,
+                'disk_keys': disk[0], 'disk_bytes': disk[1]}
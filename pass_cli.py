@@ -0,0 +1,312 @@
+import argparse
+import os
+import sys
+import time
+
+# Taken before anything heavy is imported, so --profile-startup covers the imports too
+_START = time.perf_counter()
+
+# === Configurations ===
+TLE_FILE = 'iss.tle'
+TLE_NAME = 'ISS (ZARYA)'
+TLE_URL = 'https://www.celestrak.com/NORAD/elements/stations.txt'
+LATITUDE = 46.4667
+LONGITUDE = 6.8616
+ALTITUDE = 500
+MAX_PASSES = 12
+MIN_ELEVATION = 0
+LOCAL_TIMEZONE = 'Europe/Zurich'
+TIMESCALE_CACHE = 'timescale.pickle'
+TIMESCALE_MAX_AGE_DAYS = 30      # rebuilt after this, or whenever Skyfield is upgraded
+STARTUP_BUDGET_MS = 300          # cold start to first pass for the "next" subcommand
+
+
+# === Startup Profiling ===
+class StartupProfile:
+    def __init__(self, enabled):
+        self.enabled = enabled
+        self.stages = []
+        self._last = _START
+
+    def mark(self, stage):
+        now = time.perf_counter()
+        self.stages.append((stage, (now - self._last) * 1000))
+        self._last = now
+
+    def report(self, budget_ms=None):
+        if not self.enabled:
+            return
+        total = (self._last - _START) * 1000
+        print("\n--- Startup profile ---", file=sys.stderr)
+        for stage, ms in self.stages:
+            print(f"{stage:<28} {ms:8.1f} ms", file=sys.stderr)
+        print(f"{'total':<28} {total:8.1f} ms", file=sys.stderr)
+        if budget_ms is not None:
+            verdict = "✅ within" if total <= budget_ms else "❌ over"
+            print(f"{verdict} the {budget_ms} ms budget", file=sys.stderr)
+
+
+def load_timescale():
+    """Skyfield timescale, unpickled from a local cache instead of rebuilt from the leap-second tables."""
+    import pickle
+    import skyfield
+
+    max_age_s = TIMESCALE_MAX_AGE_DAYS * 86400
+    if os.path.exists(TIMESCALE_CACHE) and time.time() - os.path.getmtime(TIMESCALE_CACHE) < max_age_s:
+        with open(TIMESCALE_CACHE, 'rb') as file:
+            version, ts = pickle.load(file)
+        if version == skyfield.__version__:
+            return ts
+
+    from skyfield.api import load
+    ts = load.timescale()
+    with open(f'{TIMESCALE_CACHE}.tmp', 'wb') as file:
+        pickle.dump((skyfield.__version__, ts), file)
+    os.replace(f'{TIMESCALE_CACHE}.tmp', TIMESCALE_CACHE)
+    return ts
+
+
+def read_mask(args):
+    if args.mask is None:
+        return None
+    from horizon_mask import HorizonMask
+    return HorizonMask.from_file(args.mask)
+
+
+def read_tle(args):
+    from stage_profiler import stage
+    if not os.path.exists(args.tle):
+        refresh(args, None)
+    with stage('tle load'), open(args.tle) as file:
+        return file.readlines()
+
+
+# === Subcommands ===
+def refresh(args, profile):
+    # ✅ Refresh the local TLE store (stale sources only, conditional requests) and export the requested entry
+    import asyncio
+    from tle_fetcher import fetch_sources, group_urls
+    from tle_store import TLEStore
+    groups = getattr(args, 'group', None)
+    with TLEStore() as store:
+        for result in asyncio.run(fetch_sources(store, group_urls(groups) if groups else [TLE_URL])):
+            print(f"{result.url}: {result.status}, {result.imported} element sets")
+        store.write_tle_file(TLE_NAME, args.tle)
+    print("TLE saved to", args.tle)
+
+
+def next_passes(args, profile):
+    from itertools import islice
+    from zoneinfo import ZoneInfo
+    profile.mark('import stdlib')
+    import numpy    # noqa: F401 -- timed on its own, it is most of the startup
+    profile.mark('import numpy')
+    from skyfield.sgp4lib import EarthSatellite
+    from skyfield.toposlib import Topos
+    from pass_finder import find_long_horizon_passes, find_passes
+    from stage_profiler import stage
+    profile.mark('import skyfield, pass_finder')
+
+    ts = load_timescale()
+    profile.mark('timescale')
+    tle = read_tle(args)
+    satellite = EarthSatellite(tle[1].strip(), tle[2].strip(), tle[0].strip(), ts)
+    observer = Topos(latitude_degrees=args.lat, longitude_degrees=args.lon, elevation_m=args.elev)
+    profile.mark('satellite and observer')
+
+    if args.cache:
+        # ✅ Only the part of the window the cache does not hold yet is swept
+        from pass_cache import PassCache
+        from pass_scheduler import Site
+        with PassCache(args.cache, args.min_elevation, read_mask(args), ts=ts) as cache:
+            passes = list(cache.next(tle, Site('observer', args.lat, args.lon, args.elev), args.count))
+            print(f"Pass cache: {cache.info()}", file=sys.stderr)
+        profile.mark(f'{len(passes)} passes from the cache')
+    else:
+        finder = find_long_horizon_passes if args.long_horizon else find_passes
+        passes = finder(satellite, observer, ts.now(), min_elevation=args.min_elevation, mask=read_mask(args))
+        first = next(passes, None)
+        profile.mark('first pass')
+        passes = [first, *islice(passes, args.count - 1)] if first else []
+        profile.mark(f'remaining {max(len(passes) - 1, 0)} passes')
+
+    timezone = ZoneInfo(args.timezone)
+    with stage('rendering', len(passes)):
+        print(f"{'DATE':<10} {'AOS':<8} {'TCA':<8} {'LOS':<8} {'DUR':<6} {'MEL':<6}"
+              + (f" {'± s':<6}" if args.long_horizon else ""))
+        print("=" * (57 if args.long_horizon else 50))
+        for p in passes:
+            aos, tca, los = (p[key].astimezone(timezone) for key in ('aos_time', 'max_time', 'los_time'))
+            print(f"{aos:%d.%m}      {aos:%H:%M:%S} {tca:%H:%M:%S} {los:%H:%M:%S} "
+                  f"{p['duration'] // 60}:{p['duration'] % 60:02d}   {p['max_altitude']:<6.1f}"
+                  + (f" {p['timing_error_s']:<6.1f}" if args.long_horizon else ""))
+    profile.mark('print')
+    profile.report(STARTUP_BUDGET_MS)
+
+
+def visible_passes(args, profile):
+    from zoneinfo import ZoneInfo
+    from skyfield.sgp4lib import EarthSatellite
+    from skyfield.toposlib import Topos
+    from illumination import VISIBILITY_LABELS, find_visible_passes, illuminate_passes, pass_columns
+    from pass_finder import find_passes
+    from stage_profiler import stage
+    profile.mark('imports')
+
+    ts = load_timescale()
+    tle = read_tle(args)
+    satellite = EarthSatellite(tle[1].strip(), tle[2].strip(), tle[0].strip(), ts)
+    observer = Topos(latitude_degrees=args.lat, longitude_degrees=args.lon, elevation_m=args.elev)
+    if args.visible_only:
+        # ✅ Search only where the site is dark and the satellite sunlit
+        passes = list(find_visible_passes(satellite, observer, ts.now(), args.days, args.min_elevation,
+                                          read_mask(args)))
+    else:
+        passes = list(find_passes(satellite, observer, ts.now(), args.days, args.min_elevation, read_mask(args)))
+    profile.mark('passes')
+    if not passes:
+        profile.report()
+        return
+    if args.visible_only:
+        sun_alt = [p['sun_elevation'] for p in passes]
+        labels = [p['visibility'] for p in passes]
+    else:
+        sun_alt, _, codes = illuminate_passes(satellite, observer, ts, *pass_columns(passes, ts))
+        labels = [VISIBILITY_LABELS[code] for code in codes]
+    profile.mark('illumination')
+
+    timezone = ZoneInfo(args.timezone)
+    with stage('rendering', len(passes)):
+        print(f"{'DATE':<10} {'AOS':<8} {'MEL':<6} {'SUN':<7} {'VISIBILITY':<20}")
+        print("=" * 55)
+        for p, sun, label in zip(passes, sun_alt, labels):
+            aos = p['aos_time'].astimezone(timezone)
+            print(f"{aos:%d.%m}      {aos:%H:%M:%S} {p['max_altitude']:<6.1f} {sun:<7.1f} "
+                  f"{label:<20}")
+    profile.report()
+
+
+def track(args, profile):
+    from pass_scheduler import Site
+    from tracker import Tracker
+    profile.mark('imports')
+
+    tracker = Tracker(read_tle(args), Site('observer', args.lat, args.lon, args.elev), args.rate,
+                      ts=load_timescale())
+    profile.mark('tracker')
+    profile.report()
+    for point in tracker.track(args.seconds):
+        print(f"{point.unix:.1f} EL {point.elevation:6.2f} AZ {point.azimuth:6.2f} "
+              f"RANGE {point.range_km:8.1f} km DOPPLER {point.doppler_hz:+8.0f} Hz", flush=True)
+
+
+def ground_track_csv(args, profile):
+    # ✅ Stream the sub-satellite track as CSV, one chunk at a time, so any span fits in memory
+    import numpy as np
+    from skyfield.sgp4lib import EarthSatellite
+    from ground_track import ground_track
+    profile.mark('imports')
+
+    ts = load_timescale()
+    tle = read_tle(args)
+    satellite = EarthSatellite(tle[1].strip(), tle[2].strip(), tle[0].strip(), ts)
+    start = time.time() if args.start is None else args.start
+    profile.mark('satellite')
+    profile.report()
+    out = sys.stdout.buffer
+    out.write(b'time,latitude,longitude,altitude_km,footprint_km,segment\n')
+    for chunk in ground_track(satellite, start, args.hours * 3600, args.step, min_elevation=args.min_elevation):
+        np.savetxt(out, np.column_stack([chunk[name] for name in chunk.dtype.names]), delimiter=',',
+                   fmt=('%.3f', '%.5f', '%.5f', '%.3f', '%.1f', '%d'))
+
+
+def serve(args, profile):
+    # ✅ Answer pass queries for this site over HTTP, re-reading the TLE file on every refresh
+    from pass_scheduler import Site
+    from pass_service import PassService, make_server
+    from tle_catalog import parse_tle_lines
+
+    def entries():
+        with open(args.tle) as file:
+            return parse_tle_lines(file.readlines())
+
+    site = Site(args.site, args.lat, args.lon, args.elev)
+    service = PassService([site], entries, args.schedule, args.refresh_minutes * 60, args.min_elevation,
+                          load_timescale())
+    service.start()
+    server = make_server(service, args.address)
+    profile.report()
+    print(f"Serving passes for {site.name} on {args.address}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.stop()
+
+
+COMMANDS = {'next': next_passes, 'visible': visible_passes, 'track': track, 'refresh': refresh, 'serve': serve,
+            'ground-track': ground_track_csv}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Satellite pass prediction")
+    parser.add_argument('--profile-startup', action='store_true', help="print import and startup timings to stderr")
+    parser.add_argument('--profile-stages', action='store_true',
+                        help="per-stage timings on exit (same as the PASS_PROFILE environment variable)")
+    parser.add_argument('--profile-modes', default='summary', metavar='MODES',
+                        help="with --profile-stages: 'summary', plus ',trace' and/or ',pstats' for dumps")
+    parser.add_argument('--tle', default=TLE_FILE)
+    parser.add_argument('--lat', type=float, default=LATITUDE)
+    parser.add_argument('--lon', type=float, default=LONGITUDE)
+    parser.add_argument('--elev', type=float, default=ALTITUDE, help="metres")
+    parser.add_argument('--timezone', default=LOCAL_TIMEZONE)
+    parser.add_argument('--mask', help="horizon mask file of 'azimuth elevation' lines")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    command = commands.add_parser('next', help="next passes")
+    command.add_argument('-n', '--count', type=int, default=MAX_PASSES)
+    command.add_argument('--long-horizon', action='store_true',
+                         help="refine each pass only to its predicted TLE timing error, and show that error")
+    command.add_argument('--cache', nargs='?', const='pass_cache.sqlite', metavar='PATH',
+                         help="serve passes from a persistent result cache (default file pass_cache.sqlite)")
+    command.add_argument('--min-elevation', type=float, default=MIN_ELEVATION)
+    command = commands.add_parser('visible', help="passes with Sun altitude and visibility")
+    command.add_argument('--days', type=float, default=3)
+    command.add_argument('--min-elevation', type=float, default=MIN_ELEVATION)
+    command.add_argument('--visible-only', action='store_true',
+                         help="only passes in darkness with the satellite sunlit, searched for only there")
+    command = commands.add_parser('track', help="stream az/el/range/Doppler")
+    command.add_argument('--seconds', type=float, default=None)
+    command.add_argument('--rate', type=float, default=10.0, help="Hz")
+    command = commands.add_parser('refresh', help="refresh the TLE store and rewrite the TLE file")
+    command.add_argument('--group', action='append', help="Celestrak group to fetch (repeatable)")
+    command = commands.add_parser('ground-track', help="stream the sub-satellite track and footprint radius as CSV")
+    command.add_argument('--hours', type=float, default=24)
+    command.add_argument('--step', type=float, default=10.0, help="seconds")
+    command.add_argument('--start', type=float, default=None, help="Unix seconds (default now)")
+    command.add_argument('--min-elevation', type=float, default=MIN_ELEVATION,
+                         help="elevation at the footprint edge")
+    command = commands.add_parser('serve', help="pass query service over HTTP or a Unix socket")
+    command.add_argument('--address', default='127.0.0.1:8765', help="host:port, or a socket path")
+    command.add_argument('--site', default='observer', help="site name used in queries")
+    command.add_argument('--schedule', default='pass_service.sqlite')
+    command.add_argument('--refresh-minutes', type=float, default=10)
+    command.add_argument('--min-elevation', type=float, default=MIN_ELEVATION)
+
+    args = parser.parse_args(argv)
+    if getattr(args, 'cache', None) and args.long_horizon:
+        parser.error("--cache and --long-horizon cannot be combined")
+    if getattr(args, 'count', 1) < 1:
+        parser.error("--count must be at least 1")
+    if args.profile_stages:
+        from stage_profiler import enable_from_env
+        enable_from_env(args.profile_modes)
+    profile = StartupProfile(args.profile_startup)
+    profile.mark('argument parsing')
+    COMMANDS[args.command](args, profile)
+
+
+if __name__ == '__main__':
+    main()
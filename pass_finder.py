@@ -0,0 +1,362 @@
+from datetime import timedelta
+from itertools import islice
+from math import ceil, tau
+
+import numpy as np
+
+from horizon_mask import HorizonMask
+from stage_profiler import counted, stage, timed
+
+# === Sweep Settings ===
+SAMPLES_PER_ORBIT = 20       # coarse altitude samples per orbital period (~4.6 min for the ISS)
+MAX_STEP_DAYS = 0.25         # long-period satellites still get checked every quarter-day
+FIRST_CHUNK_DAYS = 2.0       # the first sweep chunk is short so the next passes arrive quickly,
+MAX_CHUNK_DAYS = 16.0        # then chunks double up to this length to amortize per-call overhead
+MARGIN_MINUTES = 60          # chunk overlap, so passes straddling a chunk edge are still bracketed
+TCA_PRECISION_SECONDS = 0.1
+EDGE_PRECISION_SECONDS = 0.01
+MAX_ITERATIONS = 50
+
+# === Long-Horizon Budget ===
+ALONG_TRACK_ERROR_KM = (1.0, 1.0, 0.05)  # SGP4 along-track error a + b*d + c*d^2 km, d days from the TLE epoch
+BUDGET_FRACTION = 0.1        # events are refined to this fraction of their predicted timing error
+
+DAY_S = 86400.0
+EARTH_MU_KM3_S2 = 398600.4418
+SLOPE_STEP_DAYS = 0.05 / DAY_S
+_IDENTITY = np.identity(3)
+
+
+# === Altitude Sampling ===
+def look_function(satellite, observer, ts, distance=False):
+    """Function of TT Julian dates returning altitude and azimuth degrees (and range km with ``distance``)."""
+    at = (satellite - observer).at
+
+    def look_at(jd):
+        t = ts.tt_jd(jd)
+        # Same shortcut Skyfield's find_events() uses: the Earth rotation
+        # cancels out of the topocentric altitude and azimuth, so skip computing it.
+        t.gast = t.tt * 0.0
+        t.M = t.MT = _IDENTITY
+        alt, az, d = at(t).altaz()
+        return (alt.degrees, az.degrees, d.km) if distance else (alt.degrees, az.degrees)
+
+    return look_at
+
+
+def elevation_mask(min_elevation, mask):
+    """The HorizonMask to search against; the scalar minimum elevation is just a flat mask."""
+    return HorizonMask.flat(min_elevation) if mask is None else mask.at_least(min_elevation)
+
+
+def coarse_step_days(satellite):
+    orbits_per_day = satellite.model.no_kozai / tau * 1440.0
+    return min(1.0 / SAMPLES_PER_ORBIT / max(orbits_per_day, 1.0), MAX_STEP_DAYS)
+
+
+def timing_error_seconds(model, jd):
+    """Predicted SGP4 timing error, in seconds, at each Julian date of ``jd``.
+
+    The along-track position error grows from the TLE epoch as
+    ALONG_TRACK_ERROR_KM describes; divided by the orbital speed
+    (n * a = (mu * n)^(1/3)) it is how early or late the satellite runs.
+    """
+    days = np.abs(np.asarray(jd) - (model.jdsatepoch + model.jdsatepochF))
+    a, b, c = ALONG_TRACK_ERROR_KM
+    speed = (EARTH_MU_KM3_S2 * model.no_kozai / 60.0) ** (1.0 / 3.0)
+    return (a + b * days + c * days ** 2) / speed
+
+
+def _precision_days(seconds, budget, jd):
+    # The fixed precision, or with a budget whatever it allows at each event if that is coarser
+    return (seconds if budget is None else np.maximum(seconds, budget(jd))) / DAY_S
+
+
+# === Root Refinement (vectorized over every bracket at once) ===
+def find_roots(function, lo, hi, f_lo, f_hi, precision_days):
+    """Root of ``function`` in each [lo, hi] bracket, where f_lo and f_hi have opposite signs.
+
+    Illinois false position, with one propagation per iteration for the
+    brackets still short of their precision (a scalar, or one per bracket).
+    """
+    roots = np.empty(lo.size)
+    active = np.arange(lo.size)
+    precision_days = np.broadcast_to(precision_days, lo.shape)
+    x = lo
+    side = np.zeros(lo.size, int)
+    for _ in range(MAX_ITERATIONS):
+        denominator = f_hi - f_lo
+        # Fall back to bisection on flat brackets, or where SGP4 gave up (NaN)
+        safe = np.isfinite(denominator) & (denominator != 0.0)
+        x_new = np.where(safe, (lo * f_hi - hi * f_lo) / np.where(safe, denominator, 1.0), (lo + hi) / 2)
+        # and wherever the step leaves the bracket (no sign change, e.g. an orbit decaying within it)
+        x_new = np.where((x_new >= lo) & (x_new <= hi), x_new, (lo + hi) / 2)
+        # Done once the step, or the whole bracket, is within the precision
+        done = np.minimum(np.abs(x_new - x), hi - lo) <= precision_days
+        roots[active[done]] = x_new[done]
+        if np.all(done):
+            return roots
+        if np.any(done):
+            # Converged brackets drop out of the next propagations
+            left = ~done
+            active, x_new, lo, hi, f_lo, f_hi, side, precision_days = (
+                a[left] for a in (active, x_new, lo, hi, f_lo, f_hi, side, precision_days))
+        x = x_new
+        f_x = function(x)
+        same_as_lo = np.sign(f_x) == np.sign(f_lo)
+        # When the same endpoint survives twice in a row, halve its value so
+        # the bracket keeps shrinking from both sides.
+        new_side = np.where(same_as_lo, 1, -1)
+        stuck = new_side == side
+        f_hi = np.where(same_as_lo, np.where(stuck, f_hi / 2, f_hi), f_x)
+        f_lo = np.where(same_as_lo, f_x, np.where(stuck, f_lo / 2, f_lo))
+        lo = np.where(same_as_lo, x, lo)
+        hi = np.where(same_as_lo, hi, x)
+        side = new_side
+    roots[active] = x
+    return roots
+
+
+def _slope_function(altitude_at):
+    def slope_at(jd):
+        f = altitude_at(np.concatenate((jd + SLOPE_STEP_DAYS, jd - SLOPE_STEP_DAYS)))
+        return f[:jd.size] - f[jd.size:]
+    return slope_at
+
+
+@timed('refinement')
+def _refine_maxima(look_at, lo, hi, precision_days):
+    # A culmination is where the altitude stops rising
+    slope_at = _slope_function(lambda jd: look_at(jd)[0])
+    f = slope_at(np.concatenate((lo, hi)))
+    tca = find_roots(slope_at, lo, hi, f[:lo.size], f[lo.size:], precision_days)
+    return (tca, *look_at(tca))
+
+
+@timed('refinement')
+def _refine_crossings(look_at, mask, lo, hi, precision_days):
+    # Where the pass crosses the horizon mask; its steps are just sharper brackets
+    def clearance_at(jd):
+        return mask.clearance(*look_at(jd))
+    f = clearance_at(np.concatenate((lo, hi)))
+    return find_roots(clearance_at, lo, hi, f[:lo.size], f[lo.size:], precision_days)
+
+
+# === Pass Search ===
+@timed('event search')
+def chunk_passes(look_at, jd, mask, owned, budget=None, segment=None):
+    """List of (aos, tca, los, max_altitude) for the passes culminating at the ``owned`` samples of ``jd``.
+
+    With ``segment`` ids, jd holds several separate grids and no pass may straddle two.
+    """
+    alt, az = look_at(jd)
+    n = jd.size
+
+    # Local maxima of the coarse samples, owned by this chunk only
+    k = np.arange(1, n - 1)
+    k = k[(alt[k - 1] < alt[k]) & (alt[k] >= alt[k + 1]) & owned[k]]
+    # Near its peak the altitude is close to a parabola, which rises above
+    # its best sample by at most a quarter of one step's drop; maxima still
+    # short of the lowest mask elevation with the two drops added are no passes.
+    k = k[alt[k] + (alt[k] - alt[k - 1]) + (alt[k] - alt[k + 1]) >= mask.lowest]
+    if not k.size:
+        return []
+
+    # Passes culminating behind the mask are dropped here, before any
+    # AOS/LOS refinement is spent on them.
+    tca, max_alt, max_az = _refine_maxima(look_at, jd[k - 1], jd[k + 1],
+                                          _precision_days(TCA_PRECISION_SECONDS, budget, jd[k]))
+    keep = mask.clearance(max_alt, max_az) >= 0.0
+    tca, max_alt = tca[keep], max_alt[keep]
+    if not tca.size:
+        return []
+
+    # For each culmination, the last sample below the mask before it and
+    # the first one after it bracket the AOS and the LOS.
+    below = mask.clearance(alt, az) < 0.0
+    index = np.arange(n)
+    last_below = np.maximum.accumulate(np.where(below, index, -1))
+    next_below = np.minimum.accumulate(np.where(below, index, n)[::-1])[::-1]
+    m = np.searchsorted(jd, tca) - 1
+    j = last_below[m]
+    q = next_below[m + 1]
+    ok = (j >= 0) & (q < n)
+    if segment is not None:
+        ok &= (segment[np.maximum(j, 0)] == segment[m]) & (segment[np.minimum(q, n - 1)] == segment[m])
+    if not np.any(ok):
+        return []
+    tca, max_alt, j, q = tca[ok], max_alt[ok], j[ok], q[ok]
+
+    # Two maxima inside the same pass share their AOS bracket; the higher one is the culmination
+    order = np.lexsort((-max_alt, j))
+    j, first = np.unique(j[order], return_index=True)
+    pick = order[first]
+    tca, max_alt, q = tca[pick], max_alt[pick], q[pick]
+
+    lo = np.concatenate((jd[j], np.maximum(jd[q - 1], tca)))
+    hi = np.concatenate((np.minimum(jd[j + 1], tca), jd[q]))
+    edges = _refine_crossings(look_at, mask, lo, hi, _precision_days(EDGE_PRECISION_SECONDS, budget, np.tile(tca, 2)))
+    return list(zip(edges[:j.size], tca, edges[j.size:], max_alt))
+
+
+# === Pass Records ===
+EVENTS = ('aos', 'max', 'los')
+
+
+def build_pass_records(difference, ts, aos, tca, los):
+    """Pass dicts for arrays of AOS/TCA/LOS Julian dates (TT) of one satellite/observer pair.
+
+    ``difference`` is the ``satellite - observer`` vector, built once by the
+    caller; every event of every pass is evaluated in a single ``.at()`` call.
+    """
+    with stage('enrichment', aos.size):
+        t = ts.tt_jd(np.concatenate((aos, tca, los)))
+        alt, az, distance = difference.at(t).altaz()
+        records = list(_records(t, alt.degrees, az.degrees, distance.km))
+    yield from records
+
+
+def propagator_pass_records(propagator, aos, tca, los):
+    # Same records from any propagator backend, again with one call for every event
+    with stage('enrichment', aos.size):
+        jd = np.concatenate((aos, tca, los))
+        alt, az, distance = propagator.look_angles(jd)
+        records = list(_records(propagator.ts.tt_jd(jd), alt, az, distance))
+    yield from records
+
+
+def _records(t, alt, az, distance):
+    n = alt.size // 3
+    alt, az, distance = alt.reshape(3, n), az.reshape(3, n), distance.reshape(3, n)
+    times = np.array(t.utc_datetime()).reshape(3, n)
+
+    for i in range(n):
+        record = {
+            'aos_time': times[0, i],
+            'max_time': times[1, i],
+            'los_time': times[2, i],
+            'duration': (times[2, i] - times[0, i]).seconds,
+        }
+        for e, event in enumerate(EVENTS):
+            record[f'{event}_altitude'] = alt[e, i]
+            record[f'{event}_azimuth'] = az[e, i]
+            record[f'{event}_range_km'] = distance[e, i]
+        yield record
+
+
+def find_passes(satellite, observer, t0, days=None, min_elevation=0.0, mask=None):
+    """Yield passes in time order, sweeping the horizon one chunk at a time.
+
+    With ``days=None`` the stream is unbounded; stop it with islice().
+    With a HorizonMask, AOS and LOS are where the pass crosses the mask around
+    its culmination, and passes that culminate behind it are skipped.
+    Obstructions narrower than the coarse step do not split a pass.
+    """
+    ts = t0.ts
+    difference = satellite - observer
+    look_at = look_function(satellite, observer, ts)
+    horizon = elevation_mask(min_elevation, mask)
+    for aos, tca, los in sweep_passes(look_at, coarse_step_days(satellite), t0.tt, days, horizon):
+        yield from build_pass_records(difference, ts, aos, tca, los)
+
+
+def find_propagator_passes(propagator, t0, days=None, min_elevation=0.0, mask=None):
+    # find_passes() for a propagators backend, which already knows its site
+    horizon = elevation_mask(min_elevation, mask)
+    for aos, tca, los in sweep_passes(propagator.alt_az, coarse_step_days(propagator), t0.tt, days, horizon):
+        yield from propagator_pass_records(propagator, aos, tca, los)
+
+
+def find_long_horizon_passes(satellite, observer, t0, days=None, min_elevation=0.0, mask=None,
+                             fraction=BUDGET_FRACTION):
+    """find_passes() for schedules of weeks to months, refining each pass only as far as its TLE deserves.
+
+    Every event is refined to ``fraction`` of the timing error predicted for
+    it (timing_error_seconds), but never finer than find_passes() does: full
+    precision near the TLE epoch, a single false-position step on the coarse
+    bracket months away. Each record carries the prediction as 'timing_error_s'.
+    """
+    ts = t0.ts
+    model = satellite.model
+    look_at = look_function(satellite, observer, ts, distance=True)
+    horizon = elevation_mask(min_elevation, mask)
+
+    def budget(jd):
+        return fraction * timing_error_seconds(model, jd)
+
+    def alt_az(jd):
+        return look_at(jd)[:2]
+
+    for aos, tca, los in sweep_passes(alt_az, coarse_step_days(satellite), t0.tt, days, horizon, budget):
+        # The records come from the same Earth-rotation-free look angles, not a full .at()
+        with stage('enrichment', aos.size):
+            jd = np.concatenate((aos, tca, los))
+            records = list(_records(ts.tt_jd(jd), *look_at(jd)))
+            for record, error in zip(records, timing_error_seconds(model, tca)):
+                record['timing_error_s'] = float(error)
+        yield from records
+
+
+def sweep_passes(look_at, step, start, days, mask, budget=None):
+    """Yields the AOS, TCA and LOS arrays (TT Julian dates) of each chunk, in time order."""
+    look_at = counted('propagation', look_at)
+    per_chunk = max(int(FIRST_CHUNK_DAYS / step), 1)
+    max_per_chunk = max(int(MAX_CHUNK_DAYS / step), 1)
+    margin = int(ceil(MARGIN_MINUTES / 1440.0 / step)) + 1
+    total = int(ceil(days / step)) if days is not None else None
+    last_los = -np.inf
+
+    first = 0
+    while total is None or first < total:
+        last = first + per_chunk if total is None else min(first + per_chunk, total)
+        lo_index = max(first - margin, 0)
+        hi_index = last + margin if total is None else min(last + margin, total)
+        index = np.arange(lo_index, hi_index + 1)
+        jd = start + index * step
+
+        found = chunk_passes(look_at, jd, mask, (index >= first) & (index < last), budget)
+        found = [p for p in found if p[0] > last_los]
+        if found:
+            aos, tca, los, _ = (np.array(column) for column in zip(*found))
+            yield aos, tca, los
+            last_los = los[-1]
+        first = last
+        per_chunk = min(per_chunk * 2, max_per_chunk)
+
+
+def find_next_passes(satellite, observer, max_passes, min_elevation=0.0, t0=None):
+    if t0 is None:
+        t0 = satellite.epoch.ts.now()
+    return list(islice(find_passes(satellite, observer, t0, min_elevation=min_elevation), max_passes))
+
+
+# === Reference: the original repeated 10-day find_events loop ===
+def find_next_passes_legacy(satellite, observer, max_passes, min_elevation=0.0, t0=None):
+    if t0 is None:
+        t0 = satellite.epoch.ts.now()
+    passes = []
+    while len(passes) < max_passes:
+        t, events = satellite.find_events(observer, t0, t0 + timedelta(days=10), altitude_degrees=min_elevation)
+        rise_time, max_alt_time = None, None
+        max_altitude = 0
+        for ti, event in zip(t, events):
+            if event == 0:
+                rise_time = ti.utc_datetime()
+                t0 = ti + timedelta(seconds=1)
+            elif event == 1:
+                max_alt_time = ti.utc_datetime()
+                max_altitude = (satellite - observer).at(ti).altaz()[0].degrees
+            elif event == 2:
+                set_time = ti.utc_datetime()
+                if rise_time and max_altitude >= min_elevation:
+                    passes.append({
+                        'aos_time': rise_time,
+                        'max_time': max_alt_time,
+                        'los_time': set_time,
+                        'duration': (set_time - rise_time).seconds,
+                        'max_altitude': round(max_altitude),
+                    })
+                if len(passes) >= max_passes:
+                    break
+        t0 = t[-1] + timedelta(minutes=1)
+    return passes
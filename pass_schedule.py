@@ -0,0 +1,218 @@
+import sqlite3
+import time
+
+import numpy as np
+from sgp4.api import Satrec
+from skyfield.api import load, Topos, EarthSatellite
+
+from illumination import segment_grid
+from pass_finder import chunk_passes, coarse_step_days, elevation_mask, look_function
+from pass_table import PASS_DTYPE, LOOK_FIELDS, TIME_FIELDS, PassTable, find_pass_table, table_part
+from tle_catalog import parse_tle_lines, unix_times
+
+# === Configurations ===
+SCHEDULE_FILE = 'pass_schedule.sqlite'
+HORIZON_DAYS = 14
+TOLERANCE_SECONDS = 1.0      # a new TLE only re-refines passes it would move by more than this
+EXTEND_MINUTES = 60          # the tail is only re-swept once it has fallen this far behind the horizon
+OVERLAP_MINUTES = 60         # re-swept before the old end, so passes cut off by it are found whole
+REFINE_PAD_SHIFTS = 10       # a moved pass is searched for this many timing shifts beyond its old AOS/LOS
+
+UNIX_EPOCH_JD = 2440587.5
+DAY_S = 86400.0
+FIELDS = TIME_FIELDS + LOOK_FIELDS
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS coverage (
+    satnum INTEGER NOT NULL,
+    site TEXT NOT NULL,
+    name TEXT NOT NULL,
+    line1 TEXT NOT NULL,
+    line2 TEXT NOT NULL,
+    swept_until REAL NOT NULL,
+    PRIMARY KEY (satnum, site)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS pass (
+    satnum INTEGER NOT NULL,
+    site TEXT NOT NULL,
+    tle_epoch_jd REAL NOT NULL,
+    {', '.join(f'{field} REAL NOT NULL' for field in FIELDS)},
+    PRIMARY KEY (satnum, site, aos_time)
+) WITHOUT ROWID;
+"""
+
+
+def timing_shift(old, new, unix):
+    """Estimated timing change, in seconds, at each time in ``unix`` between two Satrecs.
+
+    The position change divided by the orbital speed is the along-track
+    timing error, which is about how far a culmination moves. It is only a
+    heuristic for AOS and LOS: on low passes a cross-track change moves them
+    much further.
+    """
+    days = np.asarray(unix, float) / DAY_S
+    jd = np.floor(days) + UNIX_EPOCH_JD
+    fraction = days - np.floor(days)
+    _, r_old, v_old = old.sgp4_array(jd, fraction)
+    _, r_new, _ = new.sgp4_array(jd, fraction)
+    return np.linalg.norm(r_new - r_old, axis=1) / np.linalg.norm(v_old, axis=1)
+
+
+# === Rolling Schedule ===
+class PassSchedule:
+    """Persistent rolling pass schedule per (satellite, site), updated incrementally.
+
+    Every pass remembers the TLE epoch it was computed from. A new TLE only
+    re-refines the passes it moves by more than the tolerance, each around
+    its old AOS/LOS, and as time advances only the tail of the horizon is swept.
+    A grazing pass that only the new TLE lifts above the horizon is not
+    searched for, except in the swept tail.
+    """
+
+    def __init__(self, path=SCHEDULE_FILE, horizon_days=HORIZON_DAYS, tolerance_s=TOLERANCE_SECONDS,
+                 min_elevation=0.0, ts=None):
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+        self.horizon_days = horizon_days
+        self.tolerance_s = tolerance_s
+        self.min_elevation = min_elevation
+        self.ts = ts or load.timescale()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    # === Update ===
+    def update(self, tle, site, now=None):
+        """Bring one (satellite, site) schedule up to date; returns what was done."""
+        name, line1, line2 = parse_tle_lines(tle)[0]
+        satrec = Satrec.twoline2rv(line1, line2)
+        epoch = satrec.jdsatepoch + satrec.jdsatepochF
+        key = (satrec.satnum, site.name)
+        now = time.time() if now is None else now
+        end = now + self.horizon_days * DAY_S
+        stats = {'pruned': 0, 'kept': 0, 'refined': 0, 'added': 0, 'swept_days': 0.0}
+
+        with self.connection:
+            stats['pruned'] = self.connection.execute(
+                'DELETE FROM pass WHERE satnum = ? AND site = ? AND los_time < ?', (*key, now)).rowcount
+            row = self.connection.execute(
+                'SELECT line1, line2, swept_until FROM coverage WHERE satnum = ? AND site = ?', key).fetchone()
+            sweep_from = now - OVERLAP_MINUTES * 60
+            if row is not None:
+                sweep_from = max(sweep_from, row[2] - OVERLAP_MINUTES * 60)
+                if (row[0], row[1]) != (line1, line2):
+                    stats['refined'] = self._apply_new_tle(key, name, line1, line2, site,
+                                                           Satrec.twoline2rv(row[0], row[1]), satrec, epoch, now)
+                elif row[2] >= end - EXTEND_MINUTES * 60:
+                    # Steady state: same TLE and the tail is still close enough to the horizon
+                    stats['kept'] = self._count(key)
+                    return stats
+
+            stats['added'] = self._sweep(key, name, line1, line2, site, epoch, sweep_from, end, now)
+            stats['swept_days'] = float(end - sweep_from) / DAY_S
+            stats['kept'] = self._count(key) - stats['added'] - stats['refined']
+            self.connection.execute('INSERT OR REPLACE INTO coverage VALUES (?, ?, ?, ?, ?, ?)',
+                                    (*key, name, line1, line2, end))
+        return stats
+
+    def update_all(self, entries, sites, now=None):
+        # One call per refresh cycle, e.g. with TLEStore.latest_all()
+        now = time.time() if now is None else now
+        totals = {}
+        for tle in entries:
+            for site in sites:
+                for stat, value in self.update(tle, site, now).items():
+                    totals[stat] = totals.get(stat, 0) + value
+        return totals
+
+    def _apply_new_tle(self, key, name, line1, line2, site, old, new, epoch, now):
+        # Restamp the passes the new TLE leaves in place and re-refine the moved ones; returns how many
+        aos, tca, los = np.array(self.connection.execute(
+            'SELECT aos_time, max_time, los_time FROM pass WHERE satnum = ? AND site = ? ORDER BY aos_time', key
+        ).fetchall()).reshape(-1, 3).T
+        shift = timing_shift(old, new, tca)
+        moved = shift > self.tolerance_s
+        self.connection.execute('UPDATE pass SET tle_epoch_jd = ? WHERE satnum = ? AND site = ?', (epoch, *key))
+        if not np.any(moved):
+            return 0
+        self.connection.executemany('DELETE FROM pass WHERE satnum = ? AND site = ? AND aos_time = ?',
+                                    [(*key, t) for t in aos[moved].tolist()])
+        data = self._refine(name, line1, line2, site, aos[moved], los[moved], shift[moved])
+        data = data[data['los_time'] >= now]
+        self._insert(key, epoch, data)
+        return len(data)
+
+    def _refine(self, name, line1, line2, site, aos, los, shift):
+        # The passes culminating inside each old [AOS, LOS], padded by REFINE_PAD_SHIFTS timing shifts, on a
+        # coarse grid reaching two steps further so the new AOS/LOS stay bracketed
+        satellite, observer = self._geometry(name, line1, line2, site)
+        step = coarse_step_days(satellite)
+        pad = REFINE_PAD_SHIFTS * shift / DAY_S
+        lo, hi = unix_times(self.ts, aos).tt - pad, unix_times(self.ts, los).tt + pad
+        jd, segment = segment_grid(lo - 2 * step, hi + 2 * step, step)
+        owned = (jd >= lo[segment]) & (jd <= hi[segment])
+        found = chunk_passes(look_function(satellite, observer, self.ts), jd, elevation_mask(self.min_elevation, None),
+                             owned, segment=segment)
+        if not found:
+            return np.zeros(0, PASS_DTYPE)
+        new_aos, new_tca, new_los, _ = (np.array(column) for column in zip(*found))
+        # Padded windows of close passes can overlap; a pass found in both is kept once
+        order = np.argsort(new_aos)
+        new_aos, new_tca, new_los = new_aos[order], new_tca[order], new_los[order]
+        first = np.r_[True, new_aos[1:] > np.maximum.accumulate(new_los)[:-1]]
+        return table_part(satellite - observer, self.ts, new_aos[first], new_tca[first], new_los[first])
+
+    def _geometry(self, name, line1, line2, site):
+        satellite = EarthSatellite(line1, line2, name, self.ts)
+        observer = Topos(latitude_degrees=site.latitude, longitude_degrees=site.longitude,
+                         elevation_m=site.elevation_m)
+        return satellite, observer
+
+    def _sweep(self, key, name, line1, line2, site, epoch, start, end, now):
+        if end <= start:
+            return 0
+        satellite, observer = self._geometry(name, line1, line2, site)
+        table = find_pass_table(satellite, observer, unix_times(self.ts, start), (end - start) / DAY_S,
+                                self.min_elevation)
+        # Passes already stored end before the overlap's duplicates do
+        last_los = self.connection.execute(
+            'SELECT MAX(los_time) FROM pass WHERE satnum = ? AND site = ?', key).fetchone()[0]
+        data = table.data[(table.data['aos_time'] > (last_los or -np.inf)) & (table.data['los_time'] >= now)]
+        self._insert(key, epoch, data)
+        return len(data)
+
+    def _insert(self, key, epoch, data):
+        self.connection.executemany(
+            f'INSERT OR REPLACE INTO pass VALUES (?, ?, ?, {", ".join("?" * len(FIELDS))})',
+            [(*key, epoch, *values) for values in data[list(FIELDS)].tolist()])
+
+    def _count(self, key):
+        return self.connection.execute('SELECT COUNT(*) FROM pass WHERE satnum = ? AND site = ?', key).fetchone()[0]
+
+    # === Query ===
+    def passes(self, start=None, end=None):
+        """Stored passes with AOS in [start, end) (Unix seconds) as a PassTable sorted by AOS."""
+        rows = self.connection.execute(
+            f'SELECT c.name, p.site, {", ".join(f"p.{field}" for field in FIELDS)} FROM pass AS p '
+            'JOIN coverage AS c USING (satnum, site) WHERE p.aos_time >= ? AND p.aos_time < ? ORDER BY p.aos_time',
+            (-np.inf if start is None else start, np.inf if end is None else end)).fetchall()
+        data = np.zeros(len(rows), PASS_DTYPE)
+        if not rows:
+            return PassTable(data)
+        names, sites, *columns = zip(*rows)
+        satellites, data['satellite'] = np.unique(names, return_inverse=True)
+        site_names, data['site'] = np.unique(sites, return_inverse=True)
+        for field, column in zip(FIELDS, columns):
+            data[field] = column
+        return PassTable(data, satellites, site_names)
+
+    def tle_epochs(self):
+        # How many stored passes come from each TLE epoch, per object
+        return self.connection.execute(
+            'SELECT satnum, tle_epoch_jd, COUNT(*) FROM pass GROUP BY satnum, tle_epoch_jd ORDER BY satnum').fetchall()
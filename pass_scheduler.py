@@ -0,0 +1,73 @@
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import os
+import time
+
+from skyfield.api import load, Topos, EarthSatellite
+
+from pass_finder import find_passes
+
+# === Configurations ===
+CHUNK_SIZE = 8               # (satellite, site) work units sent to a worker at once
+
+Site = namedtuple('Site', 'name latitude longitude elevation_m')
+
+# One timescale per worker process, loaded by the pool initializer
+_ts = None
+
+
+def _init_worker():
+    global _ts
+    _ts = load.timescale()
+
+
+# === Worker ===
+def _run_chunk(units, t0_tt, days, min_elevation):
+    start = time.perf_counter()
+    passes = []
+    for (name, line1, line2), site in units:
+        satellite = EarthSatellite(line1, line2, name, _ts)
+        observer = Topos(latitude_degrees=site.latitude, longitude_degrees=site.longitude,
+                         elevation_m=site.elevation_m)
+        for p in find_passes(satellite, observer, _ts.tt_jd(t0_tt), days, min_elevation):
+            p['satellite'] = name
+            p['site'] = site.name
+            passes.append(p)
+    return os.getpid(), len(units), passes, time.perf_counter() - start
+
+
+# === Scheduler ===
+def schedule_passes(satellites, sites, t0, days, min_elevation=0.0, max_workers=None, chunk_size=CHUNK_SIZE):
+    """Passes of every (satellite, site) pair, fanned out over a process pool.
+
+    ``satellites`` are (name, line1, line2) tuples; ``sites`` are Site tuples.
+    Returns the passes sorted by AOS and the per-worker statistics.
+    """
+    units = [(satellite, site) for satellite in satellites for site in sites]
+    chunks = [units[i:i + chunk_size] for i in range(0, len(units), chunk_size)]
+
+    passes = []
+    workers = {}
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker) as pool:
+        futures = [pool.submit(_run_chunk, chunk, t0.tt, days, min_elevation) for chunk in chunks]
+        for future in as_completed(futures):
+            pid, n_units, chunk_passes, busy = future.result()
+            stats = workers.setdefault(pid, {'units': 0, 'passes': 0, 'busy_s': 0.0})
+            stats['units'] += n_units
+            stats['passes'] += len(chunk_passes)
+            stats['busy_s'] += busy
+            passes.extend(chunk_passes)
+
+    passes.sort(key=lambda p: p['aos_time'])
+    return passes, workers
+
+
+def print_worker_stats(workers, wall_s):
+    print(f"{'WORKER':<10} {'UNITS':<8} {'PASSES':<8} {'BUSY s':<8} {'UNITS/s':<9} {'PASSES/s':<9}")
+    print("=" * 56)
+    for pid, stats in sorted(workers.items()):
+        busy = stats['busy_s'] or float('nan')
+        print(f"{pid:<10} {stats['units']:<8} {stats['passes']:<8} {stats['busy_s']:<8.2f} "
+              f"{stats['units'] / busy:<9.1f} {stats['passes'] / busy:<9.1f}")
+    total_passes = sum(stats['passes'] for stats in workers.values())
+    print(f"Total: {total_passes} passes in {wall_s:.2f} s wall ({total_passes / wall_s:.1f} passes/s)")
@@ -0,0 +1,221 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+import bisect
+import json
+import os
+import socketserver
+import sys
+import threading
+import time
+
+import numpy as np
+
+# === Configurations ===
+SERVICE_ADDRESS = '127.0.0.1:8765'   # or a path, for a Unix socket
+SCHEDULE_FILE = 'pass_service.sqlite'
+REFRESH_SECONDS = 600
+MAX_RESULTS = 10_000                 # per response
+
+
+# === Interval Index ===
+class PassIndex:
+    """A PassTable sorted by AOS, answering overlap and next-N queries in O(log n + k).
+
+    A pass overlapping [start, end) must rise before ``end`` and after
+    ``start`` minus the longest pass, so one slice holds every candidate;
+    for a single satellite at most one of them ends before ``start``. The
+    binary searches use ``bisect`` on a list of AOS times, which beats
+    np.searchsorted for one scalar, and every row is kept pre-rendered as a
+    JSON line so answering costs a join instead of a formatting pass.
+    """
+
+    def __init__(self, table, lines=None):
+        order = np.argsort(table.data['aos_time'], kind='stable')
+        self.table = table[order]
+        data = self.table.data
+        self.los = np.ascontiguousarray(data['los_time'])
+        self.longest = float((self.los - data['aos_time']).max()) if len(data) else 0.0
+        self._aos = data['aos_time'].tolist()
+        if lines is None:
+            self.lines = b''.join(self.table.jsonl_chunks()).splitlines(keepends=True)
+        else:
+            self.lines = [lines[i] for i in order]
+
+    def __len__(self):
+        return len(self._aos)
+
+    def overlapping(self, start, end):
+        # Row numbers, in AOS order
+        lo = bisect.bisect_right(self._aos, start - self.longest)
+        hi = bisect.bisect_left(self._aos, end)
+        return lo + np.flatnonzero(self.los[lo:hi] > start)
+
+    def next(self, after, count):
+        # The first ``count`` passes not over yet at ``after``, the ones in progress included
+        lo = bisect.bisect_right(self._aos, after - self.longest)
+        hi = bisect.bisect_left(self._aos, after) + count
+        return (lo + np.flatnonzero(self.los[lo:hi] > after))[:count]
+
+    def result(self, rows, jsonl=False):
+        return b''.join([self.lines[i] for i in rows]) if jsonl else self.table[rows]
+
+
+# === Service ===
+class PassService:
+    """Pass indexes per site and per (site, satellite), refreshed from a PassSchedule in the background.
+
+    Each refresh builds a complete new set of indexes and swaps it in with one
+    assignment, so queries never wait for a refresh and never see half of one.
+    """
+
+    def __init__(self, sites=(), entries=None, schedule_path=SCHEDULE_FILE, refresh_s=REFRESH_SECONDS,
+                 min_elevation=0.0, ts=None):
+        self.sites = list(sites)
+        self.entries = entries           # callable returning (name, line1, line2) tuples
+        self.schedule_path = schedule_path
+        self.refresh_s = refresh_s
+        self.min_elevation = min_elevation
+        self.ts = ts
+        self.refreshed_at = None
+        self.refresh_s_last = None
+        self._indexes = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def load(self, table):
+        """Index a PassTable (all its sites and satellites) and make it the live data."""
+        indexes = {}
+        for code, site in enumerate(table.sites):
+            at_site = PassIndex(table[table.data['site'] == code])
+            indexes[(str(site), None)] = at_site
+            satellite_codes = at_site.table.data['satellite']
+            for satellite in np.unique(satellite_codes):
+                rows = np.flatnonzero(satellite_codes == satellite)
+                indexes[(str(site), str(table.satellites[satellite]))] = PassIndex(
+                    at_site.table[rows], [at_site.lines[i] for i in rows])
+        self._indexes = indexes
+        self.refreshed_at = time.time()
+
+    def refresh(self, now=None):
+        # Bring the schedule up to date, then index everything it holds
+        from pass_schedule import PassSchedule
+        start = time.perf_counter()
+        with PassSchedule(self.schedule_path, min_elevation=self.min_elevation, ts=self.ts) as schedule:
+            if self.ts is None:
+                self.ts = schedule.ts
+            schedule.update_all(self.entries(), self.sites, now)
+            self.load(schedule.passes())
+        self.refresh_s_last = time.perf_counter() - start
+
+    def start(self):
+        """First refresh in the calling thread, then one every ``refresh_s`` in a daemon thread."""
+        self.refresh()
+        self._thread = threading.Thread(target=self._refresh_loop, name='pass-refresh', daemon=True)
+        self._thread.start()
+
+    def _refresh_loop(self):
+        while not self._stop.wait(self.refresh_s):
+            try:
+                self.refresh()
+            except Exception as error:
+                # Keep serving the previous indexes
+                print(f"Pass refresh failed: {error!r}", file=sys.stderr)
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    # === Queries ===
+    def _index(self, site, satellite):
+        index = self._indexes.get((site, satellite))
+        if index is None:
+            raise LookupError(f"no passes for site {site!r}"
+                              + (f" and satellite {satellite!r}" if satellite else ""))
+        return index
+
+    def overlapping(self, site, start, end, satellite=None, jsonl=False, limit=None):
+        """Passes at ``site`` overlapping [start, end) (Unix seconds), sorted by AOS.
+
+        A PassTable, or with ``jsonl=True`` the bytes of its to_jsonl() rows.
+        """
+        index = self._index(site, satellite)
+        return index.result(index.overlapping(start, end)[:limit], jsonl)
+
+    def next(self, site, after, count, satellite=None, jsonl=False):
+        """The first ``count`` passes at ``site`` not over yet at ``after``, like overlapping()."""
+        if count < 1:
+            raise ValueError(f"count must be at least 1, not {count}")
+        index = self._index(site, satellite)
+        return index.result(index.next(after, count), jsonl)
+
+    def status(self):
+        indexes = self._indexes
+        return {'refreshed_at': self.refreshed_at, 'refresh_s': self.refresh_s_last,
+                'sites': {site: len(index) for (site, satellite), index in indexes.items() if satellite is None},
+                'satellites': len({satellite for _, satellite in indexes if satellite is not None})}
+
+
+# === HTTP Front End ===
+class _Handler(BaseHTTPRequestHandler):
+    """GET /passes?site=&start=&end=[&satellite=], /next?site=[&after=][&count=][&satellite=], /status.
+
+    Times are Unix seconds; passes come back as JSON lines (PassTable.to_jsonl rows).
+    """
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        service = self.server.service
+        try:
+            if url.path == '/status':
+                return self._send(200, json.dumps(service.status()).encode(), 'application/json')
+            if url.path == '/passes':
+                body = service.overlapping(query['site'], float(query['start']), float(query['end']),
+                                           query.get('satellite'), jsonl=True, limit=MAX_RESULTS)
+            elif url.path == '/next':
+                count = min(int(query.get('count', 10)), MAX_RESULTS)
+                body = service.next(query['site'], float(query.get('after', time.time())), count,
+                                    query.get('satellite'), jsonl=True)
+            else:
+                return self._send(404, b'unknown path\n')
+        except KeyError as error:
+            return self._send(400, f"missing parameter {error}\n".encode())
+        except LookupError as error:
+            return self._send(404, f"{error}\n".encode())
+        except ValueError as error:
+            return self._send(400, f"{error}\n".encode())
+        self._send(200, body, 'application/x-ndjson')
+
+    def _send(self, status, body, content_type='text/plain'):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _TCPHandler(_Handler):
+    # Headers and body go out in two writes; without this, Nagle holds the body back a delayed ACK
+    disable_nagle_algorithm = True
+
+
+class _UnixHTTPServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+def make_server(service, address=SERVICE_ADDRESS):
+    """A threaded HTTP server for ``service`` on 'host:port', or on a Unix socket at any other address."""
+    host, _, port = address.rpartition(':')
+    if port.isdigit():
+        server = ThreadingHTTPServer((host, int(port)), _TCPHandler)
+    else:
+        if os.path.exists(address):
+            os.remove(address)
+        server = _UnixHTTPServer(address, _Handler)
+    server.service = service
+    return server
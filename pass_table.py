@@ -0,0 +1,313 @@
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+import json
+
+import numpy as np
+
+from pass_finder import EVENTS, coarse_step_days, elevation_mask, look_function, sweep_passes
+from stage_profiler import timed
+from tle_catalog import sgp4_dates
+
+# === Configurations ===
+EXPORT_CHUNK_ROWS = 65536    # rows turned into text at once by the CSV / JSON lines writers
+ANGLE_DECIMALS = 3
+RANGE_DECIMALS = 3
+
+UNIX_EPOCH_JD = 2440587.5
+DAY_S = 86400.0
+TIME_FIELDS = ('aos_time', 'max_time', 'los_time')
+LOOK_FIELDS = tuple(f'{event}_{column}' for event in EVENTS for column in ('altitude', 'azimuth', 'range_km'))
+ROW_FIELDS = ('satellite', 'site', 'duration')    # computed by PassRow on top of the PASS_DTYPE fields
+
+# One row per pass: times as float64 Unix seconds (UTC), look angles as float32,
+# and the satellite and site as codes into the table's name arrays.
+PASS_DTYPE = np.dtype([('satellite', '<u4'), ('site', '<u2')]
+                      + [(name, '<f8') for name in TIME_FIELDS]
+                      + [(name, '<f4') for name in LOOK_FIELDS])
+
+
+def jd_to_unix(t):
+    # Unix seconds (UTC) of a Skyfield Time array, without building datetimes
+    whole, fraction = sgp4_dates(t)
+    return (whole - UNIX_EPOCH_JD) * DAY_S + fraction * DAY_S
+
+
+# === Pass Table ===
+class PassRow:
+    """A view of one row; reads like the pass dicts, with datetimes for the *_time fields."""
+    __slots__ = ('table', 'index')
+
+    def __init__(self, table, index):
+        self.table = table
+        self.index = index
+
+    def __getitem__(self, name):
+        table, i = self.table, self.index
+        if name == 'satellite':
+            return str(table.satellites[table.data['satellite'][i]])
+        if name == 'site':
+            return str(table.sites[table.data['site'][i]])
+        if name == 'duration':
+            return int(table.data['los_time'][i] - table.data['aos_time'][i])
+        if name in TIME_FIELDS:
+            return datetime.fromtimestamp(table.data[name][i], timezone.utc)
+        return float(table.data[name][i])
+
+    def __getattr__(self, name):
+        # Only the pass fields read as attributes; dunders and anything else are missing attributes
+        if name.startswith('__') or (name not in ROW_FIELDS and name not in PASS_DTYPE.names):
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        return self[name]
+
+    def __repr__(self):
+        return f"PassRow({self['satellite']!r}, {self['site']!r}, {self['aos_time']:%Y-%m-%d %H:%M:%S})"
+
+
+class PassTable:
+    """Passes as one NumPy structured array (PASS_DTYPE) plus satellite and site name arrays."""
+
+    def __init__(self, data, satellites=('',), sites=('',)):
+        self.data = data
+        self.satellites = np.asarray(satellites, dtype=str)
+        self.sites = np.asarray(sites, dtype=str)
+
+    @classmethod
+    def empty(cls, satellites=('',), sites=('',)):
+        return cls(np.zeros(0, PASS_DTYPE), satellites, sites)
+
+    @classmethod
+    def from_records(cls, passes):
+        # From pass dicts (pass_finder, or pass_scheduler with 'satellite' and 'site' keys)
+        satellites, satellite_codes = np.unique([p.get('satellite', '') for p in passes], return_inverse=True)
+        sites, site_codes = np.unique([p.get('site', '') for p in passes], return_inverse=True)
+        data = np.zeros(len(passes), PASS_DTYPE)
+        data['satellite'] = satellite_codes
+        data['site'] = site_codes
+        for name in TIME_FIELDS:
+            data[name] = [p[name].timestamp() for p in passes]
+        for name in LOOK_FIELDS:
+            data[name] = [p[name] for p in passes]
+        return cls(data, satellites, sites)
+
+    @classmethod
+    def concatenate(cls, tables):
+        satellites = np.unique(np.concatenate([table.satellites for table in tables]))
+        sites = np.unique(np.concatenate([table.sites for table in tables]))
+        parts = []
+        for table in tables:
+            part = table.data.copy()
+            part['satellite'] = np.searchsorted(satellites, table.satellites)[part['satellite']]
+            part['site'] = np.searchsorted(sites, table.sites)[part['site']]
+            parts.append(part)
+        data = np.concatenate(parts) if parts else np.zeros(0, PASS_DTYPE)
+        return cls(data, satellites, sites)
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            index = int(key)
+            if not -len(self.data) <= index < len(self.data):
+                raise IndexError(f"pass index {index} out of range for a table of {len(self.data)}")
+            return PassRow(self, index + len(self.data) if index < 0 else index)
+        return PassTable(self.data[key], self.satellites, self.sites)
+
+    def __iter__(self):
+        return (PassRow(self, i) for i in range(len(self.data)))
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes
+
+    @property
+    def duration(self):
+        return self.data['los_time'] - self.data['aos_time']
+
+    def sort(self, field='aos_time'):
+        return self[np.argsort(self.data[field], kind='stable')]
+
+    def local_times(self, field, tz):
+        return local_datetime64(self.data[field], tz)
+
+    @timed('rendering')
+    def format_times(self, field, tz, fmt='%d.%m.%Y %H:%M:%S'):
+        return format_datetime64(self.local_times(field, tz), fmt)
+
+    # === Export ===
+    def to_csv(self, path):
+        header = ','.join(('satellite', 'site', *TIME_FIELDS, 'duration', *LOOK_FIELDS)) + '\n'
+        satellites, sites = _text_column(self.satellites, True), _text_column(self.sites, True)
+        with open(path, 'wb') as file:
+            file.write(header.encode())
+            for data in _chunks(self.data):
+                parts = [satellites[data['satellite']], b',', sites[data['site']]]
+                for name in TIME_FIELDS:
+                    parts += [b',', _iso_column(data[name]), b'Z']
+                parts += [b',', _fixed_point(data['los_time'] - data['aos_time'], 0)]
+                for name in LOOK_FIELDS:
+                    parts += [b',', _fixed_point(data[name], _decimals(name))]
+                file.write(_join(parts + [b'\n']))
+
+    def to_jsonl(self, path):
+        with open(path, 'wb') as file:
+            for chunk in self.jsonl_chunks():
+                file.write(chunk)
+
+    def jsonl_chunks(self):
+        # One bytes object of JSON lines per EXPORT_CHUNK_ROWS rows
+        satellites, sites = _text_column(self.satellites, True), _text_column(self.sites, True)
+        for data in _chunks(self.data):
+            parts = [b'{"satellite":', satellites[data['satellite']], b',"site":', sites[data['site']]]
+            for name in TIME_FIELDS:
+                parts += [f',"{name}":"'.encode(), _iso_column(data[name]), b'Z"']
+            parts += [b',"duration":', _fixed_point(data['los_time'] - data['aos_time'], 0)]
+            for name in LOOK_FIELDS:
+                parts += [f',"{name}":'.encode(), _fixed_point(data[name], _decimals(name))]
+            yield _join(parts + [b'}\n'])
+
+    def to_arrow(self):
+        import pyarrow as pa
+        columns = {
+            'satellite': pa.DictionaryArray.from_arrays(self.data['satellite'].astype(np.int32), self.satellites),
+            'site': pa.DictionaryArray.from_arrays(self.data['site'].astype(np.int32), self.sites),
+        }
+        for name in TIME_FIELDS:
+            millis = np.floor(self.data[name] * 1000).astype(np.int64)
+            columns[name] = pa.array(millis, type=pa.timestamp('ms', tz='UTC'))
+        for name in LOOK_FIELDS:
+            columns[name] = pa.array(np.ascontiguousarray(self.data[name]))
+        return pa.table(columns)
+
+    def to_parquet(self, path):
+        import pyarrow.parquet as pq
+        pq.write_table(self.to_arrow(), path)
+
+
+def find_pass_table(satellite, observer, t0, days, min_elevation=0.0, site_name='', mask=None):
+    """find_passes() straight into a PassTable: one ``.at()`` call per sweep chunk, no per-pass dicts."""
+    ts = t0.ts
+    difference = satellite - observer
+    look_at = look_function(satellite, observer, ts)
+    horizon = elevation_mask(min_elevation, mask)
+    parts = []
+    for aos, tca, los in sweep_passes(look_at, coarse_step_days(satellite), t0.tt, days, horizon):
+        parts.append(table_part(difference, ts, aos, tca, los))
+    data = np.concatenate(parts) if parts else np.zeros(0, PASS_DTYPE)
+    return PassTable(data, [satellite.name or ''], [site_name])
+
+
+@timed('enrichment')
+def table_part(difference, ts, aos, tca, los):
+    """PASS_DTYPE rows for passes at the TT Julian dates ``aos``, ``tca`` and ``los``."""
+    t = ts.tt_jd(np.concatenate((aos, tca, los)))
+    alt, az, distance = difference.at(t).altaz()
+    unix = jd_to_unix(t).reshape(3, -1)
+    part = np.zeros(aos.size, PASS_DTYPE)
+    for e, event in enumerate(EVENTS):
+        part[TIME_FIELDS[e]] = unix[e]
+        part[f'{event}_altitude'] = alt.degrees.reshape(3, -1)[e]
+        part[f'{event}_azimuth'] = az.degrees.reshape(3, -1)[e]
+        part[f'{event}_range_km'] = distance.km.reshape(3, -1)[e]
+    return part
+
+
+# === Bulk Time Zones and Formatting ===
+def _utc_offset(tz, unix):
+    return datetime.fromtimestamp(unix, tz).utcoffset().total_seconds()
+
+
+def local_datetime64(unix, tz):
+    """Local wall-clock datetime64[ms] for an array of Unix seconds.
+
+    The UTC offset is looked up once per distinct day, and per row only on
+    the few days where it changes (DST transitions).
+    """
+    tz = ZoneInfo(tz) if isinstance(tz, str) else tz
+    unix = np.asarray(unix, float)
+    days, inverse = np.unique(np.floor(unix / DAY_S), return_inverse=True)
+    start = np.array([_utc_offset(tz, day * DAY_S) for day in days])
+    end = np.array([_utc_offset(tz, (day + 1) * DAY_S - 1) for day in days])
+    offset = start[inverse]
+    changing = (start != end)[inverse]
+    offset[changing] = [_utc_offset(tz, u) for u in unix[changing]]
+    return np.floor((unix + offset) * 1000).astype(np.int64).astype('datetime64[ms]')
+
+
+# strftime codes -> character positions in 'YYYY-MM-DDTHH:MM:SS.mmm'
+_ISO_SLICES = {'Y': slice(0, 4), 'm': slice(5, 7), 'd': slice(8, 10), 'H': slice(11, 13), 'M': slice(14, 16),
+               'S': slice(17, 19), 'f': slice(20, 23)}
+
+
+def format_datetime64(times, fmt):
+    """strftime-style formatting (%Y %m %d %H %M %S %f, milliseconds) of a whole datetime64 array at once."""
+    iso = _bytes_2d(np.datetime_as_string(times.astype('datetime64[ms]'), unit='ms').astype('S23'))
+    parts = []
+    i = 0
+    while i < len(fmt):
+        if fmt[i] == '%' and i + 1 < len(fmt) and fmt[i + 1] in _ISO_SLICES:
+            parts.append(iso[:, _ISO_SLICES[fmt[i + 1]]])
+            i += 2
+        else:
+            parts.append(fmt[i].encode())
+            i += 1
+    width = sum(part.shape[1] if isinstance(part, np.ndarray) else len(part) for part in parts)
+    return np.frombuffer(_join(parts), f'S{width}').astype(f'U{width}')
+
+
+# === Vectorized Text Assembly ===
+# Every column becomes a (rows, width) uint8 array of ASCII, left-padded with
+# NUL bytes; columns are stacked side by side and the NULs dropped at the end,
+# so no Python object is created per row.
+def _bytes_2d(strings):
+    strings = np.ascontiguousarray(strings)
+    return strings.view(np.uint8).reshape(len(strings), strings.dtype.itemsize)
+
+
+def _text_column(names, quoted):
+    # Name arrays are small (one entry per satellite or site), so they can go through json
+    encoded = [(json.dumps(str(name)) if quoted else str(name)).encode() for name in names]
+    return _bytes_2d(np.array(encoded or [b''], dtype='S'))
+
+
+def _iso_column(unix):
+    # 'YYYY-MM-DDTHH:MM:SS.mmm'; callers append the 'Z'
+    millis = np.floor(np.asarray(unix) * 1000).astype(np.int64).astype('datetime64[ms]')
+    return _bytes_2d(np.datetime_as_string(millis, unit='ms').astype('S23'))
+
+
+def _fixed_point(values, decimals):
+    values = np.asarray(values, float)
+    scaled = np.rint(np.abs(values) * 10.0 ** decimals).astype(np.int64)
+    digits = max(len(str(int(scaled.max(initial=0)))), decimals + 1)
+    powers = 10 ** np.arange(digits, dtype=np.int64)
+    length = np.maximum(np.searchsorted(powers, scaled, side='right'), decimals + 1)
+    point = 1 if decimals else 0
+    width = 1 + digits + point
+    chars = np.zeros((values.size, width), np.uint8)
+    for k in range(digits):
+        column = width - 1 - k - (point if k >= decimals else 0)
+        chars[:, column] = np.where(k < length, 48 + (scaled // powers[k]) % 10, 0)
+    if decimals:
+        chars[:, width - 1 - decimals] = ord('.')
+    negative = (values < 0) & (scaled > 0)
+    sign = width - 1 - length - point
+    chars[negative, sign[negative]] = ord('-')
+    return chars
+
+
+def _join(parts):
+    rows = next(part.shape[0] for part in parts if isinstance(part, np.ndarray))
+    columns = [part if isinstance(part, np.ndarray)
+               else np.broadcast_to(np.frombuffer(part, np.uint8), (rows, len(part))) for part in parts]
+    text = np.concatenate(columns, axis=1).ravel()
+    return text[text != 0].tobytes()
+
+
+def _decimals(name):
+    return RANGE_DECIMALS if name.endswith('range_km') else ANGLE_DECIMALS
+
+
+def _chunks(data):
+    for first in range(0, len(data), EXPORT_CHUNK_ROWS):
+        yield data[first:first + EXPORT_CHUNK_ROWS]
@@ -0,0 +1,135 @@
+import numpy as np
+from sgp4.api import Satrec, SatrecArray
+from skyfield.api import load, Topos, EarthSatellite
+from skyfield.sgp4lib import theta_GMST1982
+
+from pass_finder import look_function
+from tle_catalog import enu_matrix, observer_itrf_km, parse_tle_lines, rotate_teme, sgp4_dates
+
+# === Backend Contract ===
+# Every backend is built from one TLE (name, line1, line2) and a Site, and
+# answers positions(jd): the topocentric east/north/up vector in km of the
+# satellite at each TT Julian date of the array ``jd``, shaped (N, 3).
+# Look angles, the altitude/azimuth sweep of the pass finder and the tracker knots
+# are all derived from that one call.
+
+PYEPHEM_EPOCH_JD = 2415020.0     # ephem.Date zero, 1899-12-31 12:00 UT
+UNIX_EPOCH_JD = 2440587.5
+DAY_S = 86400.0
+
+
+class Propagator:
+    backend = None
+
+    def __init__(self, tle, site, ts=None):
+        self.name, self.line1, self.line2 = parse_tle_lines(tle)[0]
+        self.site = site
+        self.ts = ts or load.timescale()
+        # ``model`` makes every backend look like an EarthSatellite to coarse_step_days()
+        self.model = Satrec.twoline2rv(self.line1, self.line2)
+        # TT - UTC at the TLE epoch; no element set stays useful across a leap second anyway
+        epoch_utc = self.model.jdsatepoch + self.model.jdsatepochF
+        whole, fraction = sgp4_dates(self.ts.tt_jd(epoch_utc))
+        self._tt_minus_utc = epoch_utc - float(whole[0] + fraction[0])
+        self.epoch = self.ts.tt_jd(epoch_utc + self._tt_minus_utc)
+
+    def unix_to_jd(self, unix):
+        return np.asarray(unix, float) / DAY_S + UNIX_EPOCH_JD + self._tt_minus_utc
+
+    def positions(self, jd):
+        raise NotImplementedError
+
+    def look_angles(self, jd):
+        """Altitude and azimuth in degrees and range in km at each TT Julian date."""
+        e, n, u = np.moveaxis(self.positions(np.atleast_1d(jd)), -1, 0)
+        horizontal = np.hypot(e, n)
+        return (np.degrees(np.arctan2(u, horizontal)), np.degrees(np.arctan2(e, n)) % 360.0,
+                np.sqrt(horizontal ** 2 + u ** 2))
+
+    def alt_az(self, jd):
+        return self.look_angles(jd)[:2]
+
+
+# === Skyfield ===
+class SkyfieldPropagator(Propagator):
+    backend = 'skyfield'
+
+    def __init__(self, tle, site, ts=None):
+        super().__init__(tle, site, ts)
+        self.satellite = EarthSatellite(self.line1, self.line2, self.name, self.ts)
+        self.observer = Topos(latitude_degrees=site.latitude, longitude_degrees=site.longitude,
+                              elevation_m=site.elevation_m)
+        self._difference = self.satellite - self.observer
+        self._look_at = look_function(self.satellite, self.observer, self.ts)
+
+    def positions(self, jd):
+        alt, az, distance = self._difference.at(self.ts.tt_jd(jd)).altaz()
+        return _enu(alt.radians, az.radians, distance.km)
+
+    def alt_az(self, jd):
+        # The pass finder's shortcut: no Earth rotation needed for the look angles alone
+        return self._look_at(jd)
+
+
+# === Raw SGP4 arrays ===
+class SGP4ArrayPropagator(Propagator):
+    """SatrecArray straight into TEME -> ITRF -> ENU, without building Skyfield objects per call."""
+    backend = 'sgp4'
+
+    def __init__(self, tle, site, ts=None):
+        super().__init__(tle, site, ts)
+        self._satrecs = SatrecArray([self.model])
+        self._dut1 = float(self.epoch.dut1) / DAY_S
+        self._site_itrf = observer_itrf_km(site.latitude, site.longitude, site.elevation_m)
+        self._enu = enu_matrix(site.latitude, site.longitude)
+
+    def positions(self, jd):
+        utc = np.asarray(jd, float) - self._tt_minus_utc
+        whole = np.floor(utc)
+        fraction = utc - whole
+        error, position, _ = self._satrecs.sgp4(whole, fraction)
+        theta, _ = theta_GMST1982(whole, fraction + self._dut1)
+        enu = (rotate_teme(position[0], theta, 0.0) - self._site_itrf) @ self._enu
+        enu[error[0] != 0] = np.nan
+        return enu
+
+
+# === PyEphem ===
+class PyEphemPropagator(Propagator):
+    """One ``compute()`` per time; cheap per call, but a Python loop over the array."""
+    backend = 'pyephem'
+
+    def __init__(self, tle, site, ts=None):
+        import ephem    # only this backend needs PyEphem
+        super().__init__(tle, site, ts)
+        self._body = ephem.readtle(self.name, self.line1, self.line2)
+        self._observer = ephem.Observer()
+        self._observer.lat = str(site.latitude)
+        self._observer.lon = str(site.longitude)
+        self._observer.elev = site.elevation_m
+        self._observer.pressure = 0    # geometric altitude, like the other backends
+        self._offset = self._tt_minus_utc + PYEPHEM_EPOCH_JD
+
+    def positions(self, jd):
+        dates = (np.asarray(jd, float) - self._offset).tolist()
+        angles = np.empty((len(dates), 3))
+        body, observer = self._body, self._observer
+        for i, date in enumerate(dates):
+            observer.date = date
+            body.compute(observer)
+            angles[i] = body.alt, body.az, body.range
+        return _enu(angles[:, 0], angles[:, 1], angles[:, 2] / 1000.0)
+
+
+def _enu(alt, az, distance):
+    horizontal = distance * np.cos(alt)
+    return np.stack((horizontal * np.sin(az), horizontal * np.cos(az), distance * np.sin(alt)), axis=-1)
+
+
+BACKENDS = {cls.backend: cls for cls in (SkyfieldPropagator, SGP4ArrayPropagator, PyEphemPropagator)}
+
+
+def make_propagator(backend, tle, site, ts=None):
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown propagator backend {backend!r}; choose from {', '.join(BACKENDS)}")
+    return BACKENDS[backend](tle, site, ts)
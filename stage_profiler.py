@@ -0,0 +1,166 @@
+from contextlib import contextmanager, nullcontext
+import functools
+import os
+import sys
+import threading
+import time
+
+# === Configurations ===
+PROFILE_ENV = 'PASS_PROFILE'     # "1" or "summary"; add ",trace" and/or ",pstats" for the dumps
+TRACE_FILE = 'pass_profile.trace.json'
+PSTATS_FILE = 'pass_profile.pstats'
+MAX_TRACE_EVENTS = 200_000       # the Chrome trace stops growing after this many spans
+
+STAGES = ('tle load', 'propagation', 'event search', 'refinement', 'enrichment', 'rendering')
+
+_NULL = nullcontext()
+
+
+# === Stage Profiler ===
+class StageProfiler:
+    """Per-stage call counts, inclusive and self time, and item counts.
+
+    Disabled, ``stage()`` hands back one shared null context and ``timed``
+    functions call straight through, so the hooks can stay in the hot path.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.trace = False
+        self.totals = {}         # stage -> [calls, seconds, self seconds, items]
+        self.events = []
+        self._local = threading.local()
+        self._profile = None
+        self._start = time.perf_counter()
+
+    def enable(self, trace=False, pstats=False):
+        self.enabled = True
+        self.trace = trace
+        if pstats and self._profile is None:
+            import cProfile
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+
+    def stage(self, name, items=0):
+        return self._span(name, items) if self.enabled else _NULL
+
+    @contextmanager
+    def _span(self, name, items):
+        stack = self._local.__dict__.setdefault('stack', [])
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            elapsed = end - start
+            children = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            total = self.totals.setdefault(name, [0, 0.0, 0.0, 0])
+            total[0] += 1
+            total[1] += elapsed
+            total[2] += elapsed - children
+            total[3] += items
+            if self.trace and len(self.events) < MAX_TRACE_EVENTS:
+                self.events.append((name, start, elapsed, threading.get_ident(), items))
+
+    # === Output ===
+    def summary(self):
+        if not self.totals:
+            return "No profiled stages"
+        order = sorted(self.totals, key=lambda name: STAGES.index(name) if name in STAGES else len(STAGES))
+        wall = time.perf_counter() - self._start
+        lines = [f"{'STAGE':<14} {'CALLS':>8} {'TOTAL ms':>10} {'SELF ms':>10} {'SELF %':>7} {'ITEMS':>12}",
+                 "=" * 66]
+        for name in order:
+            calls, seconds, self_seconds, items = self.totals[name]
+            lines.append(f"{name:<14} {calls:>8} {seconds * 1000:>10.1f} {self_seconds * 1000:>10.1f} "
+                         f"{self_seconds / wall * 100:>6.1f}% {items:>12,}")
+        lines.append(f"{'wall':<14} {'':>8} {wall * 1000:>10.1f}")
+        return '\n'.join(lines)
+
+    def log_line(self):
+        # One JSON line per run, so per-stage timings can be grepped out of production logs
+        import json
+        return 'pass_profile ' + json.dumps({name: {'calls': calls, 'ms': round(seconds * 1000, 3),
+                                                    'self_ms': round(self_seconds * 1000, 3), 'items': items}
+                                             for name, (calls, seconds, self_seconds, items) in self.totals.items()})
+
+    def write_trace(self, path=TRACE_FILE):
+        """Chrome trace (chrome://tracing, Perfetto) of every recorded span."""
+        import json
+        pid = os.getpid()
+        events = [{'name': name, 'cat': 'pass', 'ph': 'X', 'pid': pid, 'tid': tid,
+                   'ts': (start - self._start) * 1e6, 'dur': elapsed * 1e6, 'args': {'items': items}}
+                  for name, start, elapsed, tid, items in self.events]
+        with open(path, 'w') as file:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, file)
+
+    def write_pstats(self, path=PSTATS_FILE):
+        if self._profile is not None:
+            self._profile.disable()
+            self._profile.dump_stats(path)
+
+    def report(self, file=None):
+        if not self.enabled:
+            return
+        file = file or sys.stderr
+        print("\n--- Stage profile ---", file=file)
+        print(self.summary(), file=file)
+        print(self.log_line(), file=file)
+        if self.trace:
+            self.write_trace()
+            print(f"Chrome trace written to {TRACE_FILE}", file=file)
+        if self._profile is not None:
+            self.write_pstats()
+            print(f"cProfile stats written to {PSTATS_FILE}", file=file)
+
+    def reset(self):
+        self.totals.clear()
+        self.events.clear()
+        self._start = time.perf_counter()
+
+
+profiler = StageProfiler()
+stage = profiler.stage
+
+
+def timed(name):
+    # Decorator form of stage(); checks the switch per call, not at import
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not profiler.enabled:
+                return function(*args, **kwargs)
+            with profiler.stage(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def counted(name, function):
+    # ``function(jd)`` timed with the size of its argument as the item count
+    if not profiler.enabled:
+        return function
+
+    def wrapper(jd):
+        with profiler.stage(name, int(getattr(jd, 'size', 1))):
+            return function(jd)
+    return wrapper
+
+
+def enable_from_env(value=None):
+    """Switch the profiler on from PASS_PROFILE (or ``value``) and report when the process exits."""
+    value = os.environ.get(PROFILE_ENV, '') if value is None else value
+    options = {option.strip() for option in value.lower().split(',') if option.strip()}
+    if not options or options <= {'0', 'off', 'false'}:
+        return False
+    if not profiler.enabled:
+        import atexit
+        atexit.register(profiler.report)
+    profiler.enable(trace='trace' in options, pstats='pstats' in options)
+    return True
+
+
+enable_from_env()
@@ -0,0 +1,234 @@
+import numpy as np
+from sgp4.api import Satrec, SatrecArray, WGS72
+from sgp4.exporter import export_tle
+from skyfield.sgp4lib import EarthSatellite, theta_GMST1982
+
+from stage_profiler import timed
+
+# === Configurations ===
+CHUNK_SATELLITES = 512       # satellites propagated per batched SGP4 call (bounds temporary memory)
+
+# WGS84 ellipsoid for the observer
+EARTH_RADIUS_KM = 6378.137
+EARTH_FLATTENING = 1 / 298.257223563
+DAY_S = 86400.0
+
+
+# === TLE Parsing ===
+def parse_tle_lines(lines):
+    """Return (name, line1, line2) for every element set, with or without a name line."""
+    lines = [line.rstrip() for line in lines if line.strip()]
+    entries = []
+    i = 0
+    while i < len(lines) - 1:
+        if lines[i].startswith('1 ') and lines[i + 1].startswith('2 '):
+            name, line1, line2 = lines[i][2:7].strip(), lines[i], lines[i + 1]
+            i += 2
+        elif i + 2 < len(lines) and lines[i + 1].startswith('1 ') and lines[i + 2].startswith('2 '):
+            name, line1, line2 = lines[i].strip(), lines[i + 1], lines[i + 2]
+            i += 3
+        else:
+            i += 1
+            continue
+        entries.append((name, line1, line2))
+    return entries
+
+
+class TLEStreamParser:
+    """parse_tle_lines() one line at a time, for element sets arriving over the network."""
+
+    def __init__(self):
+        self._pending = []
+
+    def feed(self, line):
+        # Returns (name, line1, line2) once a line completes an element set, else None
+        line = line.rstrip()
+        if not line.strip():
+            return None
+        pending = self._pending
+        pending.append(line)
+        if len(pending) >= 2 and pending[-2].startswith('1 ') and line.startswith('2 '):
+            line1 = pending[-2]
+            name = pending[-3].strip() if len(pending) >= 3 else line1[2:7].strip()
+            pending.clear()
+            return name, line1, line
+        del pending[:-2]
+        return None
+
+
+# === Catalog ===
+class TLECatalog:
+    """Every element set of a TLE file, packed into NumPy arrays for batched SGP4."""
+
+    def __init__(self, names, satrecs, lines):
+        self.names = np.array(names)
+        self.satrecs = list(satrecs)
+        self.lines = lines
+        self.satnum = np.array([s.satnum for s in self.satrecs], dtype=np.int64)
+        self.epoch_jd = np.array([s.jdsatepoch + s.jdsatepochF for s in self.satrecs])
+        self.inclination = np.array([s.inclo for s in self.satrecs])
+        self.raan = np.array([s.nodeo for s in self.satrecs])
+        self.eccentricity = np.array([s.ecco for s in self.satrecs])
+        self.arg_perigee = np.array([s.argpo for s in self.satrecs])
+        self.mean_anomaly = np.array([s.mo for s in self.satrecs])
+        self.mean_motion = np.array([s.no_kozai for s in self.satrecs])    # radians per minute
+        self.bstar = np.array([s.bstar for s in self.satrecs])
+
+    @classmethod
+    @timed('tle load')
+    def from_lines(cls, lines):
+        entries = parse_tle_lines(lines)
+        satrecs = [Satrec.twoline2rv(line1, line2) for _, line1, line2 in entries]
+        return cls([name for name, _, _ in entries], satrecs, [(l1, l2) for _, l1, l2 in entries])
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path) as file:
+            return cls.from_lines(file.readlines())
+
+    @classmethod
+    def from_elements(cls, names, satnum, epoch_jd, bstar, eccentricity, arg_perigee, inclination,
+                      mean_anomaly, mean_motion, raan):
+        # Angles in radians, mean motion in radians per minute (SGP4 units)
+        satrecs = []
+        for i in range(len(names)):
+            satrec = Satrec()
+            satrec.sgp4init(WGS72, 'i', int(satnum[i]), epoch_jd[i] - 2433281.5, bstar[i], 0.0, 0.0,
+                            eccentricity[i], arg_perigee[i], inclination[i], mean_anomaly[i],
+                            mean_motion[i], raan[i])
+            satrecs.append(satrec)
+        return cls(names, satrecs, [export_tle(satrec) for satrec in satrecs])
+
+    def __len__(self):
+        return len(self.satrecs)
+
+    def index_of(self, name):
+        return int(np.flatnonzero(self.names == name)[0])
+
+    def satellite(self, i, ts):
+        # ✅ A Skyfield EarthSatellite for the single-object tools (pass finder, scripts)
+        line1, line2 = self.lines[i]
+        return EarthSatellite(line1, line2, str(self.names[i]), ts)
+
+    def entries(self):
+        return [(str(name), line1, line2) for name, (line1, line2) in zip(self.names, self.lines)]
+
+    def propagate(self, t, start=0, stop=None):
+        """Batched SGP4 for satellites [start, stop) over the Skyfield Time array ``t``.
+
+        Returns TEME positions and velocities in km and km/s, shaped
+        (N_sat, N_time, 3), plus the SGP4 error codes shaped (N_sat, N_time).
+        """
+        jd, fraction = sgp4_dates(t)
+        return SatrecArray(self.satrecs[start:stop]).sgp4(jd, fraction)
+
+
+def synthetic_catalog(template, size, seed=0):
+    # Benchmark catalogs: the template's first element set spread over planes and phases
+    rng = np.random.default_rng(seed)
+    return TLECatalog.from_elements(
+        names=[f'SAT {i}' for i in range(size)],
+        satnum=np.arange(size) + 10000,
+        epoch_jd=np.full(size, template.epoch_jd[0]),
+        bstar=np.full(size, template.bstar[0]),
+        eccentricity=rng.uniform(0.0001, 0.02, size),
+        arg_perigee=rng.uniform(0, 2 * np.pi, size),
+        inclination=rng.uniform(np.radians(45), np.radians(100), size),
+        mean_anomaly=rng.uniform(0, 2 * np.pi, size),
+        mean_motion=template.mean_motion[0] * rng.uniform(0.9, 1.05, size),
+        raan=rng.uniform(0, 2 * np.pi, size),
+    )
+
+
+def sgp4_dates(t):
+    """UTC (whole, fraction) Julian date arrays of ``t`` for SGP4, split as Skyfield itself does."""
+    jd = np.atleast_1d(t.whole).astype(float)
+    fraction = np.atleast_1d(t.tai_fraction - t._leap_seconds() / DAY_S).astype(float)
+    return np.broadcast_to(jd, fraction.shape).copy(), fraction
+
+
+def unix_times(ts, unix):
+    # Unix time skips leap seconds, so whole days go in the day field and only
+    # the seconds of the day are counted in SI seconds
+    days = np.floor(np.asarray(unix, float) / DAY_S)
+    return ts.utc(1970, 1, 1 + days, 0, 0, unix - days * DAY_S)
+
+
+# === Observer Geometry ===
+def observer_itrf_km(latitude, longitude, elevation_m):
+    lat, lon = np.radians(latitude), np.radians(longitude)
+    e2 = EARTH_FLATTENING * (2 - EARTH_FLATTENING)
+    n = EARTH_RADIUS_KM / np.sqrt(1 - e2 * np.sin(lat) ** 2)
+    h = elevation_m / 1000.0
+    return np.array([(n + h) * np.cos(lat) * np.cos(lon),
+                     (n + h) * np.cos(lat) * np.sin(lon),
+                     (n * (1 - e2) + h) * np.sin(lat)])
+
+
+def teme_to_itrf(position, t, velocity=None):
+    # Rotate TEME into the Earth-fixed frame by GMST (polar motion ignored)
+    theta, theta_dot = theta_GMST1982(np.atleast_1d(t.whole), np.atleast_1d(t.ut1_fraction))
+    return rotate_teme(position, theta, theta_dot, velocity)
+
+
+def rotate_teme(position, theta, theta_dot, velocity=None):
+    cos, sin = np.cos(theta), np.sin(theta)
+    x, y, z = position[..., 0], position[..., 1], position[..., 2]
+    itrf = np.stack((cos * x + sin * y, -sin * x + cos * y, z), axis=-1)
+    if velocity is None:
+        return itrf
+    # The frame rotates, so Earth-fixed velocity also picks up -omega x r
+    omega = theta_dot / DAY_S
+    vx, vy, vz = velocity[..., 0], velocity[..., 1], velocity[..., 2]
+    v_itrf = np.stack((cos * vx + sin * vy + omega * itrf[..., 1],
+                       -sin * vx + cos * vy - omega * itrf[..., 0], vz), axis=-1)
+    return itrf, v_itrf
+
+
+def enu_matrix(latitude, longitude):
+    # Columns project an Earth-fixed vector onto local east, north and up
+    lat, lon = np.radians(latitude), np.radians(longitude)
+    east = np.array([-np.sin(lon), np.cos(lon), 0.0])
+    north = np.array([-np.sin(lat) * np.cos(lon), -np.sin(lat) * np.sin(lon), np.cos(lat)])
+    up = np.array([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)])
+    return np.stack((east, north, up), axis=1)
+
+
+def look_angles(catalog, t, latitude, longitude, elevation_m, chunk_size=CHUNK_SATELLITES, dtype=np.float64,
+                range_rate=False):
+    """Altitude and azimuth (degrees) and range (km) of every satellite, shaped (N_sat, N_time).
+
+    With ``range_rate=True`` a fourth array holds the range rate in km/s.
+    Satellites that SGP4 cannot propagate at a given time get NaN.
+    """
+    n_time = np.atleast_1d(t.tt).size
+    alt = np.empty((len(catalog), n_time), dtype)
+    az = np.empty((len(catalog), n_time), dtype)
+    distance = np.empty((len(catalog), n_time), dtype)
+    rate = np.empty((len(catalog), n_time), dtype) if range_rate else None
+
+    site = observer_itrf_km(latitude, longitude, elevation_m)
+    enu = enu_matrix(latitude, longitude)
+
+    for start in range(0, len(catalog), chunk_size):
+        stop = min(start + chunk_size, len(catalog))
+        error, position, velocity = catalog.propagate(t, start, stop)
+        rows = slice(start, stop)
+        if range_rate:
+            position, velocity = teme_to_itrf(position, t, velocity)
+        else:
+            position = teme_to_itrf(position, t)
+        relative = position - site
+        e, n, u = np.moveaxis(relative @ enu, -1, 0)
+        horizontal = np.hypot(e, n)
+        alt[rows] = np.degrees(np.arctan2(u, horizontal))
+        az[rows] = np.degrees(np.arctan2(e, n)) % 360.0
+        distance[rows] = np.sqrt(horizontal ** 2 + u ** 2)
+        failed = error != 0
+        alt[rows][failed] = az[rows][failed] = distance[rows][failed] = np.nan
+        if range_rate:
+            rate[rows] = np.einsum('...i,...i', relative, velocity) / distance[rows]
+            rate[rows][failed] = np.nan
+    if range_rate:
+        return alt, az, distance, rate
+    return alt, az, distance
@@ -0,0 +1,125 @@
+from collections import namedtuple
+from itertools import islice
+import asyncio
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from tle_catalog import TLEStreamParser
+from tle_store import MAX_AGE_HOURS
+
+# === Configurations ===
+GROUP_URL = 'https://celestrak.org/NORAD/elements/gp.php?GROUP={group}&FORMAT=tle'
+GROUPS = ['stations', 'visual', 'active', 'weather', 'noaa', 'goes', 'resource', 'sarsat',
+          'amateur', 'gps-ops', 'galileo', 'starlink']
+MAX_CONCURRENCY = 4          # requests in flight, and so open connections per host
+TIMEOUT_SECONDS = 30         # for the connect and for every read
+RETRIES = 3
+MAX_REDIRECTS = 5            # celestrak.com still redirects to celestrak.org
+BACKOFF_SECONDS = 1.0        # doubled after every failed attempt
+IMPORT_BATCH = 2000          # element sets per SQLite transaction while a download streams in
+READ_SIZE = 65536
+USER_AGENT = 'pass-predictor'
+
+FetchResult = namedtuple('FetchResult', 'url status imported bytes seconds')
+
+
+class HTTPError(Exception):
+    def __init__(self, status, url):
+        super().__init__(f"HTTP {status} for {url}")
+        self.status = status
+
+
+def make_session(max_concurrency=MAX_CONCURRENCY):
+    # One keep-alive pool per host, as large as the number of requests in flight
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=max_concurrency, pool_maxsize=max_concurrency)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.max_redirects = MAX_REDIRECTS
+    session.headers['User-Agent'] = USER_AGENT
+    return session
+
+
+# === Concurrent Refresh ===
+async def fetch_sources(store, urls, max_concurrency=MAX_CONCURRENCY, max_age_hours=MAX_AGE_HOURS, session=None):
+    """Refresh many TLE sources into a TLEStore concurrently; returns one FetchResult per URL.
+
+    Sources younger than ``max_age_hours`` are skipped without a request,
+    the others are asked for with their stored ETag / Last-Modified, so an
+    unchanged file costs a 304 and no parsing. Downloads stream on a shared
+    requests.Session in worker threads, at most ``max_concurrency`` at once,
+    and are parsed as they arrive; the store takes the element sets in
+    batches, only from the event loop. A failed source does not stop the
+    others; its status is the exception.
+    """
+    own_session = session is None
+    session = session or make_session(max_concurrency)
+    semaphore = asyncio.Semaphore(max_concurrency)
+    try:
+        results = await asyncio.gather(*(_fetch(store, session, semaphore, url, max_age_hours) for url in urls),
+                                       return_exceptions=True)
+    finally:
+        if own_session:
+            session.close()
+    return [result if isinstance(result, FetchResult) else FetchResult(url, result, 0, 0, 0.0)
+            for url, result in zip(urls, results)]
+
+
+async def _fetch(store, session, semaphore, url, max_age_hours):
+    start = time.perf_counter()
+    if store.source_age_hours(url) < max_age_hours:
+        return FetchResult(url, 'fresh', 0, 0, 0.0)
+    headers = store.source_headers(url)
+    for attempt in range(RETRIES):
+        try:
+            async with semaphore:
+                response = await asyncio.to_thread(session.get, url, headers=headers, timeout=TIMEOUT_SECONDS,
+                                                   stream=True)
+                with response:
+                    if response.status_code != 200:
+                        # Read the (empty or short) body, so the connection goes back to the pool
+                        received = len(await asyncio.to_thread(getattr, response, 'content'))
+                        if response.status_code != 304:
+                            raise HTTPError(response.status_code, url)
+                        store.mark_fetched(url)
+                        return FetchResult(url, 304, 0, received, time.perf_counter() - start)
+                    imported, received = await _import_stream(store, response)
+            store.mark_fetched(url, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+            return FetchResult(url, 200, imported, received, time.perf_counter() - start)
+        except (HTTPError, requests.RequestException) as error:
+            # Client errors are final; connection problems (malformed responses included) and 5xx are
+            # retried with back-off
+            if attempt == RETRIES - 1 or (isinstance(error, HTTPError) and error.status < 500):
+                return FetchResult(url, error, 0, 0, time.perf_counter() - start)
+            await asyncio.sleep(BACKOFF_SECONDS * 2 ** attempt)
+
+
+async def _import_stream(store, response):
+    # The body is read and parsed in a worker thread, one batch at a time; each batch goes
+    # into the store while the next one is still downloading. Returns (imported, bytes).
+    received = [0]
+    entries = _parse_stream(response, received)
+    imported = 0
+    while batch := await asyncio.to_thread(list, islice(entries, IMPORT_BATCH)):
+        imported += store.import_entries(batch)
+    return imported, received[0]
+
+
+def _parse_stream(response, received):
+    # Element sets from the body as it arrives; ``received`` counts its bytes
+    parser = TLEStreamParser()
+    tail = b''
+    for data in response.iter_content(READ_SIZE):
+        received[0] += len(data)
+        *complete, tail = (tail + data).split(b'\n')
+        for line in complete:
+            if entry := parser.feed(line.decode('utf-8', 'replace')):
+                yield entry
+    if entry := parser.feed(tail.decode('utf-8', 'replace')):
+        yield entry
+
+
+def group_urls(groups=GROUPS):
+    return [GROUP_URL.format(group=group) for group in groups]
@@ -0,0 +1,151 @@
+from datetime import datetime, timezone
+import sqlite3
+import time
+
+from sgp4.api import Satrec
+
+from stage_profiler import timed
+from tle_catalog import parse_tle_lines
+
+# === Configurations ===
+STORE_FILE = 'tle_store.sqlite'
+TLE_URL = 'https://www.celestrak.com/NORAD/elements/stations.txt'
+MAX_AGE_HOURS = 6            # a source is only downloaded again once it is older than this
+
+UNIX_EPOCH_JD = 2440587.5
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tle (
+    satnum INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    epoch_jd REAL NOT NULL,
+    line1 TEXT NOT NULL,
+    line2 TEXT NOT NULL,
+    imported_at REAL NOT NULL,
+    PRIMARY KEY (satnum, epoch_jd)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS tle_name ON tle (name, epoch_jd);
+CREATE TABLE IF NOT EXISTS source (
+    url TEXT PRIMARY KEY,
+    fetched_at REAL NOT NULL,
+    etag TEXT,
+    last_modified TEXT
+);
+"""
+
+
+def to_jd(when):
+    # Accept a Julian date (UTC), an aware datetime, or None for "now"
+    if when is None:
+        when = datetime.now(timezone.utc)
+    if isinstance(when, datetime):
+        return when.timestamp() / 86400.0 + UNIX_EPOCH_JD
+    return float(when)
+
+
+# === Store ===
+class TLEStore:
+    """SQLite store of every element set seen, indexed by NORAD number and name.
+
+    The (satnum, epoch) primary key and the (name, epoch) index make the
+    "latest TLE at or before T" lookup a single B-tree descent.
+    """
+
+    def __init__(self, path=STORE_FILE):
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    # === Import ===
+    def import_lines(self, lines, imported_at=None):
+        return self.import_entries(parse_tle_lines(lines), imported_at)
+
+    @timed('tle load')
+    def import_entries(self, entries, imported_at=None):
+        # (name, line1, line2) tuples, e.g. straight from a download stream
+        imported_at = time.time() if imported_at is None else imported_at
+        rows = []
+        for name, line1, line2 in entries:
+            satrec = Satrec.twoline2rv(line1, line2)
+            rows.append((satrec.satnum, name, satrec.jdsatepoch + satrec.jdsatepochF, line1, line2, imported_at))
+        with self.connection:
+            self.connection.executemany('INSERT OR REPLACE INTO tle VALUES (?, ?, ?, ?, ?, ?)', rows)
+        return len(rows)
+
+    def import_file(self, path):
+        with open(path) as file:
+            return self.import_lines(file)
+
+    # === Lookup ===
+    def latest(self, key, at=None):
+        """Most recent (name, line1, line2) for a NORAD number or name with epoch <= ``at``."""
+        column = 'satnum' if isinstance(key, int) else 'name'
+        row = self.connection.execute(
+            f'SELECT name, line1, line2 FROM tle WHERE {column} = ? AND epoch_jd <= ? '
+            'ORDER BY epoch_jd DESC LIMIT 1', (key, to_jd(at))).fetchone()
+        return row
+
+    def history(self, key):
+        column = 'satnum' if isinstance(key, int) else 'name'
+        return self.connection.execute(
+            f'SELECT epoch_jd, line1, line2 FROM tle WHERE {column} = ? ORDER BY epoch_jd', (key,)).fetchall()
+
+    def latest_all(self, at=None):
+        # The newest element set of every object, e.g. to build a TLECatalog
+        return self.connection.execute(
+            'SELECT name, line1, line2 FROM tle AS t WHERE epoch_jd = '
+            '(SELECT MAX(epoch_jd) FROM tle WHERE satnum = t.satnum AND epoch_jd <= ?) ORDER BY satnum',
+            (to_jd(at),)).fetchall()
+
+    def write_tle_file(self, key, path, at=None):
+        # ✅ Keep the single-satellite scripts working on their iss.tle file
+        entry = self.latest(key, at)
+        if entry is None:
+            raise ValueError(f"{key} TLE not found in store")
+        with open(path, 'w') as file:
+            file.write('\n'.join(entry) + '\n')
+
+    # === Refresh ===
+    def source_age_hours(self, url):
+        row = self.connection.execute('SELECT fetched_at FROM source WHERE url = ?', (url,)).fetchone()
+        return float('inf') if row is None else (time.time() - row[0]) / 3600.0
+
+    def source_headers(self, url):
+        # Conditional request headers from the last download of this source
+        row = self.connection.execute('SELECT etag, last_modified FROM source WHERE url = ?', (url,)).fetchone()
+        headers = {}
+        if row and row[0]:
+            headers['If-None-Match'] = row[0]
+        if row and row[1]:
+            headers['If-Modified-Since'] = row[1]
+        return headers
+
+    def mark_fetched(self, url, etag=None, last_modified=None):
+        with self.connection:
+            self.connection.execute(
+                'INSERT INTO source VALUES (?, ?, ?, ?) ON CONFLICT (url) DO UPDATE SET fetched_at = excluded.fetched_at, '
+                'etag = COALESCE(excluded.etag, etag), last_modified = COALESCE(excluded.last_modified, last_modified)',
+                (url, time.time(), etag, last_modified))
+
+    def refresh(self, url=TLE_URL, max_age_hours=MAX_AGE_HOURS, timeout=30):
+        """Download ``url`` into the store if it is stale; returns the number of element sets imported."""
+        if self.source_age_hours(url) < max_age_hours:
+            return 0
+        import requests
+        print(f"Downloading latest TLE from {url}...")
+        response = requests.get(url, headers=self.source_headers(url), timeout=timeout)
+        if response.status_code == 304:
+            self.mark_fetched(url)
+            return 0
+        response.raise_for_status()
+        count = self.import_lines(response.text.splitlines())
+        self.mark_fetched(url, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+        return count
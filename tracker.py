@@ -0,0 +1,175 @@
+from collections import deque, namedtuple
+import asyncio
+import math
+import time
+
+import numpy as np
+from sgp4.api import Satrec
+from skyfield.api import load
+from skyfield.sgp4lib import theta_GMST1982
+
+from tle_catalog import enu_matrix, observer_itrf_km, parse_tle_lines, rotate_teme
+
+# === Configurations ===
+RATE_HZ = 10
+FREQUENCY_HZ = 145.800e6     # ISS FM voice downlink
+LOOKAHEAD_SECONDS = 60       # SGP4 knots are computed in one batch per look-ahead window
+MIN_KNOT_SECONDS = 1.0       # knot spacing shrinks with range, so it is tightest near TCA
+MAX_KNOT_SECONDS = 20.0
+KNOT_KM_PER_SECOND = 100.0   # knot spacing = range / this
+LATENCY_SAMPLES = 1000
+
+UNIX_EPOCH_JD = 2440587.5
+SPEED_OF_LIGHT_KM_S = 299792.458
+
+TrackPoint = namedtuple('TrackPoint', 'unix elevation azimuth range_km range_rate_km_s doppler_hz')
+
+
+# === Latency / Jitter Statistics ===
+class TrackerStats:
+    """Running latency (deadline to yield) and period jitter, in seconds."""
+
+    def __init__(self):
+        self.count = 0
+        self.latency = deque(maxlen=LATENCY_SAMPLES)
+        self.max_latency = 0.0
+        self.periods = deque(maxlen=LATENCY_SAMPLES)
+        self.sgp4_calls = 0
+        self._last = None
+
+    def record(self, deadline, now):
+        latency = now - deadline
+        self.count += 1
+        self.latency.append(latency)
+        self.max_latency = max(self.max_latency, latency)
+        if self._last is not None:
+            self.periods.append(now - self._last)
+        self._last = now
+
+    def summary(self):
+        latency = np.array(self.latency) if self.latency else np.zeros(1)
+        periods = np.array(self.periods) if self.periods else np.zeros(1)
+        return {
+            'points': self.count,
+            'sgp4_calls': self.sgp4_calls,
+            'latency_mean_ms': float(latency.mean()) * 1000,
+            'latency_p99_ms': float(np.percentile(latency, 99)) * 1000,
+            'latency_max_ms': self.max_latency * 1000,
+            'jitter_ms': float(periods.std()) * 1000,
+        }
+
+
+# === Tracker ===
+class Tracker:
+    """Fixed-rate az/el/range/Doppler for one satellite and site.
+
+    SGP4 runs only at sparse knots; between them the Earth-fixed position
+    and velocity come from cubic Hermite interpolation. With a ``propagator``
+    (see propagators.py) the knots come from that backend instead, as
+    topocentric vectors with finite-difference velocities.
+    """
+
+    def __init__(self, tle, site, rate_hz=RATE_HZ, frequency_hz=FREQUENCY_HZ, ts=None, propagator=None):
+        name, line1, line2 = parse_tle_lines(tle)[0]
+        self.name = name
+        self.satrec = Satrec.twoline2rv(line1, line2)
+        self.site = site
+        self.period = 1.0 / rate_hz
+        self.frequency_hz = frequency_hz
+        self.stats = TrackerStats()
+        self.propagator = propagator
+        if propagator is None:
+            self._site_itrf = observer_itrf_km(site.latitude, site.longitude, site.elevation_m)
+            self._enu = enu_matrix(site.latitude, site.longitude)
+        else:
+            # Backend knots are already east/north/up relative to the site
+            self._site_itrf = np.zeros(3)
+            self._enu = np.identity(3)
+        # UT1 - UTC drifts by milliseconds per day, so it is looked up once
+        ts = ts or load.timescale()
+        self._dut1_days = float(ts.now().dut1) / 86400.0
+        self._knots = None
+
+    # === Sparse SGP4 knots ===
+    def _compute_knots(self, start_unix):
+        spacing = MAX_KNOT_SECONDS
+        if self._knots is not None:
+            range_km = np.linalg.norm(self._knots[1][-1] - self._site_itrf)
+            spacing = min(max(range_km / KNOT_KM_PER_SECOND, MIN_KNOT_SECONDS), MAX_KNOT_SECONDS)
+        unix = start_unix + np.arange(0.0, LOOKAHEAD_SECONDS + 2 * spacing, spacing)
+        if self.propagator is not None:
+            position = self.propagator.positions(self.propagator.unix_to_jd(unix))
+            velocity = np.gradient(position, unix, axis=0, edge_order=2)
+            self._knots = (unix, position, velocity)
+            self.stats.sgp4_calls += 1
+            return
+        days = unix / 86400.0
+        jd = np.floor(days) + UNIX_EPOCH_JD
+        fraction = days - np.floor(days)
+        _, position, velocity = self.satrec.sgp4_array(jd, fraction)
+        theta, theta_dot = theta_GMST1982(jd, fraction + self._dut1_days)
+        position, velocity = rotate_teme(position, theta, theta_dot, velocity)
+        self._knots = (unix, position, velocity)
+        self.stats.sgp4_calls += 1
+
+    def at(self, unix):
+        knots = self._knots
+        if knots is None or not knots[0][0] <= unix < knots[0][-1]:
+            self._compute_knots(unix)
+            knots = self._knots
+        times, position, velocity = knots
+        i = int(np.searchsorted(times, unix, side='right')) - 1
+        h = times[i + 1] - times[i]
+        s = (unix - times[i]) / h
+        s2, s3 = s * s, s * s * s
+        p = ((2 * s3 - 3 * s2 + 1) * position[i] + (s3 - 2 * s2 + s) * h * velocity[i]
+             + (-2 * s3 + 3 * s2) * position[i + 1] + (s3 - s2) * h * velocity[i + 1])
+        v = ((6 * s2 - 6 * s) * position[i] + (3 * s2 - 4 * s + 1) * h * velocity[i]
+             + (-6 * s2 + 6 * s) * position[i + 1] + (3 * s2 - 2 * s) * h * velocity[i + 1]) / h
+
+        relative = p - self._site_itrf
+        e, n, u = relative @ self._enu
+        range_km = math.sqrt(e * e + n * n + u * u)
+        range_rate = float(relative @ v) / range_km
+        return TrackPoint(unix, math.degrees(math.atan2(u, math.hypot(e, n))),
+                          math.degrees(math.atan2(e, n)) % 360.0, range_km, range_rate,
+                          -range_rate / SPEED_OF_LIGHT_KM_S * self.frequency_hz)
+
+    # === Fixed-rate streams ===
+    def track(self, duration_s=None, clock=time.time, sleep=time.sleep):
+        """Yield a TrackPoint every period, scheduled on absolute deadlines so errors never accumulate."""
+        start = clock()
+        k = 0
+        while duration_s is None or k * self.period <= duration_s:
+            deadline = start + k * self.period
+            delay = deadline - clock()
+            if delay > 0:
+                sleep(delay)
+            point = self.at(deadline)
+            self.stats.record(deadline, clock())
+            yield point
+            k += 1
+
+    async def track_async(self, duration_s=None):
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        offset = time.time() - start
+        k = 0
+        while duration_s is None or k * self.period <= duration_s:
+            deadline = start + k * self.period
+            delay = deadline - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            point = self.at(deadline + offset)
+            self.stats.record(deadline, loop.time())
+            yield point
+            k += 1
+
+
+async def run_trackers(trackers, duration_s, consumer=None):
+    # Many trackers sharing one event loop; ``consumer(tracker, point)`` sees every point
+    async def drive(tracker):
+        async for point in tracker.track_async(duration_s):
+            if consumer is not None:
+                consumer(tracker, point)
+    await asyncio.gather(*(drive(tracker) for tracker in trackers))